@@ -32,7 +32,7 @@ DEALINGS IN THE SOFTWARE.
 """
 
 __doc__ = """
-Mark Feature Generator v1.3.2 - Mar 10 2013
+Mark Feature Generator v1.4 - Oct 17 2026
 
 This script will generate a set of "features.mark" files from the mark data (anchors
 and combining marks class) of a Multiple Master (MM) FontLab font, or one "features.mark" 
@@ -46,7 +46,8 @@ documentation in the WriteFeaturesMarkFDK.py module that can be found
 in FontLab/Studio5/Macros/System/Modules/
 
 For information on how to format the "instances" file, please read the documentation in the 
-InstanceGenerator.py script.
+InstanceGenerator.py script. The "instances" file is read by the InstancesFile.py module, 
+which must be in the Macros folder.
 
 To access the script's options, hold down the CONTROL key while clicking on the play
 button to run the script.
@@ -80,10 +81,11 @@ v1.2   - Apr 21 2011 - Added the option of writing the mark classes in a separat
 v1.3   - Jun 15 2012 - Added the option to output the lookups in the format required for Indian scripts.
 v1.3.1 - Jul 19 2012 - Changed the description of one of the options in the UI.
 v1.3.2 - Mar 10 2013 - Minor improvements.
+v1.4   - Oct 17 2026 - The "instances" file is now read by the InstancesFile.py module, which must be in the Macros folder.
 
 """
 
-import os, sys, re, copy, math, time
+import os, sys, math, time
 
 try:
 	from AdobeFontLabUtils import checkControlKeyPress, checkShiftKeyPress
@@ -97,269 +99,30 @@ except ImportError,e:
 	pprint.pprint(sys.path)
 	raise e
 
-kFieldsKey = "#KEYS:"
-kFamilyName = "FamilyName"
-kFontName = "FontName"
-kFullName = "FullName"
-kWeight = "Weight"
-kCoordsKey = "Coords"
-kIsBoldKey = "IsBold" # This is changed to kForceBold in the instanceDict when reading in the instance file.
-kForceBold = "ForceBold"
-kIsItalicKey = "IsItalic"
-kExceptionSuffixes = "ExceptionSuffixes"
-kExtraGlyphs = "ExtraGlyphs"
-
-kFixedFieldKeys = {
-		# field index: key name
-		0:kFamilyName,
-		1:kFontName,
-		2:kFullName,
-		3:kWeight,
-		4:kCoordsKey,
-		5:kIsBoldKey,
-		}
-
-kNumFixedFields = len(kFixedFieldKeys)
-
-kBlueScale = "BlueScale"
-kBlueShift = "BlueShift"
-kBlueFuzz = "BlueFuzz"
-kBlueValues = "BlueValues"
-kOtherBlues = "OtherBlues"
-kFamilyBlues = "FamilyBlues"
-kFamilyOtherBlues = "FamilyOtherBlues"
-kStdHW = "StdHW"
-kStdVW = "StdVW"
-kStemSnapH = "StemSnapH"
-kStemSnapV = "StemSnapV"
-
-kAlignmentZonesKeys = [kBlueValues, kOtherBlues, kFamilyBlues, kFamilyOtherBlues]
-kTopAlignZonesKeys = [kBlueValues, kFamilyBlues]
-kMaxTopZonesSize = 14 # 7 zones
-kBotAlignZonesKeys = [kOtherBlues, kFamilyOtherBlues]
-kMaxBotZonesSize = 10 # 5 zones
-kStdStemsKeys = [kStdHW, kStdVW]
-kMaxStdStemsSize = 1
-kStemSnapKeys = [kStemSnapH, kStemSnapV]
-kMaxStemSnapSize = 12 # including StdStem
-
-
-class ParseError(ValueError):
-	pass
-	
-
-def validateArrayValues(arrayList, valuesMustBePositive):
-	for i in range(len(arrayList)):
-		try:
-			arrayList[i] = eval(arrayList[i])
-		except (NameError, SyntaxError):
-			return
-		if valuesMustBePositive:
-			if arrayList[i] < 0:
-				return
-	return arrayList
-
-
-def readInstanceFile(instancesFilePath):
-	f = open(instancesFilePath, "rt")
-	data = f.read()
-	f.close()
-	
-	lines = data.splitlines()
-	
-	i = 0
-	parseError = 0
-	keyDict = copy.copy(kFixedFieldKeys)
-	numKeys = kNumFixedFields
-	numLines = len(lines)
-	instancesList = []
-	
-	for i in range(numLines):
-		line = lines[i]
-		
-		# Skip over blank lines
-		line2 = line.strip()
-		if not line2:
-			continue
-
-		# Get rid of all comments. If we find a key definition comment line, parse it.
-		commentIndex = line.find('#')
-		if commentIndex >= 0:
-			if line.startswith(kFieldsKey):
-				if instancesList:
-					print "ERROR: Header line (%s) must preceed a data line." % kFieldsKey
-					raise ParseError
-				# parse the line with the field names.
-				line = line[len(kFieldsKey):]
-				line = line.strip()
-				keys = line.split('\t')
-				keys = map(lambda name: name.strip(), keys)
-				numKeys = len(keys)
-				k = kNumFixedFields
-				while k < numKeys:
-					keyDict[k] = keys[k]
-					k +=1
-				continue
-			else:
-				line = line[:commentIndex]
-				continue
 
-		# Must be a data line.
-		fields = line.split('\t')
-		fields = map(lambda datum: datum.strip(), fields)
-		numFields = len(fields)
-		if (numFields != numKeys):
-			print "ERROR: In line %s, the number of fields %s does not match the number of key names %s (FamilyName, FontName, FullName, Weight, Coords, IsBold)." % (i+1, numFields, numKeys)
-			parseError = 1
-			continue
-		
-		instanceDict= {}
-		#Build a dict from key to value. Some kinds of values needs special processing.
-		for k in range(numFields):
-			key = keyDict[k]
-			field = fields[k]
-			if not field:
-				continue
-			if field in ["Default", "None", "FontBBox"]:
-				# FontBBox is no longer supported - I calculate the real
-				# instance fontBBox from the glyph metrics instead,
-				continue
-			if key == kFontName:
-				value = field
-			elif key in [kExtraGlyphs, kExceptionSuffixes]:
-				value = eval(field)
-			elif key in [kIsBoldKey, kIsItalicKey, kCoordsKey]:
-				try:
-					value = eval(field) # this works for all three fields.
-					
-					if key == kIsBoldKey: # need to convert to Type 1 field key.
-						instanceDict[key] = value
-						# add kForceBold key.
-						key = kForceBold
-						if value == 1:
-							value = "true"
-						else:
-							value = "false"
-					elif key == kIsItalicKey:
-						if value == 1:
-							value = "true"
-						else:
-							value = "false"
-					elif key == kCoordsKey:
-						if type(value) == type(0):
-							value = (value,)
-				except (NameError, SyntaxError):
-					print "ERROR: In line %s, the %s field has an invalid value." % (i+1, key)
-					parseError = 1
-					continue
-
-			elif field[0] in ["[","{"]: # it is a Type 1 array value. Turn it into a list and verify that there's an even number of values for the alignment zones
-				value = field[1:-1].split() # Remove the begin and end brackets/braces, and make a list
-				
-				if key in kAlignmentZonesKeys:
-					if len(value) % 2 != 0:
-						print "ERROR: In line %s, the %s field does not have an even number of values." % (i+1, key)
-						parseError = 1
-						continue
-				
-				if key in kTopAlignZonesKeys: # The Type 1 spec only allows 7 top zones (7 pairs of values)
-					if len(value) > kMaxTopZonesSize:
-						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxTopZonesSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, False) # False = values do NOT have to be all positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
-							parseError = 1
-							continue
-					currentArray = value[:] # make copy, not reference
-					value.sort()
-					if currentArray != value:
-						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
-				
-				if key in kBotAlignZonesKeys: # The Type 1 spec only allows 5 top zones (5 pairs of values)
-					if len(value) > kMaxBotZonesSize:
-						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxBotZonesSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, False) # False = values do NOT have to be all positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
-							parseError = 1
-							continue
-					currentArray = value[:] # make copy, not reference
-					value.sort()
-					if currentArray != value:
-						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
-				
-				if key in kStdStemsKeys:
-					if len(value) > kMaxStdStemsSize:
-						print "ERROR: In line %s, the %s field can only have %d value." % (i+1, key, kMaxStdStemsSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, True) # True = all values must be positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field has an invalid value." % (i+1, key)
-							parseError = 1
-							continue
-				
-				if key in kStemSnapKeys: # The Type 1 spec only allows 12 stem widths, including 1 standard stem
-					if len(value) > kMaxStemSnapSize:
-						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxStemSnapSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, True) # True = all values must be positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
-							parseError = 1
-							continue
-					currentArray = value[:] # make copy, not reference
-					value.sort()
-					if currentArray != value:
-						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
-			else:
-				# either a single number or a string.
-				if re.match(r"^[-.\d]+$", field):
-					value = field #it is a Type 1 number. Pass as is, as a string.
-				else:
-					value = field
-			
-			instanceDict[key] = value
-				
-		if (kStdHW in instanceDict and kStemSnapH not in instanceDict) or (kStdHW not in instanceDict and kStemSnapH in instanceDict):
-			print "ERROR: In line %s, either the %s value or the %s values are missing or were invalid." % (i+1, kStdHW, kStemSnapH)
-			parseError = 1
-		elif (kStdHW in instanceDict and kStemSnapH in instanceDict): # cannot be just 'else' because it will generate a 'KeyError' when these hinting parameters are not provided in the 'instances' file
-			if instanceDict[kStemSnapH][0] != instanceDict[kStdHW][0]:
-				print "ERROR: In line %s, the first value in %s must be the same as the %s value." % (i+1, kStemSnapH, kStdHW)
-				parseError = 1
-
-		if (kStdVW in instanceDict and kStemSnapV not in instanceDict) or (kStdVW not in instanceDict and kStemSnapV in instanceDict):
-			print "ERROR: In line %s, either the %s value or the %s values are missing or were invalid." % (i+1, kStdVW, kStemSnapV)
-			parseError = 1
-		elif (kStdVW in instanceDict and kStemSnapV in instanceDict): # cannot be just 'else' because it will generate a 'KeyError' when these hinting parameters are not provided in the 'instances' file
-			if instanceDict[kStemSnapV][0] != instanceDict[kStdVW][0]:
-				print "ERROR: In line %s, the first value in %s must be the same as the %s value." % (i+1, kStemSnapV, kStdVW)
-				parseError = 1
-		
-		instancesList.append(instanceDict)
-		
-	if parseError or len(instancesList) == 0:
-		raise(ParseError)
-		
-	return instancesList
+def importMacroModule(moduleName):
+	# The modules shared by these macros are kept next to them, in the Macros folder.
+	# FontLab does not always put that folder in the search path, so look for it.
+	try:
+		return __import__(moduleName)
+	except ImportError:
+		pass
+	fileName = moduleName + ".py"
+	userFolder = os.path.expanduser('~')
+	customModulePathMAC = os.path.join(userFolder, 'Library', 'Application Support', 'FontLab', 'Studio 5', 'Macros')
+	customModulePathPC = os.path.join(userFolder, 'Documents', 'FontLab', 'Studio5', 'Macros')
+	possibleModulePaths = [fl.userpath, customModulePathMAC, customModulePathPC]
+	for path in possibleModulePaths:
+		for root, dirs, files in os.walk(path):
+			if fileName in files:
+				if root not in sys.path:
+					sys.path.append(root)
+				return __import__(moduleName)
+	print "Failed to find the module %s in the following folders:\n%s" % (fileName, '\n'.join(possibleModulePaths))
+	raise ImportError(moduleName)
+
+InstancesFile = importMacroModule("InstancesFile")
+from InstancesFile import ParseError, readInstanceFile, kFontName, kCoordsKey
 
 
 def handleInstanceLight(f, fontInstanceDict, instanceInfo):
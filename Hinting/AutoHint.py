@@ -5,7 +5,7 @@ This software is licensed as OpenSource, under the Apache License, Version 2.0.
 """
 
 __doc__ = """
-AutoHint v1.9 May 1 2009
+AutoHint v1.15 Oct 17 2026
 
 This script will apply the Adobe 'AC' auto-hinting rules to the specified
 glyphs.
@@ -47,8 +47,18 @@ consulting the history file when it is asked to hint the glyph again. By
 default, AutoHint does not maintain or use the history file, but this can be
 turned on with an option.
 
-When used, the history file is named "<PostScriptName>.plist", in the same
-location as the parent font file. For each glyph, AutoHint stores a simplified
+When used, the history file is named "<PostScriptName>.achistory", in the same
+location as the parent font file. It is an SQLite database, in which the entry of each
+glyph is read and written by itself, so that hinting a few glyphs of a large font does
+not read and write the history of all its glyphs. The history files of all the fonts
+hinted by one run are written when all the fonts are done, and are left unchanged if
+the run fails. The first time the history of a font is used, the entries of the
+"<PostScriptName>.plist" history file written by earlier versions of AutoHint are
+copied to it. If the check box 'Also write the history to the .plist file' is checked,
+the history is also written back to the .plist file, for the tools that read it. The
+option is on by default, so that the .plist file is kept up to date, as before. If
+the Python of FontLab does not have the sqlite3 module, the .plist file is used as the
+history file, as before. For each glyph, AutoHint stores a simplified
 version of the outline coordinates. If this entry is missing for a glyph and the
 glyph has hints, then AutoHint assumes it was manually hinted, and will by
 default not hint it again. 
@@ -67,6 +77,52 @@ The option If the file is missing, AutoHint will assume that all the glyphs were
 manually hinted, and you will have to use the options ""  or "Re-hint unknown
 glyphs" to hint any glyphs.
 
+The hinting of one font is done by the hintFont() function, which is also used by
+the InstanceGenerator.py script for hinting each instance as it is generated.
+
+If the check box 'Run autohintexe once for many glyphs' is checked, the bez data
+of up to 100 glyphs (all their masters) is given to each run of the autohintexe
+program, instead of running it once for each master of each glyph. The glyphs that
+the batch run fails to hint are then hinted one at a time. The option is off by
+default, so that each glyph master is hinted on its own, as before.
+
+The option 'Number of autohintexe processes run at the same time' shares the glyphs
+among several autohintexe processes, run by worker threads, each one in its own
+temporary folder. The glyph data is read from, and the hints are written to, the
+FontLab glyphs by the main thread, in the order of the glyphs, since the FontLab objects
+can only be used from the main thread. Set it to the number of processor cores.
+
+If the check box 'Reuse the hints of identical outlines' is checked, the hinted
+outlines made by autohintexe are kept in a cache, in the directory "AutoHintCache" next
+to the prefs file. An outline that was already hinted, in any font or master, with
+the same alignment zones, stem widths and options, and by the same autohintexe program,
+is not given to autohintexe again; the hints in the cache are used instead. The
+autohintexe program is identified by its path, size and modification date, and by the
+usage text it prints, so the outlines hinted by another version are not reused. The
+least recently used outlines are removed from the cache when it grows larger than 50 MB.
+The cache is not used when the script is run with the SHIFT key held down (debug mode).
+The option is off by default.
+
+If the check box 'Pass the glyph data to autohintexe in memory' is checked, and the
+autohintexe program supports it (its -b option), the bez data of each glyph master is
+given to autohintexe on its command line, and the hinted bez data is read from its
+output, instead of being written to and read from temporary files. The option is off
+by default. Each run of autohintexe is then given one glyph master, so the option 'Run
+autohintexe once for many glyphs' has no effect. If autohintexe fails on the data given
+in memory, the glyph master is hinted again through temporary files. The command line
+of a program is limited to 32767 characters on Windows, so a glyph master whose bez
+data would make the command line longer than 32000 characters is always hinted through
+temporary files. Temporary files are still used in debug mode, so that they can be
+inspected. The time taken per glyph is written to the log when a font is done, so that
+the two ways can be compared.
+
+v1.10 Oct 17 2026 - Moved the hinting of one font to hintFont().
+v1.11 Oct 17 2026 - Added the option of running autohintexe once for many glyphs.
+v1.12 Oct 17 2026 - Added the option of running several autohintexe processes at the same time.
+v1.13 Oct 17 2026 - Added the hint cache.
+v1.14 Oct 17 2026 - Moved the history to an SQLite database, written once for all the fonts of a run.
+v1.15 Oct 17 2026 - Added the option of passing the glyph data to autohintexe in memory.
+
  """
 
 import string
@@ -76,6 +132,19 @@ import time
 import sys
 import plistlib
 import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import traceback
+try:
+	from hashlib import md5
+except ImportError: # Python 2.4
+	from md5 import new as md5
+try:
+	import sqlite3
+except ImportError: # Python 2.4
+	sqlite3 = None
 from FL import *
 try:
 	import BezChar
@@ -111,19 +180,31 @@ compatibleMode = 1	# this forces AClib to always put the dominant set of hints a
 
 # Global constants.
 kFontPlistSuffix  = ".plist"
+kHistoryDBSuffix = ".achistory"
 kACIDKey = "com.adobe.AC" # Key for AC values in the font plist file.
 acLogFileName = "AutoHint.log" #  Is written to "log" subdirectory from current font.
 gLogReporter = None # log file class instance.
+gHaveACPipe = None # true if autohintexe can read the bez data from its command line. Set by haveACPipe().
+gACUsage = None # usage text printed by "autohintexe -u". Set by getACUsage().
+gACIdentity = None # identifies the autohintexe program in the hint cache keys. Set by getACIdentity().
 global debug
 debug = 0
 kProgressBarThreshold = 8 # I bother witha progress bar just so the user can easily cancel without using CTRL-C
 kProgressBarTickStep = 4
 kIGlyphListFile = "hintList.txt"
+kACBatchSize = 100 # Number of glyphs whose bez data is written and hinted together, in batch mode.
+kMaxCommandLength = 7000 # The command line of cmd.exe is limited to 8191 characters.
+kMaxPipeCommandLength = 32000 # The command line given to CreateProcess on Windows is limited to 32767 characters.
+kHintCacheFolderName = "AutoHintCache" # Is written to the "Preferences" directory, next to the prefs file.
+kHintCacheMaxSize = 50 * 1024 * 1024 # Size of the hint cache, in bytes.
 kPrefsName =  "AutoHint.prefs"
 
 class ACError(KeyError):
 	pass
 
+class ACFontError(ACError):
+	pass
+
 def logMsg(*args):
 	global gLogReporter
 	# used for printing output to console as well as log file.
@@ -238,10 +319,139 @@ def  openFontPlistFile(psName, dirPath):
 		fontPlist[kACIDKey] = {}
 	return fontPlist, filePath, isNewPlistFile
 
-def doHinting(options):
-	global gLogReporter
-	result = 1
 
+class PlistHintHistory:
+	# The hint history of a font, kept in the plist file. The whole file is read when
+	# it is opened, and written by commit().
+	def __init__(self, psName, dirPath):
+		self.fontPlist, self.filePath, self.isNew = openFontPlistFile(psName, dirPath)
+
+	def get(self, glyphName):
+		# Returns (AC identifier, time), or None if the glyph is not in the history.
+		try:
+			ACidentifier, ACtime = self.fontPlist[kACIDKey][glyphName]
+		except KeyError:
+			return None
+		return ACidentifier, ACtime
+
+	def put(self, glyphName, ACidentifier, ACtime):
+		self.fontPlist[kACIDKey][glyphName] = (ACidentifier, ACtime)
+
+	def items(self):
+		return self.fontPlist[kACIDKey].items()
+
+	def commit(self):
+		self.fontPlist.write(self.filePath)
+
+	def rollback(self):
+		pass
+
+	def close(self):
+		pass
+
+
+class SQLiteHintHistory:
+	# The hint history of a font, kept in an SQLite database with one row per glyph. The
+	# changes are kept in a transaction until commit() is called.
+	def __init__(self, psName, dirPath):
+		self.filePath = os.path.join(dirPath, psName + kHistoryDBSuffix)
+		isNewDB = not os.path.exists(self.filePath)
+		try:
+			self.db = sqlite3.connect(self.filePath)
+			self.db.text_factory = str
+			self.db.execute("CREATE TABLE IF NOT EXISTS history (glyph TEXT PRIMARY KEY, identifier TEXT, time TEXT)")
+		except sqlite3.Error, e:
+			raise ACFontError("\tError: history file could not be opened <%s>. %s" % (self.filePath, e))
+		if isNewDB:
+			self.importPlist(psName, dirPath)
+		self.isNew = self.db.execute("SELECT glyph FROM history LIMIT 1").fetchone() is None
+
+	def importPlist(self, psName, dirPath):
+		# Copies the entries of the plist history file, if there is one, to the new database.
+		try:
+			fontPlist, plistPath, isNewPlistFile = openFontPlistFile(psName, dirPath)
+		except ACFontError:
+			self.close()
+			os.remove(self.filePath)
+			raise
+		if isNewPlistFile:
+			return
+		entries = []
+		for glyphName, (ACidentifier, ACtime) in fontPlist[kACIDKey].items():
+			entries.append((glyphName, ACidentifier, ACtime))
+		self.db.executemany("INSERT OR REPLACE INTO history VALUES (?, ?, ?)", entries)
+		self.db.commit()
+		logMsg("Copied the history of %d glyphs from %s to %s." % (len(entries), os.path.basename(plistPath), os.path.basename(self.filePath)))
+
+	def get(self, glyphName):
+		# Returns (AC identifier, time), or None if the glyph is not in the history.
+		return self.db.execute("SELECT identifier, time FROM history WHERE glyph = ?", (glyphName,)).fetchone()
+
+	def put(self, glyphName, ACidentifier, ACtime):
+		self.db.execute("INSERT OR REPLACE INTO history VALUES (?, ?, ?)", (glyphName, ACidentifier, ACtime))
+
+	def items(self):
+		return [(glyphName, (ACidentifier, ACtime)) for glyphName, ACidentifier, ACtime in self.db.execute("SELECT glyph, identifier, time FROM history")]
+
+	def commit(self):
+		self.db.commit()
+
+	def rollback(self):
+		self.db.rollback()
+
+	def close(self):
+		self.db.close()
+
+
+def exportHintHistory(hintHistory, psName, dirPath):
+	# Writes the history to the plist file, keeping the other data of the file.
+	fontPlist, filePath, isNewPlistFile = openFontPlistFile(psName, dirPath)
+	fontPlist[kACIDKey] = dict(hintHistory.items())
+	fontPlist.write(filePath)
+
+
+class HintHistorySession:
+	# The hint histories of the fonts hinted by one run. The changes are written to all
+	# the history files by commit(), when all the fonts are done, or are dropped by
+	# rollback(), if the run fails.
+	def __init__(self, options):
+		self.options = options
+		self.histories = [] # list of (history, PostScript name, directory path)
+		self.historyPaths = {} # key: history file path, value: history
+
+	def open(self, psName, dirPath):
+		# Returns the history of the font. Fonts with the same history file share it.
+		if sqlite3:
+			hintHistory = SQLiteHintHistory(psName, dirPath)
+		else:
+			hintHistory = PlistHintHistory(psName, dirPath)
+		if self.historyPaths.has_key(hintHistory.filePath):
+			hintHistory.close()
+			return self.historyPaths[hintHistory.filePath]
+		self.historyPaths[hintHistory.filePath] = hintHistory
+		self.histories.append((hintHistory, psName, dirPath))
+		return hintHistory
+
+	def commit(self):
+		for hintHistory, psName, dirPath in self.histories:
+			hintHistory.commit()
+			if sqlite3 and self.options.exportHistoryPlist:
+				exportHintHistory(hintHistory, psName, dirPath)
+		self.close()
+
+	def rollback(self):
+		for hintHistory, psName, dirPath in self.histories:
+			hintHistory.rollback()
+		self.close()
+
+	def close(self):
+		for hintHistory, psName, dirPath in self.histories:
+			hintHistory.close()
+		self.histories = []
+		self.historyPaths = {}
+
+
+def doHinting(options):
 	if fl.count < 1:
 		return
 
@@ -255,6 +465,7 @@ def doHinting(options):
 		logMsg("Error: unsupported option for font selection.")
 		return
 
+	nameList = None
 	if options.getNamesFromFile:
 		fontPath = fl.font.file_name
 		if not fontPath:
@@ -263,16 +474,34 @@ def doHinting(options):
 			
 		fontPath = os.path.dirname(fontPath)
 		nameList = GetGlyphNamesFromFile(fontPath)
-		numGlyphs = len(nameList)
 		if not nameList:
 			print "No names found in glyph name list file."
 			return
-	# Temproary data file paths used with the autohintexe program.
-	tempBaseName = os.tempnam()
-	options.tempBez = tempBaseName + ".bez"
-	options.tempBezNew = options.tempBez + ".new"
-	options.tempFI = tempBaseName + ".fi"
 
+	setTempFilePaths(options)
+	historySession = None
+	if options.doHistoryFile:
+		historySession = HintHistorySession(options)
+	try:
+		result = hintFonts(fontRange, nameList, options, historySession)
+	except ACFontError, e:
+		historySession.rollback()
+		logMsg(e)
+		return
+	except:
+		if historySession:
+			historySession.rollback()
+		raise
+	if historySession:
+		historySession.commit()
+	if not result:
+		return
+
+	logMsg("All done with AC %s" % time.asctime())
+
+
+def hintFonts(fontRange, nameList, options, historySession):
+	# Hints the fonts of fontRange. Returns 0 if the hinting of a font could not be started.
 	for fi in fontRange:
 		font = fl[fi]
 		
@@ -297,97 +526,277 @@ def doHinting(options):
 				logMsg("No glyphs selected for font %s." % os.path.basename(font.file_name))
 				continue
 
-		# set up progress bar
-		numGlyphs = len(nameList)
-		if numGlyphs > kProgressBarThreshold:
-			fl.BeginProgress("Checking glyphs...", numGlyphs)
-		tick = 0
-
-
-		# Create font-specific log file.
-		fontName = font.font_name
-		if not fontName:
-			fontName = "FontName-Undefined"
-		filePath = font.file_name
-		if not filePath:
-			filePath = fontName
-		gLogReporter = Reporter(os.path.join(os.path.dirname(filePath), acLogFileName))
-		if not gLogReporter.file:
-			gLogReporter = None
+		if not hintFont(font, nameList, options, historySession=historySession):
+			return 0
+	return 1
 
-		# load fontPlist.
-		fontPlist = None
-		isNewPlistFile = 0
-		if options.doHistoryFile:
-			fontPlist, fontPlistFilePath, isNewPlistFile = openFontPlistFile(fontName, os.path.dirname(filePath))
-			if isNewPlistFile and (not (options.doReHintUnknown or options.doHintAll)):
-				logMsg("No hint info plist file was found, so all glyphs are unknown to AC. To hint all glyphs, run AC again with option to hint all glyphs unconditionally.")
-				return
-
-		logMsg("Autohinting starting for font", os.path.basename(filePath), time.asctime())
-		lenFont = len(font)
-		if options.noFlex:
-			FlexOK = 'false'
-		else:
-			FlexOK = 'true'
-		fontInfo = BezChar.GetACFontInfoFromFLFont(font, FlexOK)
-		fp = open(options.tempFI, "wt") # For name-keyed ofnts, there is only one fontinfo string.
-		fp.write(fontInfo)
-		fp.close()
-		anyGlyphChanged = 0
-		for gname in nameList:
-			gi = font.FindGlyph(gname)
-			if gi > -1: # not all open fonts will have the same list of glyphs.
-				flGlyph = font.glyphs[gi]
-				glyphChanged = Run_AC(flGlyph, fontInfo, fontPlist, options, isNewPlistFile)
-				if glyphChanged:
-					anyGlyphChanged = 1
-				fl.UpdateGlyph(gi)
-				if numGlyphs > kProgressBarThreshold:
-					tick = tick + 1
-					if (tick % kProgressBarTickStep == 0):
-						result = fl.TickProgress(tick)
-						if not result:
-							break
-		if fontPlist:
-			fontPlist.write(fontPlistFilePath)
-		if gLogReporter:
-			gLogReporter.close()
-			gLogReporter = None
-		font.modified = 1
 
+def setTempFilePaths(options):
+	# Temproary data file paths used with the autohintexe program.
+	tempBaseName = os.tempnam()
+	options.tempBez = tempBaseName + ".bez"
+	options.tempBezNew = options.tempBez + ".new"
+	options.tempFI = tempBaseName + ".fi"
 
-		
-		if numGlyphs > kProgressBarThreshold:
-			# can end the progress bar only if we started it.
-			fl.EndProgress()
 
-		if (not anyGlyphChanged) and options.doHistoryFile:
-			if (options.doReHintUnknown):
-				logMsg("No new hints. All selected glyphs were hinted and had same outline as recorded  in  %s." % (os.path.basename(fontPlistFilePath)))
+class HintCache:
+	# Keeps the hinted bez data made by autohintexe, in one file per outline, keyed by the
+	# outline (without hints), the AC fontinfo and the AC options. The files that were
+	# used least recently are removed when the cache is larger than maxSize.
+	def __init__(self, folderPath, maxSize=kHintCacheMaxSize):
+		self.folderPath = folderPath
+		self.maxSize = maxSize
+		self.context = ""
+		self.numHits = 0
+		self.numLookups = 0
+		if not os.path.exists(folderPath):
+			os.makedirs(folderPath)
+
+	def setContext(self, fontInfo, options):
+		# The outline must be hinted again if the autohintexe program, the fontinfo or the
+		# options passed to autohintexe change.
+		flags = "%s %s %s" % (options.allowPathChanges, options.noHintSub, options.noFlex)
+		self.context = md5(getACIdentity() + fontInfo + flags).hexdigest()
+
+	def getKey(self, bezData):
+		# The hints and comments given to autohintexe don't change its output. The runs of
+		# whitespace are kept as single spaces, so that different numbers can't run together.
+		bezText = commentPattern.sub("", bezData)
+		bezText = hintGroupPattern.sub("", bezText)
+		bezText = whiteSpacePattern.sub(" ", bezText).strip()
+		return md5(self.context + bezText).hexdigest()
+
+	def get(self, bezData):
+		# Returns the hinted bez data, or None.
+		self.numLookups += 1
+		filePath = os.path.join(self.folderPath, self.getKey(bezData) + ".bez")
+		try:
+			fp = open(filePath, "rt")
+			newBezData = fp.read()
+			fp.close()
+			os.utime(filePath, None) # it is now the most recently used
+		except (IOError, OSError):
+			return None
+		self.numHits += 1
+		return newBezData
+
+	def put(self, bezData, newBezData):
+		filePath = os.path.join(self.folderPath, self.getKey(bezData) + ".bez")
+		tempPath = None
+		try:
+			# The temporary file has a unique name, since other threads and FontLab sessions may write the same entry.
+			fd, tempPath = tempfile.mkstemp(".tmp", "", self.folderPath)
+			fp = os.fdopen(fd, "wt")
+			fp.write(newBezData)
+			fp.close()
+			if os.path.exists(filePath):
+				os.remove(filePath) # os.rename does not replace files on Windows
+			os.rename(tempPath, filePath)
+		except (IOError, OSError):
+			# another FontLab session may be writing the same entry
+			if tempPath and os.path.exists(tempPath):
+				try:
+					os.remove(tempPath)
+				except OSError:
+					pass
+
+	def trim(self):
+		# Removes the least recently used files until the cache fits in maxSize.
+		entries = []
+		totalSize = 0
+		for fileName in os.listdir(self.folderPath):
+			filePath = os.path.join(self.folderPath, fileName)
+			try:
+				stat = os.stat(filePath)
+			except OSError:
+				continue
+			entries.append((stat.st_mtime, stat.st_size, filePath))
+			totalSize += stat.st_size
+		if totalSize <= self.maxSize:
+			return
+		entries.sort()
+		for mtime, size, filePath in entries:
+			try:
+				os.remove(filePath)
+			except OSError:
+				continue
+			totalSize -= size
+			if totalSize <= self.maxSize:
+				break
+
+
+def openHintCache(options):
+	# Returns the HintCache kept next to the prefs file, or None.
+	if not options.useHintCache or options.debug or not options._prefsPath:
+		return None
+	try:
+		return HintCache(os.path.join(os.path.dirname(options._prefsPath), kHintCacheFolderName))
+	except (IOError, OSError):
+		logMsg("Failed to create the hint cache directory. The hint cache is not used.")
+		return None
+
+
+def getNumThreads(options):
+	try:
+		numThreads = int(options.numThreads)
+	except ValueError:
+		numThreads = 1
+	if numThreads < 1:
+		logMsg("The number of autohintexe processes must be a positive value. Using 1.")
+		numThreads = 1
+	return numThreads
+
+
+def hintFont(font, nameList, options, logFilePath=None, historySession=None):
+	# Hints the glyphs of the font named in nameList. The font does not need to be saved;
+	# this is also used by the InstanceGenerator.py script for hinting each instance.
+	# The changes to the history are kept in historySession; if it is None, they are
+	# written when the font is done. Returns 0 if the hinting could not be started, and 1 otherwise.
+	global gLogReporter
+	if options.doHistoryFile and historySession is None:
+		historySession = HintHistorySession(options)
+		try:
+			result = hintFont(font, nameList, options, logFilePath, historySession)
+		except:
+			historySession.rollback()
+			raise
+		historySession.commit()
+		return result
+
+	if not hasattr(options, "tempBez"):
+		setTempFilePaths(options)
+
+	# set up progress bar
+	numGlyphs = len(nameList)
+	if numGlyphs > kProgressBarThreshold:
+		fl.BeginProgress("Checking glyphs...", numGlyphs)
+	tick = 0
+
+
+	# Create font-specific log file.
+	fontName = font.font_name
+	if not fontName:
+		fontName = "FontName-Undefined"
+	filePath = font.file_name
+	if not filePath:
+		filePath = fontName
+	if not logFilePath:
+		logFilePath = os.path.join(os.path.dirname(filePath), acLogFileName)
+	gLogReporter = Reporter(logFilePath)
+	if not gLogReporter.file:
+		gLogReporter = None
+
+	# open the hint history.
+	hintHistory = None
+	isNewHistoryFile = 0
+	if options.doHistoryFile:
+		hintHistory = historySession.open(fontName, os.path.dirname(filePath))
+		isNewHistoryFile = hintHistory.isNew
+		if isNewHistoryFile and (not (options.doReHintUnknown or options.doHintAll)):
+			logMsg("No hint history file was found, so all glyphs are unknown to AC. To hint all glyphs, run AC again with option to hint all glyphs unconditionally.")
+			if numGlyphs > kProgressBarThreshold:
+				fl.EndProgress()
+			return 0
+
+	logMsg("Autohinting starting for font", os.path.basename(filePath), time.asctime())
+	if options.noFlex:
+		FlexOK = 'false'
+	else:
+		FlexOK = 'true'
+	fontInfo = BezChar.GetACFontInfoFromFLFont(font, FlexOK)
+	fp = open(options.tempFI, "wt") # For name-keyed ofnts, there is only one fontinfo string.
+	fp.write(fontInfo)
+	fp.close()
+	hintCache = openHintCache(options)
+	if hintCache:
+		hintCache.setContext(fontInfo, options)
+	anyGlyphChanged = 0
+	glyphIndexes = []
+	for gname in nameList:
+		gi = font.FindGlyph(gname)
+		if gi > -1: # not all open fonts will have the same list of glyphs.
+			glyphIndexes.append(gi)
+	numThreads = getNumThreads(options)
+	if numThreads > 1:
+		# Each thread gets about kACBatchSize glyphs in batch mode.
+		chunkSize = kACBatchSize * numThreads
+	elif options.batchMode:
+		chunkSize = kACBatchSize
+	else:
+		chunkSize = 1
+	if options.debug or not (options.usePipes and haveACPipe()):
+		transport = "files"
+	else:
+		transport = "memory"
+	hintingStartTime = time.time()
+	numGlyphsDone = 0
+	cancelled = 0
+	for chunkStart in range(0, len(glyphIndexes), chunkSize):
+		chunk = glyphIndexes[chunkStart:chunkStart + chunkSize]
+		batchResults = {}
+		if options.batchMode or numThreads > 1:
+			batchResults = runACBatch(font, chunk, hintHistory, options, isNewHistoryFile, numThreads, hintCache)
+		for gi in chunk:
+			flGlyph = font.glyphs[gi]
+			if batchResults.has_key(gi):
+				if batchResults[gi] is None:
+					glyphChanged = 0
+				else:
+					logMsg("Hinting %s." % flGlyph.name)
+					prevACIdentifier, newBezDataList = batchResults[gi]
+					glyphChanged = applyACResults(flGlyph, newBezDataList, hintHistory, options, prevACIdentifier)
 			else:
-				logMsg("No new hints. All selected glyphs either were hinted and had the same outline as recorded in  %s, or were not referenced in the hint info file." % (os.path.basename(fontPlistFilePath)))
+				# Not in batch mode, or autohintexe failed to hint this glyph with the other ones
+				glyphChanged = Run_AC(flGlyph, fontInfo, hintHistory, options, isNewHistoryFile, hintCache)
+			if glyphChanged:
+				anyGlyphChanged = 1
+			numGlyphsDone += 1
+			fl.UpdateGlyph(gi)
+			if numGlyphs > kProgressBarThreshold:
+				tick = tick + 1
+				if (tick % kProgressBarTickStep == 0):
+					result = fl.TickProgress(tick)
+					if not result:
+						cancelled = 1
+						break
+		if cancelled:
+			break
+	if numGlyphsDone:
+		hintingTime = time.time() - hintingStartTime
+		logMsg("Processed %d glyphs in %.2f seconds (%.1f ms per glyph), passing the glyph data to autohintexe in %s." % (numGlyphsDone, hintingTime, 1000.0 * hintingTime / numGlyphsDone, transport))
+	if hintCache:
+		logMsg("Hint cache: reused %d of %d glyph masters." % (hintCache.numHits, hintCache.numLookups))
+		hintCache.trim()
+	if gLogReporter:
+		gLogReporter.close()
+		gLogReporter = None
+	font.modified = 1
+
+
 	
+	if numGlyphs > kProgressBarThreshold:
+		# can end the progress bar only if we started it.
+		fl.EndProgress()
 
-	logMsg("All done with AC %s" % time.asctime())
+	if (not anyGlyphChanged) and options.doHistoryFile:
+		if (options.doReHintUnknown):
+			logMsg("No new hints. All selected glyphs were hinted and had same outline as recorded  in  %s." % (os.path.basename(hintHistory.filePath)))
+		else:
+			logMsg("No new hints. All selected glyphs either were hinted and had the same outline as recorded in  %s, or were not referenced in the hint info file." % (os.path.basename(hintHistory.filePath)))
+	return 1
 
 
-def Run_AC(flGlyph, fontInfo, fontPlist, options, isNewPlistFile):
-	# Convert Fl glyph data to the bez format, call the AC library, and
-	# then update the glyph with the new hint data, and possibly the new
-	# outline data.
-	glyphChanged = 0
+def getGlyphBezData(flGlyph, hintHistory, options, isNewHistoryFile):
+	# Returns the list of the bez data of each layer of the glyph, and the AC identifier
+	# recorded in the history file, or (None, None) if the glyph must not be hinted.
 	if len(flGlyph.nodes) == 0:
 		logMsg("Skipping glyph %s. A composite or Non-marking glyph - nothing to hint." % flGlyph.name)
-		return glyphChanged
+		return None, None
 	numLayers = flGlyph.layers_number
 	if numLayers == 0:
 		numLayers = 1 # allow for old FontLab variation.
 
-	mastersNodes = []
-	masterHints = []
-	outlinesChanged = 0
-	glyphChanged = 0
+	bezDataList = []
 	hasHints  = flGlyph.hhints or flGlyph.vhints
 	prevACIdentifier = None
 	for layer in range(numLayers):
@@ -396,29 +805,164 @@ def Run_AC(flGlyph, fontInfo, fontPlist, options, isNewPlistFile):
 		except (ACError, SyntaxError),e:
 			logMsg(e)
 			logMsg("Error in parsing FontLab glyph. Skipping glyph %s." % flGlyph.name)
-			return glyphChanged
+			return None, None
 			
 		if layer == 0 and options.doHistoryFile:
 			ACidentifier = makeACIdentifier(bezData) # no hints in this, so it does nto need special processing.
 
 			# If the glyph does not have hints, we always hint it.
 			if hasHints and (not options.doHintAll):
-				# If the glyph is not in the  plist file, then we skip it unless kReHintUnknown is set.
-				# If the glyph is in the plist file and the outlien ahs changed, we hint it. 
-				try:
-					(prevACIdentifier, ACtime) =  fontPlist[kACIDKey][flGlyph.name]
-				except KeyError:
-					if not (options.doReHintUnknown):
-						# Glyphs is hinted, but not referenced in the plist file. Skip it
-						if  not isNewPlistFile:
-							# Comment only if there is a plist file; otherwise, we'd be complaining for almost every glyph.
-							logMsg("\t%s Skipping glyph - it has hints, but it is not in the hint info plist file." % flGlyph.name)
-						return glyphChanged
-
-				if prevACIdentifier == ACidentifier: # there is an entry, in the plist file and it matches what's in the font.
-					return glyphChanged
+				# If the glyph is not in the history file, then we skip it unless kReHintUnknown is set.
+				# If the glyph is in the history file and the outlien ahs changed, we hint it. 
+				entry = hintHistory.get(flGlyph.name)
+				if entry:
+					prevACIdentifier = entry[0]
+				elif not (options.doReHintUnknown):
+					# Glyphs is hinted, but not referenced in the history file. Skip it
+					if  not isNewHistoryFile:
+						# Comment only if there is a history file; otherwise, we'd be complaining for almost every glyph.
+						logMsg("\t%s Skipping glyph - it has hints, but it is not in the hint history file." % flGlyph.name)
+					return None, None
+
+				if prevACIdentifier == ACidentifier: # there is an entry, in the history file and it matches what's in the font.
+					return None, None
+		bezDataList.append(bezData)
+	return bezDataList, prevACIdentifier
+
+
+def getACCommand(options, bezPaths):
+	if options.beVerbose:
+		verboseArg = ""
+	else:
+		verboseArg = " -q"
+
+	if options.allowPathChanges:
+		suppressEditArg = ""
+	else:
+		suppressEditArg = " -e"
+
+	if options.noHintSub:
+		supressHintSubArg = " -n"
+	else:
+		supressHintSubArg = ""
 
+	bezArgs = " ".join(["\"%s\"" % bezPath for bezPath in bezPaths])
+	return "autohintexe %s%s%s -s .new -f \"%s\" %s 2>&1" % (verboseArg, suppressEditArg, supressHintSubArg, options.tempFI, bezArgs)
+
+
+def getACUsage():
+	# Returns the usage text printed by autohintexe, or "" if it can't be run.
+	global gACUsage
+	if gACUsage is None:
+		try:
+			p = subprocess.Popen(["autohintexe", "-u"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+			gACUsage = p.communicate()[0]
+		except (IOError, OSError):
+			gACUsage = ""
+	return gACUsage
+
+
+def findACProgram():
+	# Returns the path of the autohintexe program found in the PATH directories, or None.
+	names = ["autohintexe"]
+	if os.name == "nt":
+		names.insert(0, "autohintexe.exe")
+	for dirPath in os.environ.get("PATH", "").split(os.pathsep):
+		for name in names:
+			filePath = os.path.join(dirPath, name)
+			if os.path.isfile(filePath):
+				return filePath
+	return None
+
+
+def getACIdentity():
+	# Returns a text which changes when another autohintexe program is installed: its path,
+	# size and modification time, and the usage text it prints.
+	global gACIdentity
+	if gACIdentity is None:
+		fields = []
+		filePath = findACProgram()
+		if filePath:
+			try:
+				stat = os.stat(filePath)
+				fields = [filePath, str(stat.st_size), str(int(stat.st_mtime))]
+			except OSError:
+				fields = [filePath]
+		fields.append(getACUsage())
+		gACIdentity = "\n".join(fields)
+	return gACIdentity
+
+
+def haveACPipe():
+	# Returns true if autohintexe has the -b option, with which the bez data is the last
+	# argument, and the hinted bez data is written to stdout.
+	global gHaveACPipe
+	if gHaveACPipe is None:
+		gHaveACPipe = "-b " in getACUsage()
+		if not gHaveACPipe:
+			logMsg("This version of autohintexe cannot be given the glyph data in memory. Temporary files are used.")
+	return gHaveACPipe
+
+
+def useACPipe(options):
+	return options.usePipes and not options.debug and haveACPipe()
+
+
+def runACPipe(bezData, options):
+	# Runs autohintexe on the bez data, which is passed on the command line; no bez file is
+	# written. Returns the hinted bez data, or None, and the text printed by autohintexe.
+	# None is also returned, without running autohintexe, if the command line would be too
+	# long; the caller then uses temporary files. No FontLab object is used, so this can run
+	# in a worker thread.
+	args = ["autohintexe"]
+	if not options.beVerbose:
+		args.append("-q")
+	if not options.allowPathChanges:
+		args.append("-e")
+	if options.noHintSub:
+		args.append("-n")
+	args.extend(["-f", options.tempFI, "-b", bezData])
+	# The same limit is used on all platforms, so that a font is hinted the same way everywhere.
+	if len(subprocess.list2cmdline(args)) > kMaxPipeCommandLength:
+		return None, "The glyph data is too long to be passed to autohintexe on its command line.\n"
+	try:
+		# close_fds keeps the pipes of the other worker threads from being inherited.
+		p = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, close_fds=(os.name != "nt"))
+		newBezData, log = p.communicate()
+	except (IOError, OSError), e:
+		return None, "Failed to run autohintexe: %s\n" % e
+	if p.returncode != 0 or not newBezData.strip():
+		newBezData = None
+	return newBezData, log
+
+
+def Run_AC(flGlyph, fontInfo, hintHistory, options, isNewHistoryFile, hintCache=None):
+	# Convert Fl glyph data to the bez format, call the AC library, and
+	# then update the glyph with the new hint data, and possibly the new
+	# outline data.
+	glyphChanged = 0
+	bezDataList, prevACIdentifier = getGlyphBezData(flGlyph, hintHistory, options, isNewHistoryFile)
+	if bezDataList is None:
+		return glyphChanged
+
+	newBezDataList = []
+	for bezData in bezDataList:
 		logMsg("Hinting %s." % flGlyph.name)
+		if hintCache:
+			newBezData = hintCache.get(bezData)
+			if newBezData:
+				newBezDataList.append(newBezData)
+				continue
+		if useACPipe(options):
+			newBezData, log = runACPipe(bezData, options)
+			if log:
+				logMsg(log)
+			if newBezData:
+				if hintCache:
+					hintCache.put(bezData, newBezData)
+				newBezDataList.append(newBezData)
+				continue
+			logMsg("Could not pass the glyph data of %s to autohintexe in memory. Temporary files are used." % (flGlyph.name))
 		bp = open(options.tempBez, "wt")
 		bp.write(bezData)
 		bp.close()
@@ -426,22 +970,7 @@ def Run_AC(flGlyph, fontInfo, fontPlist, options, isNewPlistFile):
 		if os.path.exists(options.tempBezNew):
 			os.remove(options.tempBezNew)
 		
-		if options.beVerbose:
-			verboseArg = ""
-		else:
-			verboseArg = " -q"
-	
-		if options.allowPathChanges:
-			suppressEditArg = ""
-		else:
-			suppressEditArg = " -e"
-	
-		if options.noHintSub:
-			supressHintSubArg = " -n"
-		else:
-			supressHintSubArg = ""
-	
-		command = "autohintexe %s%s%s -s .new -f \"%s\" \"%s\" 2>&1" % (verboseArg, suppressEditArg, supressHintSubArg, options.tempFI, options.tempBez)
+		command = getACCommand(options, [options.tempBez])
 		p = os.popen(command)
 		log = p.read()
 		p.close()
@@ -469,7 +998,173 @@ def Run_AC(flGlyph, fontInfo, fontPlist, options, isNewPlistFile):
 			msg = "Skipping glyph %s. Failure in processing outline data" % (flGlyph.name)
 			logMsg( msg)
 			return glyphChanged
-			
+		if hintCache and newBezData:
+			hintCache.put(bezData, newBezData)
+		newBezDataList.append(newBezData)
+
+	return applyACResults(flGlyph, newBezDataList, hintHistory, options, prevACIdentifier)
+
+
+def runACFiles(jobs, options, runTogether):
+	# Runs autohintexe on jobs, a list of (key, bez data), in a private temporary directory.
+	# If runTogether is true, the files are given to as few runs as possible; otherwise
+	# autohintexe is run once for each file. No FontLab object is used, so this can run
+	# in a worker thread. Returns a dictionary of key: hinted bez data, for the files that
+	# autohintexe hinted, and the text printed by autohintexe. If the bez data can be given
+	# to autohintexe in memory, autohintexe is run once for each job, and files are written
+	# only for the jobs that fail.
+	results = {}
+	logs = []
+	if useACPipe(options):
+		failedJobs = []
+		for key, bezData in jobs:
+			newBezData, log = runACPipe(bezData, options)
+			if log:
+				logs.append(log)
+			if newBezData:
+				results[key] = newBezData
+			else:
+				failedJobs.append((key, bezData))
+		if not failedJobs:
+			return results, "".join(logs)
+		logs.append("Could not pass the glyph data of %d glyph masters to autohintexe in memory. Temporary files are used.\n" % len(failedJobs))
+		jobs = failedJobs
+
+	tempDir = tempfile.mkdtemp()
+	try:
+		bezPaths = []
+		for i in range(len(jobs)):
+			bezPath = os.path.join(tempDir, "%d.bez" % i)
+			bp = open(bezPath, "wt")
+			bp.write(jobs[i][1])
+			bp.close()
+			bezPaths.append(bezPath)
+
+		# The files are split among several runs when the command line would be too long.
+		baseLength = len(getACCommand(options, []))
+		start = 0
+		while start < len(bezPaths):
+			end = start + 1
+			commandLength = baseLength + len(bezPaths[start]) + 3
+			while runTogether and end < len(bezPaths) and (commandLength + len(bezPaths[end]) + 3) <= kMaxCommandLength:
+				commandLength += len(bezPaths[end]) + 3
+				end += 1
+			command = getACCommand(options, bezPaths[start:end])
+			p = os.popen(command)
+			log = p.read()
+			p.close()
+			if options.debug:
+				logs.append(command + "\n")
+			if log:
+				logs.append(log)
+			start = end
+
+		for i in range(len(jobs)):
+			newBezPath = bezPaths[i] + ".new"
+			if os.path.exists(newBezPath):
+				bp = open(newBezPath, "rt")
+				results[jobs[i][0]] = bp.read()
+				bp.close()
+	finally:
+		if options.debug:
+			logs.append("Kept the AC bez files in %s\n" % tempDir)
+		else:
+			shutil.rmtree(tempDir, 1)
+	return results, "".join(logs)
+
+
+def runACInThreads(jobs, options, numThreads):
+	# Shares the jobs among numThreads worker threads, each one running runACFiles().
+	groups = []
+	for i in range(numThreads):
+		if jobs[i::numThreads]:
+			groups.append(jobs[i::numThreads])
+	outputs = [None] * len(groups)
+
+	def work(groupIndex):
+		try:
+			outputs[groupIndex] = runACFiles(groups[groupIndex], options, options.batchMode)
+		except:
+			outputs[groupIndex] = ({}, "".join(traceback.format_exception(*sys.exc_info())))
+
+	threads = []
+	for groupIndex in range(len(groups)):
+		thread = threading.Thread(target=work, args=(groupIndex,), name="AutoHint%d" % groupIndex)
+		thread.start()
+		threads.append(thread)
+	for thread in threads:
+		thread.join()
+
+	results = {}
+	logs = []
+	for groupResults, log in outputs:
+		results.update(groupResults)
+		logs.append(log)
+	return results, "".join(logs)
+
+
+def runACBatch(font, glyphIndexes, hintHistory, options, isNewHistoryFile, numThreads=1, hintCache=None):
+	# Hints the glyphs with as few runs of autohintexe as possible, shared among numThreads
+	# worker threads. The bez data is made from the FontLab glyphs by the main thread.
+	# Returns a dictionary of glyph index: (AC identifier recorded in the history file,
+	# list of the hinted bez data of each layer). The value is None for the glyphs that
+	# must not be hinted. The glyphs for which autohintexe did not write all the layers
+	# are left out, so they can be hinted again by themselves. The outlines found in the
+	# hint cache are not given to autohintexe.
+	results = {}
+	newBezData = {} # key: (glyph index, layer), value: hinted bez data
+	jobs = [] # list of ((glyph index, layer), bez data)
+	glyphLayers = [] # list of (glyph index, previous AC identifier, number of layers)
+	for gi in glyphIndexes:
+		bezDataList, prevACIdentifier = getGlyphBezData(font.glyphs[gi], hintHistory, options, isNewHistoryFile)
+		if bezDataList is None:
+			results[gi] = None
+			continue
+		for layer in range(len(bezDataList)):
+			cachedBezData = None
+			if hintCache:
+				cachedBezData = hintCache.get(bezDataList[layer])
+			if cachedBezData:
+				newBezData[(gi, layer)] = cachedBezData
+			else:
+				jobs.append(((gi, layer), bezDataList[layer]))
+		glyphLayers.append((gi, prevACIdentifier, len(bezDataList)))
+
+	if jobs:
+		if numThreads > 1:
+			hintedBezData, log = runACInThreads(jobs, options, numThreads)
+		else:
+			hintedBezData, log = runACFiles(jobs, options, 1)
+		if log:
+			logMsg(log)
+		newBezData.update(hintedBezData)
+		if hintCache:
+			for key, bezData in jobs:
+				if hintedBezData.get(key):
+					hintCache.put(bezData, hintedBezData[key])
+
+	for gi, prevACIdentifier, numLayers in glyphLayers:
+		newBezDataList = []
+		for layer in range(numLayers):
+			if not newBezData.has_key((gi, layer)):
+				break
+			newBezDataList.append(newBezData[(gi, layer)])
+		if len(newBezDataList) == numLayers:
+			results[gi] = (prevACIdentifier, newBezDataList)
+	return results
+
+
+def applyACResults(flGlyph, newBezDataList, hintHistory, options, prevACIdentifier):
+	# Updates the glyph with the hinted bez data of each layer.
+	glyphChanged = 0
+	numLayers = flGlyph.layers_number
+	if numLayers == 0:
+		numLayers = 1 # allow for old FontLab variation.
+
+	mastersNodes = []
+	masterHints = []
+	outlinesChanged = 0
+	for newBezData in newBezDataList:
 		if not newBezData:
 			msg = "Skipping glyph %s. Failure in processing outline data" % (flGlyph.name)
 			logMsg( msg)
@@ -489,7 +1184,7 @@ def Run_AC(flGlyph, fontInfo, fontPlist, options, isNewPlistFile):
 		if options.allowPathChanges:
 			if  options.doHistoryFile:
 				if prevACIdentifier and (prevACIdentifier != ACidentifier):
-					logMsg("\t%s Glyph outline changed" % name)
+					logMsg("\t%s Glyph outline changed" % flGlyph.name)
 					outlinesChanged = 1
 			else:
 					outlinesChanged = 1
@@ -504,7 +1199,7 @@ def Run_AC(flGlyph, fontInfo, fontPlist, options, isNewPlistFile):
 	glyphChanged = 1
 	if changeglyphs: # changeglyphs is a test flag to leave the glyphs unchanged when verifying auto-hinting.
 		if options.doHistoryFile:
-			fontPlist[kACIDKey][flGlyph.name] = (ACidentifier, time.asctime())
+			hintHistory.put(flGlyph.name, ACidentifier, time.asctime())
 		if outlinesChanged:
 			flGlyph.Clear()
 			if numLayers == 1:
@@ -585,10 +1280,15 @@ class ACOptions:
 		self.doHistoryFile = 0
 		self.doReHintUnknown = 1
 		self.doHintAll = 0
+		self.exportHistoryPlist = 1
 		self.allowPathChanges = 0
 		self.noHintSub = 0
 		self.noFlex = 0
 		self.beVerbose = 1
+		self.batchMode = 0
+		self.numThreads = 1
+		self.useHintCache = 0
+		self.usePipes = 0
 		self.debug = 0
 
 		# items not written to prefs
@@ -693,7 +1393,12 @@ class ACDialog:
 		yt5 = yt4 + 40
 		yt6 = yt5 + 35		
 		yt7 = yt6 + 35		
-		lastY = yt7 + 40
+		yt8 = yt7 + 35
+		yt9 = yt8 + 35
+		yt10 = yt9 + 35
+		yt11 = yt10 + 35
+		yt12 = yt11 + 35
+		lastY = yt12 + 40
 
 		dHeight = lastY + 50
 		
@@ -746,6 +1451,18 @@ class ACDialog:
 
 		self.d.AddControl(CHECKBOXCONTROL, Rect(xt1, yt7, xt1+300, yt7+30), "doHintAll", STYLE_CHECKBOX, "Hint all specified glyphs") 
 
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xt1, yt8, xt1+300, yt8+30), "batchMode", STYLE_CHECKBOX, "Run autohintexe once for many glyphs") 
+
+		self.d.AddControl(EDITCONTROL, Rect(xt1, yt9-5, xt1+30, aAUTO), "numThreads", STYLE_EDIT+cTO_CENTER) 
+
+		self.d.AddControl(STATICCONTROL, Rect(xt1+35, yt9, xt1+400, aAUTO), "numThreadsLabel", STYLE_LABEL, "Number of autohintexe processes run at the same time") 
+
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xt1, yt10, xt1+400, yt10+30), "useHintCache", STYLE_CHECKBOX, "Reuse the hints of identical outlines (hint cache)") 
+
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xt1, yt11, xt1+400, yt11+30), "exportHistoryPlist", STYLE_CHECKBOX, "Also write the history to the .plist file") 
+
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xt1, yt12, xt1+400, yt12+30), "usePipes", STYLE_CHECKBOX, "Pass the glyph data to autohintexe in memory (no temporary files)") 
+
 		helpYPos =  dHeight-35
 		self.d.AddControl(BUTTONCONTROL, Rect(xt1, helpYPos, xt1+60, helpYPos+20), "help", STYLE_BUTTON, "Help") 
 
@@ -789,6 +1506,9 @@ class ACDialog:
 	def on_doHintAll(self, code):
 		self.d.GetValue("doHintAll")
 
+	def on_exportHistoryPlist(self, code):
+		self.d.GetValue("exportHistoryPlist")
+
 	def on_doCurrentFont(self, code):
 		self.d.GetValue("doCurrentFont")
 		self.toggleOffAllOtherSelections("doCurrentFont", self.CmdList1, not self.doCurrentFont)
@@ -809,6 +1529,18 @@ class ACDialog:
 	def on_beVerbose(self, code):
 		self.d.GetValue("beVerbose")
 
+	def on_batchMode(self, code):
+		self.d.GetValue("batchMode")
+
+	def on_numThreads(self, code):
+		self.d.GetValue("numThreads")
+
+	def on_useHintCache(self, code):
+		self.d.GetValue("useHintCache")
+
+	def on_usePipes(self, code):
+		self.d.GetValue("usePipes")
+
 	def on_ok(self,code):
 		self.result = 1
 		# update options
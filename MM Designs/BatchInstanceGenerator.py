@@ -0,0 +1,299 @@
+#FLM: Batch Instance Generator
+
+###################################################
+### THE VALUES BELOW CAN BE EDITED AS NEEDED ######
+###################################################
+
+kBatchTimingFileName = "batch.csv"
+
+###################################################
+
+__copyright__ =  """
+Copyright 2026 Adobe Systems Incorporated (http://www.adobe.com/). All Rights Reserved.
+This software is licensed as OpenSource, under the Apache License, Version 2.0. This license is available at: http://opensource.org/licenses/Apache-2.0.
+"""
+
+__doc__ = """
+Batch Instance Generator v1.1 - Oct 17 2026
+
+This script generates the instances of all the Multiple Master (MM) FontLab fonts of
+a project. It asks for the project's folder, and looks in it, and in all its
+sub-directories, for the FontLab files (.vfb) that have an "instances" file next to
+them. A folder that has more than one FontLab file is skipped, since their instances
+would be written to the same folders. Each of these fonts is opened, its instances are generated by the
+InstanceGenerator.py script (which must be in the Macros folder), and it is closed.
+The instances are written next to the MM font, as if the Instance Generator script had
+been run with the folder of the MM font selected as the output folder. The FontLab files
+that are not MM fonts are skipped.
+
+The options are the ones last set in the Instance Generator dialog. Hold down the
+CONTROL key while starting this script in order to set them.
+
+The instances of all the fonts are shared among the workers (FontLab sessions) set by
+the "Number of workers" option of the Instance Generator. Each worker must run this
+script with the same project folder and number of workers, and its own "Worker index".
+The instances are assigned to the worker with the least work so far, starting with the
+instances of the largest fonts (the size of the .vfb file is used as the measure of the
+work needed by each of its instances), so that all the workers finish at about the same
+time. Each worker processes its fonts from the largest to the smallest.
+
+The time spent by each instance is written to the "_instanceReports_" sub-directory of
+the project's folder, in a file for each worker. When a worker finishes, the times of all
+the workers that have finished are combined in the file "batch.csv", and a summary of
+the time spent on each font is printed. The times written by earlier runs are not used.
+
+==================================================
+Versions:
+v1.0 - Oct 17 2026 - Initial release
+v1.1 - Oct 17 2026 - The folders with more than one FontLab file are skipped. The times of earlier runs are no longer used in the summary.
+"""
+
+import os, sys, csv, time
+
+
+def importMacroModule(moduleName):
+	# The modules shared by these macros are kept next to them, in the Macros folder.
+	# FontLab does not always put that folder in the search path, so look for it.
+	try:
+		return __import__(moduleName)
+	except ImportError:
+		pass
+	fileName = moduleName + ".py"
+	userFolder = os.path.expanduser('~')
+	customModulePathMAC = os.path.join(userFolder, 'Library', 'Application Support', 'FontLab', 'Studio 5', 'Macros')
+	customModulePathPC = os.path.join(userFolder, 'Documents', 'FontLab', 'Studio5', 'Macros')
+	possibleModulePaths = [fl.userpath, customModulePathMAC, customModulePathPC]
+	for path in possibleModulePaths:
+		for root, dirs, files in os.walk(path):
+			if fileName in files:
+				if root not in sys.path:
+					sys.path.append(root)
+				return __import__(moduleName)
+	print "Failed to find the module %s in the following folders:\n%s" % (fileName, '\n'.join(possibleModulePaths))
+	raise ImportError(moduleName)
+
+InstancesFile = importMacroModule("InstancesFile")
+from InstancesFile import ParseError, readInstanceFile, kInstancesDataFileName, kFontName
+InstanceGenerator = importMacroModule("InstanceGenerator")
+from InstanceGenerator import (InstGenOptions, InstGenDialog, InstGenHelpDialog, makeInstances, makeFaceFolder,
+	getWorkerSettings, formatDuration, kReportsFolderName)
+from AdobeFontLabUtils import checkControlKeyPress
+
+
+class BatchSource:
+	def __init__(self, vfbPath, relativePath, instanceNames):
+		self.vfbPath = vfbPath
+		self.relativePath = relativePath
+		self.instanceNames = instanceNames
+		self.weight = os.path.getsize(vfbPath) # estimated work of each instance
+
+
+def findSources(rootFolder):
+	# Returns a list of BatchSource, one for each .vfb file that has an "instances" file next to it.
+	# The instances of a font are written next to it, so a folder with more than one .vfb file is skipped.
+	sources = []
+	for root, dirs, files in os.walk(rootFolder):
+		dirs.sort()
+		if kInstancesDataFileName not in files:
+			continue
+		instancesFilePath = os.path.join(root, kInstancesDataFileName)
+		vfbNames = [fileName for fileName in files if os.path.splitext(fileName)[1].lower() == ".vfb"]
+		if not vfbNames:
+			continue
+		if len(vfbNames) > 1:
+			vfbNames.sort()
+			print "Skipping the folder %s. It has more than one FontLab file (%s), whose instances would be written to the same folders." % (root, ", ".join(vfbNames))
+			continue
+		try:
+			instancesList = readInstanceFile(instancesFilePath)
+		except ParseError:
+			print "Error parsing file or file is empty: %s" % instancesFilePath
+			continue
+		instanceNames = [instanceDict[kFontName] for instanceDict in instancesList]
+		vfbPath = os.path.join(root, vfbNames[0])
+		relativePath = vfbPath[len(rootFolder):].lstrip(os.sep)
+		sources.append(BatchSource(vfbPath, relativePath, instanceNames))
+	return sources
+
+
+def scheduleInstances(sources, numWorkers):
+	# Returns a list with, for each worker, a list of (BatchSource, instance names), the
+	# largest sources first. Each instance is given to the worker with the least work so far,
+	# starting with the largest sources. The result is the same in all the workers.
+	sources = sources[:]
+	sources.sort(lambda a, b: cmp(b.weight, a.weight) or cmp(a.relativePath, b.relativePath))
+	workerLoads = [0] * numWorkers
+	workerSources = []
+	for workerIndex in range(numWorkers):
+		workerSources.append([])
+	for source in sources:
+		assignedNames = {} # key: worker index, value: list of instance names
+		for instanceName in source.instanceNames:
+			workerIndex = workerLoads.index(min(workerLoads))
+			workerLoads[workerIndex] += source.weight
+			assignedNames.setdefault(workerIndex, []).append(instanceName)
+		for workerIndex, instanceNames in assignedNames.items():
+			workerSources[workerIndex].append((source, instanceNames))
+	return workerSources
+
+
+def getBatchTimingPath(rootFolder, numWorkers, workerIndex):
+	reportsFolder = makeFaceFolder(rootFolder, kReportsFolderName)
+	return os.path.join(reportsFolder, "batch.worker%dof%d.timing" % (workerIndex, numWorkers))
+
+
+def removeBatchTiming(rootFolder, numWorkers, workerIndex):
+	# Removes the timing file left by this worker in an earlier run.
+	timingPath = getBatchTimingPath(rootFolder, numWorkers, workerIndex)
+	if os.path.exists(timingPath):
+		try:
+			os.remove(timingPath)
+		except OSError:
+			print "Failed to remove the timing file %s" % timingPath
+
+
+def writeBatchTiming(rootFolder, numWorkers, workerIndex, startTime, endTime, sourceTimes):
+	timingDict = {
+		"numWorkers": numWorkers,
+		"workerIndex": workerIndex,
+		"startTime": startTime,
+		"endTime": endTime,
+		"sourceTimes": sourceTimes, # list of (relative path of the source, list of (instance name, seconds))
+		}
+	timingPath = getBatchTimingPath(rootFolder, numWorkers, workerIndex)
+	try:
+		fp = open(timingPath, "wt")
+		fp.write(repr(timingDict))
+		fp.close()
+	except (IOError, OSError):
+		print "Failed to write the timing file %s" % timingPath
+
+
+def writeBatchSummary(rootFolder, numWorkers, startTime):
+	# Reads the timing files written by all the workers, including the ones that ran in
+	# other FontLab sessions, writes the combined timing file, and prints a summary. The
+	# workers run at the same time, so a file that was written before this worker started
+	# is left from an earlier run, by a worker that has not yet started this run.
+	timingDicts = []
+	for workerIndex in range(numWorkers):
+		timingPath = getBatchTimingPath(rootFolder, numWorkers, workerIndex)
+		if not os.path.exists(timingPath):
+			continue
+		try:
+			fp = open(timingPath, "rt")
+			timingDict = eval(fp.read())
+			fp.close()
+		except (IOError, OSError, SyntaxError):
+			print "Failed to read the timing file %s" % timingPath
+			continue
+		if timingDict["endTime"] >= startTime:
+			timingDicts.append(timingDict)
+
+	if not timingDicts:
+		return
+
+	rows = []
+	sourceTotals = {}
+	sourcePaths = []
+	for timingDict in timingDicts:
+		for relativePath, instanceTimes in timingDict["sourceTimes"]:
+			if not sourceTotals.has_key(relativePath):
+				sourceTotals[relativePath] = [0, 0]
+				sourcePaths.append(relativePath)
+			for instanceName, seconds in instanceTimes:
+				rows.append([relativePath, instanceName, timingDict["workerIndex"], "%.4f" % seconds])
+				sourceTotals[relativePath][0] += 1
+				sourceTotals[relativePath][1] += seconds
+
+	filePath = os.path.join(makeFaceFolder(rootFolder, kReportsFolderName), kBatchTimingFileName)
+	try:
+		fp = open(filePath, "wb")
+		writer = csv.writer(fp)
+		writer.writerow(["source", "instance", "worker", "seconds"])
+		writer.writerows(rows)
+		fp.close()
+	except (IOError, OSError):
+		print "Failed to write the timing file %s" % filePath
+
+	print "Batch summary (%d of %d workers finished):" % (len(timingDicts), numWorkers)
+	for relativePath in sourcePaths:
+		numInstances, seconds = sourceTotals[relativePath]
+		print "\t%s: %d instances in %s" % (relativePath, numInstances, formatDuration(seconds))
+	for timingDict in timingDicts:
+		print "\tWorker %d: %s" % (timingDict["workerIndex"], formatDuration(timingDict["endTime"] - timingDict["startTime"]))
+	wallTime = max([timingDict["endTime"] for timingDict in timingDicts]) - min([timingDict["startTime"] for timingDict in timingDicts])
+	print "\tWall time: %s" % formatDuration(wallTime)
+
+
+def makeBatchInstances(options):
+	numWorkers, workerIndex = getWorkerSettings(options)
+	if numWorkers is None:
+		return
+
+	rootFolder = fl.GetPathName("Select the project's folder")
+
+	# Cancel was clicked or Esc key was pressed
+	if not rootFolder:
+		return
+
+	sources = findSources(rootFolder)
+	if not sources:
+		print "Could not find any FontLab file with an '%s' file next to it in the path below\n\t%s" % (kInstancesDataFileName, rootFolder)
+		return
+
+	workerSources = scheduleInstances(sources, numWorkers)[workerIndex]
+	if numWorkers > 1:
+		fileNamePrefix = "worker%dof%d." % (workerIndex, numWorkers)
+		print "Worker %d of %d: processing %d of the %d fonts." % (workerIndex, numWorkers, len(workerSources), len(sources))
+	else:
+		fileNamePrefix = ""
+
+	t1 = time.time()
+	removeBatchTiming(rootFolder, numWorkers, workerIndex)
+	sourceTimes = []
+	for source, instanceNames in workerSources:
+		print
+		print "=" * 50
+		print "%s (%d instances)" % (source.relativePath, len(instanceNames))
+		fl.Open(source.vfbPath)
+		fontMM = fl.font
+		if len(fontMM) == 0 or fontMM[0].layers_number == 1:
+			print "Skipping the font. It is not MM."
+		else:
+			instanceTimes = makeInstances(options, os.path.dirname(source.vfbPath), instanceNames, fileNamePrefix)
+			if instanceTimes:
+				sourceTimes.append((source.relativePath, instanceTimes))
+		fontMM.modified = 0
+		fl.Close(fl.ifont)
+	t2 = time.time()
+
+	print
+	print "Batch completed in %s.\n" % formatDuration(t2 - t1)
+	writeBatchTiming(rootFolder, numWorkers, workerIndex, t1, t2, sourceTimes)
+	writeBatchSummary(rootFolder, numWorkers, t1)
+
+
+def run():
+	dontShowDialog = checkControlKeyPress()
+	if dontShowDialog:
+		print "Hold down CONTROL key while starting this script in order to set options.\n"
+		options = InstGenOptions()
+		options._getPrefs() # load current settings from prefs
+		makeBatchInstances(options)
+		return
+
+	result = 2
+	while result == 2:
+		IGd = InstGenDialog()
+		result = IGd.Run() # returns 0 for cancel, 1 for ok, 2 for help
+		if result == 1:
+			options = InstGenOptions()
+			options._getPrefs() # load current settings from prefs
+			makeBatchInstances(options)
+		elif result == 2:
+			IGh = InstGenHelpDialog()
+			result = IGh.Run() # returns 0 for cancel, 2 for ok
+
+
+if __name__ == "__main__":
+	run()
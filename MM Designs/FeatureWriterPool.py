@@ -0,0 +1,211 @@
+#FLM: Feature Writer Pool (module)
+
+###################################################
+### THE VALUES BELOW CAN BE EDITED AS NEEDED ######
+###################################################
+
+kNumThreads = 2 # Number of feature files written at the same time.
+
+###################################################
+
+__copyright__ =  """
+Copyright 2026 Adobe Systems Incorporated (http://www.adobe.com/). All Rights Reserved.
+This software is licensed as OpenSource, under the Apache License, Version 2.0. This license is available at: http://opensource.org/licenses/Apache-2.0.
+"""
+
+__doc__ = """
+Feature Writer Pool v1.2 - Oct 17 2026
+
+This module is used by other scripts. When run as a macro, it only prints this text.
+
+It runs jobs (e.g. writing the 'kern' and 'mark' feature files of an instance from a
+FontSnapshot) in background threads, while the main thread goes on with other work.
+The jobs must not use any FontLab object, since the FontLab objects can only be used
+from the main thread.
+
+The text printed by the jobs is kept, and is printed by the main thread when the job is
+reported, in the order in which the jobs were added. The errors raised by the jobs are
+reported the same way. A callback can be given for each job; it is called by the main
+thread, when the job is reported, if the job did not fail.
+
+reportFinished() reports the jobs that have finished, without waiting for the others;
+the main thread calls it whenever it can, so that the callbacks are not held back until
+the end of the run. wait() waits for the jobs added so far, and reports them, but keeps
+the threads running, so more jobs can be added afterwards. It is used for releasing the
+data held by the jobs (e.g. the FontSnapshots) when the memory usage gets too high.
+join() waits for all the jobs, reports them, and stops the threads.
+
+The text printed by the jobs must not reach FontLab's output window from a background
+thread, so sys.stdout is replaced while jobs are waiting or running, and only then: it is
+put back as soon as all the jobs added so far have finished and been reported.
+
+==================================================
+Versions:
+v1.0 - Oct 17 2026 - Initial release
+v1.1 - Oct 17 2026 - Added wait().
+v1.2 - Oct 17 2026 - Added reportFinished(). sys.stdout is only replaced while jobs are pending.
+"""
+
+import sys
+import time
+import threading
+import traceback
+import Queue
+
+
+class ThreadOutput:
+	# Replaces sys.stdout while jobs are pending. The text printed by the main thread
+	# is written right away; the text printed by the jobs is kept in the job's buffer.
+	def __init__(self):
+		self.stream = None
+		self.buffers = {} # key: thread name, value: list of strings
+		self.lock = threading.Lock()
+
+	def write(self, text):
+		threadName = threading.currentThread().getName()
+		self.lock.acquire()
+		try:
+			buffer = self.buffers.get(threadName)
+			if buffer is None:
+				(self.stream or sys.stdout).write(text)
+			else:
+				buffer.append(text)
+		finally:
+			self.lock.release()
+
+	def flush(self):
+		pass
+
+	def startBuffer(self):
+		self.lock.acquire()
+		try:
+			self.buffers[threading.currentThread().getName()] = []
+		finally:
+			self.lock.release()
+
+	def endBuffer(self):
+		self.lock.acquire()
+		try:
+			buffer = self.buffers.pop(threading.currentThread().getName(), [])
+		finally:
+			self.lock.release()
+		return "".join(buffer)
+
+
+class FeatureWriterJob:
+	def __init__(self, name, function, args, callback, callbackArgs):
+		self.name = name
+		self.function = function
+		self.args = args
+		self.callback = callback
+		self.callbackArgs = callbackArgs
+		self.output = ""
+		self.error = None
+		self.seconds = 0
+		self.isFinished = 0
+
+
+class FeatureWriterPool:
+	def __init__(self, numThreads=kNumThreads):
+		self.jobs = []
+		self.reportedCount = 0 # number of jobs already reported by wait() or join()
+		self.pendingCount = 0 # number of jobs not finished yet
+		self.condition = threading.Condition()
+		self.queue = Queue.Queue()
+		self.output = ThreadOutput()
+		self.threads = []
+		for i in range(numThreads):
+			thread = threading.Thread(target=self._work, name="FeatureWriter%d" % i)
+			thread.setDaemon(1)
+			thread.start()
+			self.threads.append(thread)
+
+	def _work(self):
+		while 1:
+			job = self.queue.get()
+			if job is None:
+				return
+			self.output.startBuffer()
+			startTime = time.time()
+			try:
+				job.function(*job.args)
+			except:
+				job.error = "".join(traceback.format_exception(*sys.exc_info()))
+			job.seconds = time.time() - startTime
+			job.output = self.output.endBuffer()
+			self.condition.acquire()
+			try:
+				job.isFinished = 1
+				self.pendingCount -= 1
+				self.condition.notifyAll()
+			finally:
+				self.condition.release()
+
+	def add(self, name, function, args, callback=None, callbackArgs=()):
+		job = FeatureWriterJob(name, function, args, callback, callbackArgs)
+		self.jobs.append(job)
+		if self.output.stream is None:
+			# The jobs' text is kept apart from now on, until they have all been reported.
+			self.output.stream = sys.stdout
+			sys.stdout = self.output
+		self.condition.acquire()
+		try:
+			self.pendingCount += 1
+		finally:
+			self.condition.release()
+		self.queue.put(job)
+
+	def reportFinished(self):
+		# Prints the output of the jobs that have finished, without waiting for the others.
+		# Returns the list of jobs that were reported.
+		return self._report()
+
+	def wait(self):
+		# Waits for the jobs added so far to finish, and prints their output.
+		# Returns the list of jobs that were not reported yet.
+		self.condition.acquire()
+		try:
+			while self.pendingCount:
+				self.condition.wait()
+		finally:
+			self.condition.release()
+		return self._report()
+
+	def join(self):
+		# Waits for all the jobs to finish, and prints their output.
+		# Returns the list of jobs that were not reported yet.
+		for thread in self.threads:
+			self.queue.put(None)
+		for thread in self.threads:
+			thread.join()
+		return self._report()
+
+	def _report(self):
+		# The jobs are reported in the order they were added, so a job is only reported
+		# once the jobs added before it are.
+		self.condition.acquire()
+		try:
+			count = self.reportedCount
+			while count < len(self.jobs) and self.jobs[count].isFinished:
+				count += 1
+			if count == len(self.jobs) and self.output.stream is not None:
+				sys.stdout = self.output.stream
+				self.output.stream = None
+		finally:
+			self.condition.release()
+		jobs = self.jobs[self.reportedCount:count]
+		self.reportedCount = count
+		for job in jobs:
+			if job.output:
+				print "%s:" % job.name
+				print job.output.rstrip()
+			if job.error:
+				print "ERROR: Failed to write the feature files of %s." % job.name
+				print job.error
+			elif job.callback:
+				job.callback(*job.callbackArgs)
+		return jobs
+
+
+if __name__ == "__main__":
+	print __doc__
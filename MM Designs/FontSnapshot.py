@@ -0,0 +1,155 @@
+#FLM: Font Snapshot (module)
+
+__copyright__ =  """
+Copyright 2026 Adobe Systems Incorporated (http://www.adobe.com/). All Rights Reserved.
+This software is licensed as OpenSource, under the Apache License, Version 2.0. This license is available at: http://opensource.org/licenses/Apache-2.0.
+"""
+
+__doc__ = """
+Font Snapshot v1.1 - Oct 17 2026
+
+This module is used by other scripts. When run as a macro, it only prints this text.
+
+It copies the data of a FontLab font that is needed for writing the 'kern' and 'mark'
+features (glyph names, Unicode values, advance widths, kerning pairs, anchors and
+classes) into plain Python objects. These objects have the same attributes and methods
+as the FontLab objects they copy, so they can be given to the WriteFeaturesKernFDK and
+WriteFeaturesMarkFDK modules in place of the FontLab font.
+
+The FontLab objects can only be used from the main thread, and only while the font is
+open; the snapshot can be used from any thread, and after the font has been closed.
+
+Only the data listed above is copied. If the WriteFeaturesKernFDK or WriteFeaturesMarkFDK
+module reads any other attribute of the font, of a glyph, of a kerning pair or of an
+anchor, a SnapshotAttributeError is raised, which names that attribute.
+
+==================================================
+Versions:
+v1.0 - Oct 17 2026 - Initial release
+v1.1 - Oct 17 2026 - Reading an attribute that is not copied raises SnapshotAttributeError.
+"""
+
+
+class SnapshotAttributeError(AttributeError):
+	pass
+
+
+class Snapshot:
+	# Base class of the snapshot objects. It is only called for the attributes that were not copied.
+	def __getattr__(self, name):
+		if name.startswith("__"):
+			raise AttributeError(name)
+		raise SnapshotAttributeError("%s has no attribute '%s', since it is not copied from the font" % (self.__class__.__name__, name))
+
+
+class PointSnapshot(Snapshot):
+	def __init__(self, x, y):
+		self.x = x
+		self.y = y
+
+
+class KerningPairSnapshot(Snapshot):
+	def __init__(self, key, value):
+		self.key = key # index of the right glyph
+		self.value = value
+
+
+class AnchorSnapshot(Snapshot):
+	def __init__(self, name, x, y, mark=0):
+		self.name = name
+		self.x = x
+		self.y = y
+		self.p = PointSnapshot(x, y)
+		self.mark = mark
+
+
+class GlyphSnapshot(Snapshot):
+	def __init__(self, name, index, unicode=None, unicodes=None, width=0):
+		self.name = name
+		self.index = index
+		self.unicode = unicode
+		if unicodes is None:
+			unicodes = []
+		self.unicodes = unicodes
+		self.width = width
+		self.layers_number = 1
+		self.kerning = []
+		self.anchors = []
+		self.components = []
+
+	def GetMetrics(self, masterIndex=0):
+		return PointSnapshot(self.width, 0)
+
+
+class FontSnapshot(Snapshot):
+	def __init__(self, glyphs, classes, classSides, fontNames):
+		self.glyphs = glyphs
+		self.classes = classes
+		self._classSides = classSides # list of (left, right) flags, one per class
+		self._glyphIndexes = {}
+		for glyph in glyphs:
+			self._glyphIndexes[glyph.name] = glyph.index
+		self.family_name = fontNames.get("family_name")
+		self.font_name = fontNames.get("font_name")
+		self.full_name = fontNames.get("full_name")
+		self.menu_name = fontNames.get("menu_name")
+		self.style_name = fontNames.get("style_name")
+		self.file_name = fontNames.get("file_name")
+
+	def __len__(self):
+		return len(self.glyphs)
+
+	def __getitem__(self, key):
+		if isinstance(key, (str, unicode)):
+			return self.glyphs[self._glyphIndexes[key]]
+		return self.glyphs[key]
+
+	def has_key(self, glyphName):
+		return self._glyphIndexes.has_key(glyphName)
+
+	def FindGlyph(self, glyphName):
+		return self._glyphIndexes.get(glyphName, -1)
+
+	def GetClassLeft(self, classIndex):
+		return self._classSides[classIndex][0]
+
+	def GetClassRight(self, classIndex):
+		return self._classSides[classIndex][1]
+
+
+kFontNameAttributes = ["family_name", "font_name", "full_name", "menu_name", "style_name", "file_name"]
+
+
+def getClassSides(f):
+	classSides = []
+	for classIndex in range(len(f.classes)):
+		try:
+			classSides.append((f.GetClassLeft(classIndex), f.GetClassRight(classIndex)))
+		except AttributeError:
+			classSides.append((None, None))
+	return classSides
+
+
+def getFontNames(f):
+	fontNames = {}
+	for attribute in kFontNameAttributes:
+		fontNames[attribute] = getattr(f, attribute, None)
+	return fontNames
+
+
+def snapshotFont(f):
+	# Returns a FontSnapshot of the single-master FontLab font f.
+	glyphs = []
+	for gid in range(len(f.glyphs)):
+		flGlyph = f.glyphs[gid]
+		glyph = GlyphSnapshot(flGlyph.name, gid, flGlyph.unicode, list(flGlyph.unicodes), flGlyph.width)
+		for kerningPair in flGlyph.kerning:
+			glyph.kerning.append(KerningPairSnapshot(kerningPair.key, kerningPair.value))
+		for anchor in flGlyph.anchors:
+			glyph.anchors.append(AnchorSnapshot(anchor.name, anchor.x, anchor.y, anchor.mark))
+		glyphs.append(glyph)
+	return FontSnapshot(glyphs, list(f.classes), getClassSides(f), getFontNames(f))
+
+
+if __name__ == "__main__":
+	print __doc__
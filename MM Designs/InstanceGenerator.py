@@ -8,6 +8,16 @@ kFontInstanceFileName = "font.pfa"
 kInstancesDataFileName = "instances"
 kPrefsFileName =  "InstanceGenerator.prefs"
 kVFBinstancesFolderName = "_vfbInstances_"
+kReportsFolderName = "_instanceReports_"
+kProofsFolderName = "_proofs_"
+kProofGlyphListFile = "proofList.txt"
+kManifestFileName = "instances.manifest"
+kJournalFileName = "instances.journal"
+kStagingFolderName = "_partial_"
+kStageTimesFileName = "stages.csv"
+kGlyphTimesFileName = "glyphs.csv"
+kProfileDataFileName = "instances.prof"
+kMemoryUsageFileName = "memory.csv"
 
 ###################################################
 
@@ -34,7 +44,7 @@ DEALINGS IN THE SOFTWARE.
 """
 
 __doc__ = """
-Instance Generator v2.4 - Mar 10 2013
+Instance Generator v2.18 - Oct 17 2026
 
 This script will generate a set of single-master fonts ("instances") from a Multiple
 Master (MM) FontLab font. For each instance, the script will create an Unix-style Type 1 
@@ -62,6 +72,103 @@ is named "_vfbInstances_". The Type 1 font files are written to a sub-directory
 the font's PostScript name after the hyphen, or "Regular" if there is no hyphen (e.g. 
 if the font's PostScript name is MyFont-BoldItalic, the folder will be named "BoldItalic")
 
+Large families can be built by several FontLab sessions at the same time. Open the MM
+font in each session, and set the "Number of workers" option to the number of sessions,
+and the "Worker index" option to a different value (0 to the number of sessions minus 1)
+in each one. The instances are dealt out evenly to the workers, and each worker writes
+exactly the same files the single-session build would write for its share of the
+instances. Each worker also records its timings in a sub-directory named
+"_instanceReports_"; the summary printed at the end of a run shows the wall time and
+the time spent by each worker that has finished so far.
+
+If the option "Skip unchanged instances" is checked, the script keeps a manifest file
+named "instances.manifest" in the "_instanceReports_" sub-directory. For each instance,
+the manifest records a checksum of the instance's record in the "instances" file, of the
+instance's glyph data (outlines, metrics, hints, anchors, components and kerning of every
+glyph which is not removed by the ExtraGlyphs field), of the MM font's classes and
+font-wide values, and of the generation options that change the instance's files (the
+"Instances" filter and the worker settings do not). On the next run, the instances whose
+checksum did not change and whose files are all still present are skipped.
+The data of each glyph, in all the masters, is read from the MM font only once per run,
+and the checksum of an instance is made from its coordinates and the checksums of its
+glyphs. Editing an MM exception glyph (e.g. "a-black") therefore only triggers the
+rebuild of the instances that keep it, but editing a master triggers the rebuild of
+every instance. The time taken by the checksums is printed before the instances are built.
+
+If the option "Only remove overlaps where needed" is checked, the glyphs are decomposed
+and their overlaps removed only if they have components, contours that cross, or contours
+with the same direction placed one inside the other. The other glyphs have nothing to
+decompose or merge, so they are skipped. The check uses the bounds of the
+curves' points, which hold the curves, so it never misses an overlap; a glyph whose
+curves are too close together to be told apart this way is decomposed and its overlaps
+removed. This option is off by default: removing the overlaps may also change the
+direction and the start point of the contours of a glyph that has no overlap, so the
+glyphs that are skipped can differ from those made with the option off.
+
+The time spent in each stage of the processing of each instance (instance creation,
+hinting parameters, exception glyphs, overlap check, decompose and overlap removal,
+VFB save, PFA generation, 'kern' feature and 'mark' feature) is saved in the file
+"stages.csv", and the time spent by each glyph in the overlap check and in the decompose
+and overlap removal stages is saved in the file "glyphs.csv". Both files are written to
+the "_instanceReports_" sub-directory, and their names start with "worker<index>of<number>."
+when the instances are split among several workers. If the option "Save profiling data"
+is checked, the cProfile data of the run is also saved there, in the file "instances.prof",
+which can be read with Python's pstats module.
+
+If the option "Autohint the instances" is checked, each instance is autohinted after
+its overlaps are removed, and before its files are saved, by the AutoHint.py script
+(in the Hinting folder of the Macros), with the options last set in the AutoHint dialog.
+The hinting uses the alignment zones and stem widths of the instance, as set in the
+"instances" file. All the glyphs are hinted, and no history file is kept. The AutoHint
+log of each instance is written to the "_instanceReports_" sub-directory.
+
+If the option "Write feature files in the background" is checked, the data needed for
+the 'kern' and 'mark' features (glyph names, kerning, classes and anchors) is copied from
+each instance by the FontSnapshot.py module, and the feature files are written by
+background threads (see the FeatureWriterPool.py module), while the script goes on with
+the next instance. Both modules must be in the Macros folder. The messages of the feature
+writers, and the moving of an instance's files to their final location, wait until the
+instance that is being built is done. The feature files of the first instance are written
+from its copy in the main thread, while the instance is still open: if the installed
+WriteFeaturesKernFDK or WriteFeaturesMarkFDK module needs any data that is not copied,
+a warning is printed, the feature files are written again from the instance itself, and
+all the other feature files are written the usual way, in the main thread.
+
+The files of each instance are first written to a sub-directory named "_partial_" in
+the "_instanceReports_" sub-directory, and are moved to their final location only when
+all of them have been written. The instance is then recorded in the file
+"instances.journal" in the "_instanceReports_" sub-directory. If a run is interrupted
+(e.g. FontLab crashes, or the script is stopped), run the script again with the option
+"Resume the interrupted run" checked, and with the same worker settings: the instances recorded in the journal are skipped,
+provided that their record in the "instances" file and the generation options did not
+change, and that their files are still present. The files of the instance that was
+interrupted are never mixed with the files of the previous runs.
+
+For proofing, the "Instances" option can be used for building only some of the instances.
+It is a comma-separated list of PostScript names (the FontName field of the "instances"
+file), which may use the wildcards * and ? (e.g. "MyFontPro-Bold*,*-Black"). Regular
+expressions starting with "^" (e.g. "^MyFontPro-(Bold|Black)$") and ranges of
+coordinates enclosed in brackets, one range per axis (e.g. "[300-700]" or
+"[300-700 0-500]"), can also be used. The commas inside braces, brackets or parentheses
+do not separate the filters, so regular expressions like "^MyFontPro-\w{1,3}$" can be
+used. All the instances are built when it is empty.
+If the option "Only the glyphs listed in file proofList.txt" is checked, the instances
+only contain the glyphs listed in the file "proofList.txt" (one glyph name per line,
+like the "hintList.txt" file of the AutoHint script), which must be located in the same
+folder as the MM FontLab file, plus the glyphs they use as components and their MM
+exception glyphs. These instances are written to a sub-directory named "_proofs_" of
+the selected folder, so they never replace the complete instances.
+
+The instances are built one at a time: each instance is closed, and its memory released,
+before the next one is built. The memory used by FontLab (resident set size) while each
+instance is open, and after it is closed, is saved in the file "memory.csv" in the
+"_instanceReports_" sub-directory. If the "Memory limit" option is not 0, an instance is
+only built if the memory used plus the memory needed by the largest instance so far fits
+within the limit (in megabytes). Otherwise the script waits for the feature files being
+written in the background, whose data is then released, and stops if there is still not
+enough memory; the remaining instances can then be built by running the script again
+with the option "Resume the interrupted run" checked.
+
 This script depends on info provided by an external simple text file named "instances".
 This file must be located in the same folder as the MM FontLab file. Each line specifies 
 one instance, as a record of tab-delimited fields. The first 6 fields are always, in order:
@@ -125,6 +232,9 @@ keys, such as: BlueScale, BlueShift, BlueFuzz, BlueValues, OtherBlues, FamilyBlu
 
 All empty lines and other lines in the "instances" file starting with the number sign (#) will be ignored.
 
+The "instances" file is read by the InstancesFile.py module, which must be in the Macros folder.
+Running that module as a macro (or from the command line) only checks the "instances" file for errors.
+
 The data supplied in the "instances" file, is used for specifying the instance's values,
 and for providing the font names used in the FontInfo dictionary of the Type 1 fonts.
 
@@ -144,10 +254,50 @@ v2.2   - Apr 21 2011 - Added the option of writing the mark classes in a separat
 v2.3   - Jun 15 2012 - Added the option to output the lookups in the format required for Indian scripts.
 v2.3.1 - Jul 19 2012 - Changed the description of one of the options in the UI.
 v2.4   - Mar 10 2013 - Added subtable-option to dialog window. Other minor improvements.
+v2.5   - Oct 17 2026 - Added the option of splitting the instances among several FontLab sessions.
+v2.6   - Oct 17 2026 - Added the option of skipping the instances whose inputs did not change since the last run.
+v2.7   - Oct 17 2026 - The manifest checksums are calculated from the glyph data of the MM font, which is read once per run.
+v2.8   - Oct 17 2026 - The "instances" file is now read by the InstancesFile.py module, which must be in the Macros folder.
+v2.9   - Oct 17 2026 - The ExceptionSuffixes and ExtraGlyphs matches are looked up in an index of glyph names built once per run.
+v2.10  - Oct 17 2026 - The indexes of the exception glyphs and extra glyphs are looked up only once per instance.
+                       A summary of the changes of each instance is saved in the _instanceReports_ folder.
+v2.11  - Oct 17 2026 - Added the option of decomposing and removing overlaps only in the glyphs that need it.
+v2.12  - Oct 17 2026 - The time spent in each stage of each instance is saved in the _instanceReports_ folder.
+                       Added the option of saving profiling data.
+v2.13  - Oct 17 2026 - Added the option of writing the feature files in the background.
+v2.14  - Oct 17 2026 - The completed instances are recorded in a journal. Added the option of resuming an interrupted run.
+v2.15  - Oct 17 2026 - Added the options of processing only some of the instances, and only some of the glyphs (for proofing).
+v2.16  - Oct 17 2026 - The instances are built one at a time, and released before the next one is built. Added a memory limit option, and a memory usage report.
+v2.17  - Oct 17 2026 - makeInstances() can be called by the BatchInstanceGenerator.py script.
+v2.18  - Oct 17 2026 - Added the option of autohinting the instances.
 
 """
 
-import os, sys, re, copy, math, time
+import os, sys, re, math, time, csv, shutil, gc
+
+try:
+	import cProfile
+except ImportError:
+	cProfile = None
+
+try:
+	import resource
+except ImportError: # Windows
+	resource = None
+
+try:
+	import ctypes
+except ImportError: # Python 2.4
+	ctypes = None
+
+try:
+	from hashlib import md5
+except ImportError: # Python 2.4
+	from md5 import new as md5
+
+# The FontLab names are only in the namespace of the macro being run; they must be imported
+# for this script to be used as a module by the BatchInstanceGenerator.py script.
+from FL import *
 
 try:
 	from AdobeFontLabUtils import checkControlKeyPress, checkShiftKeyPress
@@ -161,295 +311,139 @@ except ImportError,e:
 	pprint.pprint(sys.path)
 	raise e
 
-kFieldsKey = "#KEYS:"
-kFamilyName = "FamilyName"
-kFontName = "FontName"
-kFullName = "FullName"
-kWeight = "Weight"
-kCoordsKey = "Coords"
-kIsBoldKey = "IsBold" # This is changed to kForceBold in the instanceDict when reading in the instance file.
-kForceBold = "ForceBold"
-kIsItalicKey = "IsItalic"
-kExceptionSuffixes = "ExceptionSuffixes"
-kExtraGlyphs = "ExtraGlyphs"
-
-kFixedFieldKeys = {
-		# field index: key name
-		0:kFamilyName,
-		1:kFontName,
-		2:kFullName,
-		3:kWeight,
-		4:kCoordsKey,
-		5:kIsBoldKey,
-		}
 
-kNumFixedFields = len(kFixedFieldKeys)
-
-kBlueScale = "BlueScale"
-kBlueShift = "BlueShift"
-kBlueFuzz = "BlueFuzz"
-kBlueValues = "BlueValues"
-kOtherBlues = "OtherBlues"
-kFamilyBlues = "FamilyBlues"
-kFamilyOtherBlues = "FamilyOtherBlues"
-kStdHW = "StdHW"
-kStdVW = "StdVW"
-kStemSnapH = "StemSnapH"
-kStemSnapV = "StemSnapV"
+def importMacroModule(moduleName):
+	# The modules shared by these macros are kept next to them, in the Macros folder.
+	# FontLab does not always put that folder in the search path, so look for it.
+	try:
+		return __import__(moduleName)
+	except ImportError:
+		pass
+	fileName = moduleName + ".py"
+	userFolder = os.path.expanduser('~')
+	customModulePathMAC = os.path.join(userFolder, 'Library', 'Application Support', 'FontLab', 'Studio 5', 'Macros')
+	customModulePathPC = os.path.join(userFolder, 'Documents', 'FontLab', 'Studio5', 'Macros')
+	possibleModulePaths = [fl.userpath, customModulePathMAC, customModulePathPC]
+	for path in possibleModulePaths:
+		for root, dirs, files in os.walk(path):
+			if fileName in files:
+				if root not in sys.path:
+					sys.path.append(root)
+				return __import__(moduleName)
+	print "Failed to find the module %s in the following folders:\n%s" % (fileName, '\n'.join(possibleModulePaths))
+	raise ImportError(moduleName)
+
+FontSnapshot = importMacroModule("FontSnapshot")
+FeatureWriterPool = importMacroModule("FeatureWriterPool")
+InstancesFile = importMacroModule("InstancesFile")
+AutoHint = None # loaded by loadAutoHint() only when the instances are autohinted
+from InstancesFile import (ParseError, readInstanceFile, filterInstances, parseNumber,
+	kFamilyName, kFontName, kFullName, kWeight, kCoordsKey, kIsBoldKey, kExceptionSuffixes, kExtraGlyphs,
+	kBlueScale, kBlueShift, kBlueFuzz, kBlueValues, kOtherBlues, kFamilyBlues, kFamilyOtherBlues,
+	kStdHW, kStdVW, kStemSnapH, kStemSnapV, kMaxTopZonesSize, kMaxBotZonesSize, kMaxStemSnapSize)
 
 kHintingKeys = [kBlueScale, kBlueShift, kBlueFuzz, kBlueValues, kOtherBlues, kFamilyBlues, kFamilyOtherBlues, kStdHW, kStdVW, kStemSnapH, kStemSnapV]
-kAlignmentZonesKeys = [kBlueValues, kOtherBlues, kFamilyBlues, kFamilyOtherBlues]
-kTopAlignZonesKeys = [kBlueValues, kFamilyBlues]
-kMaxTopZonesSize = 14 # 7 zones
 kFLbugMaxTopZonesSize = 12 # The UI allows assigning all the values, but that's not possible via Python
-kBotAlignZonesKeys = [kOtherBlues, kFamilyOtherBlues]
-kMaxBotZonesSize = 10 # 5 zones
 kFLbugMaxBotZonesSize = 8 # The UI allows assigning all the values, but that's not possible via Python
-kStdStemsKeys = [kStdHW, kStdVW]
-kMaxStdStemsSize = 1
-kStemSnapKeys = [kStemSnapH, kStemSnapV]
-kMaxStemSnapSize = 12 # including StdStem
 kFLbugMaxStemSnapSize = 11 # The UI allows assigning all the values, but that's not possible via Python
 
 
-class ParseError(ValueError):
-	pass
-	
-
-def validateArrayValues(arrayList, valuesMustBePositive):
-	for i in range(len(arrayList)):
-		try:
-			arrayList[i] = eval(arrayList[i])
-		except (NameError, SyntaxError):
-			return
-		if valuesMustBePositive:
-			if arrayList[i] < 0:
-				return
-	return arrayList
-
-
-def readInstanceFile(instancesFilePath):
-	f = open(instancesFilePath, "rt")
-	data = f.read()
-	f.close()
-	
-	lines = data.splitlines()
-	
-	i = 0
-	parseError = 0
-	keyDict = copy.copy(kFixedFieldKeys)
-	numKeys = kNumFixedFields
-	numLines = len(lines)
-	instancesList = []
-	
-	for i in range(numLines):
-		line = lines[i]
-		
-		# Skip over blank lines
-		line2 = line.strip()
-		if not line2:
-			continue
-
-		# Get rid of all comments. If we find a key definition comment line, parse it.
-		commentIndex = line.find('#')
-		if commentIndex >= 0:
-			if line.startswith(kFieldsKey):
-				if instancesList:
-					print "ERROR: Header line (%s) must preceed a data line." % kFieldsKey
-					raise ParseError
-				# parse the line with the field names.
-				line = line[len(kFieldsKey):]
-				line = line.strip()
-				keys = line.split('\t')
-				keys = map(lambda name: name.strip(), keys)
-				numKeys = len(keys)
-				k = kNumFixedFields
-				while k < numKeys:
-					keyDict[k] = keys[k]
-					k +=1
-				continue
-			else:
-				line = line[:commentIndex]
-				continue
-
-		# Must be a data line.
-		fields = line.split('\t')
-		fields = map(lambda datum: datum.strip(), fields)
-		numFields = len(fields)
-		if (numFields != numKeys):
-			print "ERROR: In line %s, the number of fields %s does not match the number of key names %s (FamilyName, FontName, FullName, Weight, Coords, IsBold)." % (i+1, numFields, numKeys)
-			parseError = 1
+class GlyphNameIndex:
+	# Index of the glyph names of the MM font. It is built once, and used for finding the
+	# ExceptionSuffixes and ExtraGlyphs matches of every instance. The results of each
+	# suffix and pattern are kept, so each one is looked up only once per run.
+	def __init__(self, glyphNames):
+		self.charList = list(glyphNames)
+		self.charList.sort()
+		self.charDict = dict.fromkeys(self.charList, 1)
+		self._namesByEnding = {} # key: suffix length, value: dict of name ending: sorted list of names
+		self._suffixMatches = {}
+		self._compiledPatterns = {}
+		self._patternMatches = {}
+
+	def getSuffixMatches(self, suffix):
+		# Returns the sorted list of glyph names that end with the suffix.
+		if suffix not in self._suffixMatches:
+			suffixLength = len(suffix)
+			if suffixLength not in self._namesByEnding:
+				namesByEnding = {}
+				for name in self.charList:
+					if len(name) >= suffixLength:
+						namesByEnding.setdefault(name[len(name) - suffixLength:], []).append(name)
+				self._namesByEnding[suffixLength] = namesByEnding
+			self._suffixMatches[suffix] = self._namesByEnding[suffixLength].get(suffix, [])
+		return self._suffixMatches[suffix]
+
+	def getPatternMatches(self, pattern):
+		# Returns the sorted list of glyph names that match the regular expression.
+		if pattern not in self._patternMatches:
+			if pattern not in self._compiledPatterns:
+				self._compiledPatterns[pattern] = re.compile(pattern)
+			search = self._compiledPatterns[pattern].search
+			self._patternMatches[pattern] = [name for name in self.charList if search(name)]
+		return self._patternMatches[pattern]
+
+
+def readGlyphListFile(filePath):
+	# The file has one glyph name per line, as the hintList.txt file of the AutoHint script.
+	if not os.path.isfile(filePath):
+		print "There must be a file named %s to provide the list of glyph names." % filePath
+		return []
+	fp = open(filePath, "rt")
+	data = fp.read()
+	fp.close()
+	data = re.sub(r"#.+?([\n\r])", r"\1", data) # supress comments
+	lines = re.findall(r"([^\r\n]+)", data)
+	lines = [line.strip() for line in lines]
+	return [line for line in lines if line]
+
+
+def getProofGlyphNames(fontMM, glyphIndex, glyphNames, instancesList):
+	# Returns a dictionary with the names of the glyphs needed for proofing the given glyphs:
+	# the glyphs themselves, the glyphs used as components, and their MM exception glyphs.
+	exceptionSuffixes = {}
+	for instanceDict in instancesList:
+		for suffix in instanceDict.get(kExceptionSuffixes, []):
+			exceptionSuffixes[suffix] = 1
+
+	proofGlyphNames = {}
+	namesToCheck = []
+	for name in glyphNames:
+		if glyphIndex.charDict.has_key(name):
+			namesToCheck.append(name)
+		else:
+			print "WARNING: The glyph %s in the %s file is not in the font." % (name, kProofGlyphListFile)
+	while namesToCheck:
+		name = namesToCheck.pop()
+		if proofGlyphNames.has_key(name):
 			continue
-		
-		instanceDict= {}
-		#Build a dict from key to value. Some kinds of values needs special processing.
-		for k in range(numFields):
-			key = keyDict[k]
-			field = fields[k]
-			if not field:
-				continue
-			if field in ["Default", "None", "FontBBox"]:
-				# FontBBox is no longer supported - I calculate the real
-				# instance fontBBox from the glyph metrics instead,
-				continue
-			if key == kFontName:
-				value = field
-			elif key in [kExtraGlyphs, kExceptionSuffixes]:
-				value = eval(field)
-			elif key in [kIsBoldKey, kIsItalicKey, kCoordsKey]:
-				try:
-					value = eval(field) # this works for all three fields.
-					
-					if key == kIsBoldKey: # need to convert to Type 1 field key.
-						instanceDict[key] = value
-						# add kForceBold key.
-						key = kForceBold
-						if value == 1:
-							value = "true"
-						else:
-							value = "false"
-					elif key == kIsItalicKey:
-						if value == 1:
-							value = "true"
-						else:
-							value = "false"
-					elif key == kCoordsKey:
-						if type(value) == type(0):
-							value = (value,)
-				except (NameError, SyntaxError):
-					print "ERROR: In line %s, the %s field has an invalid value." % (i+1, key)
-					parseError = 1
-					continue
-
-			elif field[0] in ["[","{"]: # it is a Type 1 array value. Turn it into a list and verify that there's an even number of values for the alignment zones
-				value = field[1:-1].split() # Remove the begin and end brackets/braces, and make a list
-				
-				if key in kAlignmentZonesKeys:
-					if len(value) % 2 != 0:
-						print "ERROR: In line %s, the %s field does not have an even number of values." % (i+1, key)
-						parseError = 1
-						continue
-				
-				if key in kTopAlignZonesKeys: # The Type 1 spec only allows 7 top zones (7 pairs of values)
-					if len(value) > kMaxTopZonesSize:
-						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxTopZonesSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, False) # False = values do NOT have to be all positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
-							parseError = 1
-							continue
-					currentArray = value[:] # make copy, not reference
-					value.sort()
-					if currentArray != value:
-						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
-				
-				if key in kBotAlignZonesKeys: # The Type 1 spec only allows 5 top zones (5 pairs of values)
-					if len(value) > kMaxBotZonesSize:
-						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxBotZonesSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, False) # False = values do NOT have to be all positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
-							parseError = 1
-							continue
-					currentArray = value[:] # make copy, not reference
-					value.sort()
-					if currentArray != value:
-						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
-				
-				if key in kStdStemsKeys:
-					if len(value) > kMaxStdStemsSize:
-						print "ERROR: In line %s, the %s field can only have %d value." % (i+1, key, kMaxStdStemsSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, True) # True = all values must be positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field has an invalid value." % (i+1, key)
-							parseError = 1
-							continue
-				
-				if key in kStemSnapKeys: # The Type 1 spec only allows 12 stem widths, including 1 standard stem
-					if len(value) > kMaxStemSnapSize:
-						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxStemSnapSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, True) # True = all values must be positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
-							parseError = 1
-							continue
-					currentArray = value[:] # make copy, not reference
-					value.sort()
-					if currentArray != value:
-						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
-			else:
-				# either a single number or a string.
-				if re.match(r"^[-.\d]+$", field):
-					value = field #it is a Type 1 number. Pass as is, as a string.
-				else:
-					value = field
-			
-			instanceDict[key] = value
-				
-		if (kStdHW in instanceDict and kStemSnapH not in instanceDict) or (kStdHW not in instanceDict and kStemSnapH in instanceDict):
-			print "ERROR: In line %s, either the %s value or the %s values are missing or were invalid." % (i+1, kStdHW, kStemSnapH)
-			parseError = 1
-		elif (kStdHW in instanceDict and kStemSnapH in instanceDict): # cannot be just 'else' because it will generate a 'KeyError' when these hinting parameters are not provided in the 'instances' file
-			if instanceDict[kStemSnapH][0] != instanceDict[kStdHW][0]:
-				print "ERROR: In line %s, the first value in %s must be the same as the %s value." % (i+1, kStemSnapH, kStdHW)
-				parseError = 1
-
-		if (kStdVW in instanceDict and kStemSnapV not in instanceDict) or (kStdVW not in instanceDict and kStemSnapV in instanceDict):
-			print "ERROR: In line %s, either the %s value or the %s values are missing or were invalid." % (i+1, kStdVW, kStemSnapV)
-			parseError = 1
-		elif (kStdVW in instanceDict and kStemSnapV in instanceDict): # cannot be just 'else' because it will generate a 'KeyError' when these hinting parameters are not provided in the 'instances' file
-			if instanceDict[kStemSnapV][0] != instanceDict[kStdVW][0]:
-				print "ERROR: In line %s, the first value in %s must be the same as the %s value." % (i+1, kStemSnapV, kStdVW)
-				parseError = 1
-		
-		instancesList.append(instanceDict)
-		
-	if parseError or len(instancesList) == 0:
-		raise(ParseError)
-		
-	return instancesList
+		proofGlyphNames[name] = 1
+		for suffix in exceptionSuffixes.keys():
+			if glyphIndex.charDict.has_key(name + suffix):
+				namesToCheck.append(name + suffix)
+		for component in fontMM[fontMM.FindGlyph(name)].components:
+			namesToCheck.append(fontMM.glyphs[component.index].name)
+	return proofGlyphNames
 
 
-def findExtraGlyphMatches(extraGlyphs, charDict):
-	charList = charDict.keys()
-	charList.sort()
+def findExtraGlyphMatches(extraGlyphs, glyphIndex):
 	glyphList = []
 	glyphDict = {}
 	for line in extraGlyphs:
 		if line.startswith('*'):
-			matchList = filter(lambda name: name.endswith(line[1:]), charList)
+			matchList = glyphIndex.getSuffixMatches(line[1:])
 			if matchList:
 				glyphList.extend(matchList)
 			else:
 				print "WARNING: Extra glyph suffix '%s' did not match in the char list." % (line)
 		elif line.startswith('^'):
-			matchList = filter(lambda name: re.search(line, name), charList)
+			matchList = glyphIndex.getPatternMatches(line)
 			if matchList:
 				glyphList.extend(matchList)
 			else:
 				print "WARNING: Extra glyph search pattern '%s' did not match in the char list." % (line)
 		else:
-			if charDict.has_key(line):
+			if glyphIndex.charDict.has_key(line):
 				glyphList.append(line)
 			
 	# We do not need to eliminate duplicates; that happens when these lists are added to extraDict.
@@ -458,19 +452,19 @@ def findExtraGlyphMatches(extraGlyphs, charDict):
 	return glyphDict
 	
 	
-def findExceptionGlyphMatches(exceptionSuffixes, charDict):
-	charList = charDict.keys()
-	charList.sort()
+def findExceptionGlyphMatches(exceptionSuffixes, glyphIndex):
+	charDict = glyphIndex.charDict
+	usedNames = {} # a glyph that matched a suffix is not matched again by the suffixes that follow.
 	glyphList = []
 	for suffix in exceptionSuffixes:
-		matchList = filter(lambda name: name.endswith(suffix), charList)
+		matchList = [name for name in glyphIndex.getSuffixMatches(suffix) if name not in usedNames]
 		if not matchList:
 			print "WARNING: Exception glyph suffix '%s' did not match in the char list." % (suffix)
 		else:
 			matchList2 = []
 			missingList = []
 			for name in matchList:
-				charList.remove(name)
+				usedNames[name] = 1
 				if charDict.has_key(name[:-len(suffix)]):
 					matchList2.append([name, name[:-len(suffix)]] )
 				else:
@@ -485,59 +479,106 @@ def findExceptionGlyphMatches(exceptionSuffixes, charDict):
 	return glyphDict
 
 
-def getExceptionNames(f, instanceDict):
-	extraGlyphDict = exceptionDict = {}
-	charList = [glyph.name for glyph in f.glyphs]
-	charDict = {}
-	for glyphName in charList:
-		charDict[glyphName] = 1
+def getExceptionNames(glyphIndex, instanceDict):
+	extraGlyphDict = {}
+	exceptionDict = {}
 		
 	extraGlyphs = instanceDict.get(kExtraGlyphs, None)
 	if extraGlyphs:
-		extraGlyphDict = findExtraGlyphMatches(extraGlyphs, charDict)
+		extraGlyphDict = findExtraGlyphMatches(extraGlyphs, glyphIndex)
 	
 	exceptionSuffixes = instanceDict.get(kExceptionSuffixes, None)
 	if exceptionSuffixes:
-		exceptionDict = findExceptionGlyphMatches(exceptionSuffixes, charDict)
+		exceptionDict = findExceptionGlyphMatches(exceptionSuffixes, glyphIndex)
 		
 	return extraGlyphDict, exceptionDict
 
 
-def handleExceptionGlyphs(f, fontInstanceDict):
-	extraDict, exceptionDict = getExceptionNames(f, fontInstanceDict)
-	if exceptionDict:
-		stdnames = exceptionDict.keys()
-		stdnames.sort()
-		for x in range(len(stdnames)):
-			stdName = stdnames[x]
-			exceptionName = exceptionDict[stdName]
-			if f.FindGlyph(stdName) != -1:
-				f[stdName].Clear()  # removes the original outlines
-				f[stdName].Insert(f[exceptionName])  # places the new outlines
-				extraDict[exceptionName] = 1 # add exception glyph to name to delete.
-			else:
-				print "\t- exception glyph target %s not found" % stdName
-				
-	if extraDict:
-		extraGlyphs = extraDict.keys()
-		extraGlyphs.sort()
-		for name in extraGlyphs:
-			glyphIndex = f.FindGlyph(name)
-			if glyphIndex != -1:
-				del f.glyphs[glyphIndex]
-			else:
-				print "\t- extra glyph %s not found" % name
+def applyGlyphChanges(f, substitutions, deletions):
+	# Replaces the outlines of the glyphs in the substitutions dict (key is std name, value is
+	# exception name), and deletes the glyphs in the deletions list. The glyph indexes are looked
+	# up only once, and the glyphs are deleted starting from the highest index, so the indexes
+	# of the glyphs not yet deleted stay valid. FontLab has no way of deleting several glyphs
+	# at once, so it still updates its glyph indexes, kerning and components after each deletion.
+	# Returns a dictionary with the names of the glyphs that were changed or not found.
+	nameToIndex = {}
+	for gid in range(len(f.glyphs)):
+		nameToIndex[f.glyphs[gid].name] = gid
+
+	summary = {
+		"substituted": [],
+		"deleted": [],
+		"missingTargets": [],
+		"missingDeletions": [],
+		}
+	deleteDict = dict.fromkeys(deletions, 1)
+
+	stdNames = substitutions.keys()
+	stdNames.sort()
+	for stdName in stdNames:
+		exceptionName = substitutions[stdName]
+		if stdName in nameToIndex and exceptionName in nameToIndex:
+			stdGlyph = f.glyphs[nameToIndex[stdName]]
+			stdGlyph.Clear()  # removes the original outlines
+			stdGlyph.Insert(f.glyphs[nameToIndex[exceptionName]])  # places the new outlines
+			summary["substituted"].append([stdName, exceptionName])
+			deleteDict[exceptionName] = 1 # add exception glyph to name to delete.
+		else:
+			summary["missingTargets"].append(stdName)
+
+	deleteList = []
+	for name in deleteDict.keys():
+		if name in nameToIndex:
+			deleteList.append((nameToIndex[name], name))
+		else:
+			summary["missingDeletions"].append(name)
+	deleteList.sort()
+	deleteList.reverse()
+	for gid, name in deleteList:
+		del f.glyphs[gid]
+	summary["deleted"] = [name for gid, name in deleteList]
+
+	for key in summary.keys():
+		summary[key].sort()
+	return summary
+
+
+def handleExceptionGlyphs(f, fontInstanceDict, glyphIndex):
+	# The instance has the same glyphs as the MM font, so the MM font's glyph name index is used.
+	extraDict, exceptionDict = getExceptionNames(glyphIndex, fontInstanceDict)
+	summary = applyGlyphChanges(f, exceptionDict, extraDict.keys())
+	for name in summary["missingTargets"]:
+		print "\t- exception glyph target %s not found" % name
+	for name in summary["missingDeletions"]:
+		print "\t- extra glyph %s not found" % name
+	return summary
+
+
+def getGlyphChangesPath(folderPath, fontInstanceDict):
+	reportsFolder = makeFaceFolder(folderPath, kReportsFolderName)
+	return os.path.join(reportsFolder, "%s.glyphchanges" % fontInstanceDict[kFontName])
+
+
+def writeGlyphChanges(folderPath, fontInstanceDict, summary):
+	# The summary is written as a Python dictionary, like the other files in the reports folder.
+	glyphChangesPath = getGlyphChangesPath(folderPath, fontInstanceDict)
+	try:
+		fp = open(glyphChangesPath, "wt")
+		fp.write(repr(summary))
+		fp.close()
+	except (IOError, OSError):
+		print "Failed to write the glyph changes file %s" % glyphChangesPath
 
 
 def assignHintingParams(f, fontInstanceDict):
 	if kBlueScale in fontInstanceDict:
-		f.blue_scale[0] = eval(fontInstanceDict[kBlueScale])
+		f.blue_scale[0] = parseNumber(fontInstanceDict[kBlueScale])
 	
 	if kBlueShift in fontInstanceDict:
-		f.blue_shift[0] = eval(fontInstanceDict[kBlueShift])
+		f.blue_shift[0] = parseNumber(fontInstanceDict[kBlueShift])
 	
 	if kBlueFuzz in fontInstanceDict:
-		f.blue_fuzz[0] = eval(fontInstanceDict[kBlueFuzz])
+		f.blue_fuzz[0] = parseNumber(fontInstanceDict[kBlueFuzz])
 	
 	if kBlueValues in fontInstanceDict:
 		if len(fontInstanceDict[kBlueValues]) > kFLbugMaxTopZonesSize: # FontLab bug
@@ -588,7 +629,479 @@ def assignHintingParams(f, fontInstanceDict):
 			f.stem_snap_v[0][x] = fontInstanceDict[kStemSnapV][x]
 	
 
-def handleInstance(f, fontInstanceDict, instanceInfo):
+kStageCreateInstance = "instance creation"
+kStageHintingParams = "hinting parameters"
+kStageExceptionGlyphs = "exception glyphs"
+kStageOverlapCheck = "overlap check"
+kStageFlatten = "decompose and overlap removal"
+kStageSaveVFB = "VFB save"
+kStageGeneratePFA = "PFA generation"
+kStageKernFeature = "kern feature"
+kStageMarkFeature = "mark feature"
+kStageProofSubset = "proof glyph subset"
+kStageAutohint = "autohinting"
+kStageReleaseInstance = "instance release"
+kStageFeatureSnapshot = "feature data snapshot"
+kStageBackgroundFeatures = "feature files (background)"
+
+
+class StageTimer:
+	# Records the time spent in each stage of the processing of each instance,
+	# and the time spent by each glyph in the per-glyph stages.
+	def __init__(self):
+		self.instanceName = None
+		self.stageTimes = [] # list of [instance name, stage name, seconds]
+		self.glyphTimes = [] # list of [instance name, stage name, glyph name, seconds]
+		self._stageName = None
+		self._startTime = None
+
+	def setInstance(self, instanceName):
+		self.stop()
+		self.instanceName = instanceName
+
+	def start(self, stageName):
+		self.stop()
+		self._stageName = stageName
+		self._startTime = time.time()
+
+	def stop(self):
+		if self._stageName is not None:
+			self.stageTimes.append([self.instanceName, self._stageName, time.time() - self._startTime])
+			self._stageName = None
+
+	def addGlyphTime(self, stageName, glyphName, seconds):
+		self.glyphTimes.append([self.instanceName, stageName, glyphName, seconds])
+
+	def getStageTotals(self):
+		# Returns a list of [stage name, total seconds], in the order the stages were first run.
+		totals = {}
+		stageNames = []
+		for instanceName, stageName, seconds in self.stageTimes:
+			if stageName not in totals:
+				totals[stageName] = 0
+				stageNames.append(stageName)
+			totals[stageName] += seconds
+		return [[stageName, totals[stageName]] for stageName in stageNames]
+
+	def write(self, reportsFolder, fileNamePrefix=""):
+		self.stop()
+		for fileName, header, rows in [
+				(kStageTimesFileName, ["instance", "stage", "seconds"], self.stageTimes),
+				(kGlyphTimesFileName, ["instance", "stage", "glyph", "seconds"], self.glyphTimes)]:
+			filePath = os.path.join(reportsFolder, fileNamePrefix + fileName)
+			try:
+				fp = open(filePath, "wb")
+				writer = csv.writer(fp)
+				writer.writerow(header)
+				for row in rows:
+					writer.writerow(row[:-1] + ["%.4f" % row[-1]])
+				fp.close()
+			except (IOError, OSError):
+				print "Failed to write the timing file %s" % filePath
+
+
+if ctypes and sys.platform == "win32":
+	class ProcessMemoryCounters(ctypes.Structure):
+		# PROCESS_MEMORY_COUNTERS structure of the Windows API
+		_fields_ = [("cb", ctypes.c_ulong),
+					("PageFaultCount", ctypes.c_ulong),
+					("PeakWorkingSetSize", ctypes.c_size_t),
+					("WorkingSetSize", ctypes.c_size_t),
+					("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+					("QuotaPagedPoolUsage", ctypes.c_size_t),
+					("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+					("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+					("PagefileUsage", ctypes.c_size_t),
+					("PeakPagefileUsage", ctypes.c_size_t)]
+
+
+def getMemoryUsage(readRSS=1):
+	# Returns the resident set size (RSS) of the FontLab process, and its peak value
+	# since the process started, in bytes. Either value is None if it can't be read.
+	# Reading the RSS on Mac OS X runs the ps command, so it is skipped if readRSS is false.
+	rss = peak = None
+	if sys.platform == "win32":
+		if ctypes:
+			counters = ProcessMemoryCounters()
+			counters.cb = ctypes.sizeof(counters)
+			try:
+				process = ctypes.windll.kernel32.GetCurrentProcess()
+				if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+					rss = counters.WorkingSetSize
+					peak = counters.PeakWorkingSetSize
+			except (AttributeError, OSError):
+				pass
+		return rss, peak
+
+	if resource:
+		peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		if sys.platform != "darwin":
+			peak = peak * 1024 # the value is in kilobytes on Linux
+	if not readRSS:
+		return rss, peak
+	try:
+		fp = os.popen("ps -o rss= -p %d" % os.getpid())
+		output = fp.read()
+		fp.close()
+		rss = int(output.strip()) * 1024
+	except (ValueError, IOError, OSError):
+		pass
+	return rss, peak
+
+
+def formatMegabytes(numBytes):
+	if numBytes is None:
+		return ""
+	return "%.1f" % (numBytes / 1048576.0)
+
+
+class MemoryMonitor:
+	# Records the memory usage of each instance, and tells whether there is enough
+	# memory left under the limit (in megabytes, 0 for no limit) to build the next one.
+	# The RSS is read only twice per instance: once it is built, and once it is released.
+	# The peak RSS of an instance is the process peak, if it went up while the instance
+	# was open, and the RSS once it was built otherwise.
+	def __init__(self, limit=0):
+		self.limit = limit
+		self.rows = [] # list of [instance name, RSS after build, instance peak RSS, RSS after release, process peak RSS]
+		self.maxGrowth = 0 # largest increase of the RSS while an instance was open
+		self._instanceName = None
+		self._startRSS = None
+		self._startPeak = None
+		self._builtRSS = None
+		rss, peak = getMemoryUsage()
+		self.isAvailable = rss is not None
+		self._lastRSS = rss # RSS after the last instance was released
+
+	def startInstance(self, instanceName):
+		self._instanceName = instanceName
+		self._builtRSS = None
+		self._startRSS = self._lastRSS
+		self._startPeak = getMemoryUsage(0)[1]
+
+	def setBuilt(self):
+		self._builtRSS = getMemoryUsage()[0]
+
+	def endInstance(self):
+		rss, peak = getMemoryUsage()
+		self._lastRSS = rss
+		instancePeak = self._builtRSS
+		if peak is not None and self._startPeak is not None and peak > self._startPeak:
+			instancePeak = max(peak, instancePeak)
+		if instancePeak is not None and self._startRSS is not None:
+			self.maxGrowth = max(self.maxGrowth, instancePeak - self._startRSS)
+		self.rows.append([self._instanceName, self._builtRSS, instancePeak, rss, peak])
+		if instancePeak is not None:
+			print "\tMemory: %s MB while open, %s MB after closing the instance." % (formatMegabytes(instancePeak), formatMegabytes(rss))
+
+	def hasRoomForInstance(self, refresh=0):
+		# The next instance is expected to need as much memory as the largest one so far.
+		# The RSS is read again only if refresh is true, e.g. after releasing memory.
+		if not self.limit:
+			return 1
+		if refresh or self._lastRSS is None:
+			self._lastRSS = getMemoryUsage()[0]
+		if self._lastRSS is None:
+			return 1
+		return self._lastRSS + self.maxGrowth <= self.limit * 1048576
+
+	def getLargestInstance(self):
+		# Returns the row of the instance with the highest peak RSS, or None.
+		largestRow = None
+		for row in self.rows:
+			if row[2] is not None and (largestRow is None or row[2] > largestRow[2]):
+				largestRow = row
+		return largestRow
+
+	def write(self, reportsFolder, fileNamePrefix=""):
+		filePath = os.path.join(reportsFolder, fileNamePrefix + kMemoryUsageFileName)
+		try:
+			fp = open(filePath, "wb")
+			writer = csv.writer(fp)
+			writer.writerow(["instance", "built MB", "peak MB", "released MB", "process peak MB"])
+			for row in self.rows:
+				writer.writerow(row[:1] + [formatMegabytes(value) for value in row[1:]])
+			fp.close()
+		except (IOError, OSError):
+			print "Failed to write the memory usage file %s" % filePath
+
+
+kMaxCurveSplits = 12 # Number of times the curves are split in halves, when looking for a crossing, before the check gives up and reports one.
+
+
+def getContourSegments(g):
+	# Returns the list of contours of the glyph, each one as a list of segments. A segment
+	# is a tuple of (x, y) points: the start and end of a line, or the start, the two
+	# control points and the end of a curve.
+	contours = []
+	segments = None
+	current = None
+	for node in g.nodes:
+		nodePoints = node.points
+		end = (nodePoints[0].x, nodePoints[0].y)
+		if node.type == nMOVE or segments is None:
+			segments = []
+			contours.append(segments)
+			current = end
+			continue
+		if node.type == nCURVE and len(nodePoints) == 3:
+			segment = (current, (nodePoints[1].x, nodePoints[1].y), (nodePoints[2].x, nodePoints[2].y), end)
+		else:
+			segment = (current, end)
+		if len(segment) == 4 or end != current:
+			segments.append(segment)
+		current = end
+	for segments in contours:
+		if segments and segments[-1][-1] != segments[0][0]:
+			segments.append((segments[-1][-1], segments[0][0]))
+	return [segments for segments in contours if segments]
+
+
+def getBounds(points):
+	xList = [point[0] for point in points]
+	yList = [point[1] for point in points]
+	return min(xList), min(yList), max(xList), max(yList)
+
+
+def getSignedArea(segments):
+	# Returns the exact area of the contour; it is positive if the contour is counter-clockwise.
+	area = 0
+	for segment in segments:
+		x0, y0 = segment[0]
+		x3, y3 = segment[-1]
+		if len(segment) == 4:
+			x1, y1 = segment[1][0] - x0, segment[1][1] - y0
+			x2, y2 = segment[2][0] - x0, segment[2][1] - y0
+			dx3, dy3 = x3 - x0, y3 - y0
+			area -= (x1 * (-y2 - dy3) + x2 * (y1 - 2 * dy3) + dx3 * (y1 + 2 * y2)) * 0.15
+		area -= (x3 - x0) * (y3 + y0) * 0.5
+	return area
+
+
+def getOrientation(p, q, r):
+	value = (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+	if value > 0:
+		return 1
+	elif value < 0:
+		return -1
+	return 0
+
+
+def segmentsIntersect(p1, p2, q1, q2):
+	# Touching and collinear overlapping segments are reported as intersecting.
+	o1 = getOrientation(p1, p2, q1)
+	o2 = getOrientation(p1, p2, q2)
+	o3 = getOrientation(q1, q2, p1)
+	o4 = getOrientation(q1, q2, p2)
+	if o1 != o2 and o3 != o4:
+		return 1
+	for a, b, c, o in [(p1, p2, q1, o1), (p1, p2, q2, o2), (q1, q2, p1, o3), (q1, q2, p2, o4)]:
+		if o == 0 and min(a[0], b[0]) <= c[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= c[1] <= max(a[1], b[1]):
+			return 1
+	return 0
+
+
+def splitCurve(segment):
+	# Splits the curve in two halves.
+	(x0, y0), (x1, y1), (x2, y2), (x3, y3) = segment
+	xa, ya = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+	xb, yb = (x1 + x2) / 2.0, (y1 + y2) / 2.0
+	xc, yc = (x2 + x3) / 2.0, (y2 + y3) / 2.0
+	xd, yd = (xa + xb) / 2.0, (ya + yb) / 2.0
+	xe, ye = (xb + xc) / 2.0, (yb + yc) / 2.0
+	xm, ym = (xd + xe) / 2.0, (yd + ye) / 2.0
+	return ((x0, y0), (xa, ya), (xd, yd), (xm, ym)), ((xm, ym), (xe, ye), (xc, yc), (x3, y3))
+
+
+def segmentsMayCross(a, b, numSplits=0):
+	# Returns 0 only if the segments a and b have no common point. A curve lies inside the
+	# bounds of its points, so two segments whose bounds don't overlap can't meet; when the
+	# bounds of a curve overlap the other segment's, the curve is split, and the halves are
+	# checked. After kMaxCurveSplits splits, the segments are assumed to cross.
+	boundsA = getBounds(a)
+	boundsB = getBounds(b)
+	if boundsA[0] > boundsB[2] or boundsB[0] > boundsA[2] or boundsA[1] > boundsB[3] or boundsB[1] > boundsA[3]:
+		return 0
+	if len(a) == 2 and len(b) == 2:
+		return segmentsIntersect(a[0], a[1], b[0], b[1])
+	if numSplits >= kMaxCurveSplits:
+		return 1
+	# Split the larger curve
+	if len(b) == 4 and (len(a) == 2 or (boundsB[2] - boundsB[0]) + (boundsB[3] - boundsB[1]) > (boundsA[2] - boundsA[0]) + (boundsA[3] - boundsA[1])):
+		a, b = b, a
+	for half in splitCurve(a):
+		if segmentsMayCross(half, b, numSplits + 1):
+			return 1
+	return 0
+
+
+def normalizeAngle(angle):
+	while angle <= -math.pi:
+		angle += 2 * math.pi
+	while angle > math.pi:
+		angle -= 2 * math.pi
+	return angle
+
+
+def getAngleRange(apex, points):
+	# Returns (start angle, width) of the narrowest angle at apex that holds the points,
+	# or None if that angle is 180 degrees or wider.
+	angles = [math.atan2(y - apex[1], x - apex[0]) for x, y in points if (x, y) != apex]
+	if not angles:
+		return None
+	relativeAngles = [normalizeAngle(angle - angles[0]) for angle in angles]
+	start = min(relativeAngles)
+	width = max(relativeAngles) - start
+	if width >= math.pi:
+		return None
+	return angles[0] + start, width
+
+
+def segmentsMeetOnlyAt(apex, a, b):
+	# Returns 1 if it is certain that the segments a and b, which both end at apex, have
+	# no other common point. Each segment lies inside the angle at apex that holds its
+	# points, so the segments can't meet elsewhere if these angles don't overlap.
+	rangeA = getAngleRange(apex, a)
+	rangeB = getAngleRange(apex, b)
+	if rangeA is None or rangeB is None:
+		return 0
+	tolerance = 1e-9
+	distance = (rangeB[0] - rangeA[0]) % (2 * math.pi)
+	if distance <= rangeA[1] + tolerance or distance + rangeB[1] >= 2 * math.pi - tolerance:
+		return 0
+	return 1
+
+
+def curveMayLoop(segment):
+	# Returns 0 only if the curve can't cross itself. A curve that crosses itself turns by
+	# more than 180 degrees, and a curve turns less than the lines between its points.
+	vectors = []
+	for i in range(3):
+		dx = segment[i+1][0] - segment[i][0]
+		dy = segment[i+1][1] - segment[i][1]
+		if dx or dy:
+			vectors.append((dx, dy))
+	turn = 0
+	for i in range(1, len(vectors)):
+		(dx0, dy0), (dx1, dy1) = vectors[i-1], vectors[i]
+		turn += abs(math.atan2(dx0 * dy1 - dy0 * dx1, dx0 * dx1 + dy0 * dy1))
+	return turn >= math.pi - 1e-9
+
+
+def contoursMayCross(contours):
+	# Returns 0 only if it is certain that no two segments of the contours meet, apart
+	# from the consecutive segments of a contour at their common point. The segments are
+	# sorted by their left edge, and each one is only compared with the segments whose
+	# horizontal range overlaps its own.
+	items = []
+	for ci in range(len(contours)):
+		segments = contours[ci]
+		for si in range(len(segments)):
+			segment = segments[si]
+			if len(segment) == 4 and curveMayLoop(segment):
+				return 1
+			xMin, yMin, xMax, yMax = getBounds(segment)
+			items.append((xMin, xMax, yMin, yMax, ci, si, len(segments), segment))
+	items.sort()
+
+	active = []
+	for item in items:
+		xMin, xMax, yMin, yMax, ci, si, numSegments, segment = item
+		active = [other for other in active if other[1] >= xMin]
+		for other in active:
+			if other[2] > yMax or other[3] < yMin:
+				continue
+			otherSegment = other[7]
+			if other[4] == ci:
+				# Consecutive segments of a contour share a point.
+				distance = abs(other[5] - si)
+				if distance == 1 or distance == numSegments - 1:
+					if segment[0] == otherSegment[-1]:
+						apex = segment[0]
+					else:
+						apex = segment[-1]
+					if not segmentsMeetOnlyAt(apex, segment, otherSegment):
+						return 1
+					continue
+			if segmentsMayCross(segment, otherSegment):
+				return 1
+		active.append(item)
+	return 0
+
+
+def pointInContour(point, segments):
+	# Returns 1 if the point is inside the contour, and 0 if it is outside. The polygon of
+	# the ends of the segments tells the same as the contour, unless the point is within the
+	# bounds of a curve; such curves are split until the point is out of their halves'
+	# bounds. Returns None if it still isn't after kMaxCurveSplits splits.
+	x, y = point
+	numSplits = 0
+	while 1:
+		splitSegments = []
+		for segment in segments:
+			if len(segment) == 4:
+				xMin, yMin, xMax, yMax = getBounds(segment)
+				if xMin <= x <= xMax and yMin <= y <= yMax:
+					splitSegments.extend(splitCurve(segment))
+					continue
+			splitSegments.append(segment)
+		if len(splitSegments) == len(segments):
+			break
+		if numSplits >= kMaxCurveSplits:
+			return None
+		segments = splitSegments
+		numSplits += 1
+
+	inside = 0
+	for segment in segments:
+		x0, y0 = segment[0]
+		x1, y1 = segment[-1]
+		if (y0 > y) != (y1 > y):
+			if x < x0 + (y - y0) * (x1 - x0) / float(y1 - y0):
+				inside = not inside
+	return inside
+
+
+def glyphNeedsFlattening(g):
+	# Returns 1 if the glyph has components, or contours that overlap; these are the only
+	# glyphs that Decompose() and RemoveOverlap() decompose or merge. The checks never miss
+	# an overlap; when one can't be ruled out, the glyph is flattened.
+	if len(g.components):
+		return 1
+	contours = getContourSegments(g)
+	if len(contours) == 0:
+		return 0
+	if contoursMayCross(contours):
+		return 1
+
+	# Contours that don't cross can still overlap, if one is inside the other and both
+	# have the same direction.
+	if len(contours) > 1:
+		bounds = []
+		areas = []
+		for segments in contours:
+			points = []
+			for segment in segments:
+				points.extend(segment)
+			bounds.append(getBounds(points))
+			areas.append(getSignedArea(segments))
+		for i in range(len(contours)):
+			for j in range(len(contours)):
+				if i == j:
+					continue
+				outer = bounds[i]
+				inner = bounds[j]
+				if inner[0] > outer[2] or outer[0] > inner[2] or inner[1] > outer[3] or outer[1] > inner[3]:
+					continue
+				if (areas[i] > 0) != (areas[j] > 0):
+					continue
+				inside = pointInContour(contours[j][0][0], contours[i])
+				if inside is None or inside:
+					return 1
+	return 0
+
+
+def handleInstance(f, fontInstanceDict, instanceInfo, glyphIndex, options, timer):
 	# Set names
 	f.family_name = fontInstanceDict[kFamilyName]
 	f.font_name = fontInstanceDict[kFontName]
@@ -615,22 +1128,58 @@ def handleInstance(f, fontInstanceDict, instanceInfo):
 			break
 	if processHintingParams:
 		print '\tAssigning hinting parameters...'
+		timer.start(kStageHintingParams)
 		assignHintingParams(f, fontInstanceDict)
+		timer.stop()
 
+	glyphChanges = None
 	if (kExceptionSuffixes in fontInstanceDict or kExtraGlyphs in fontInstanceDict):
 		if (kExceptionSuffixes not in fontInstanceDict):
 			fontInstanceDict[kExceptionSuffixes] = [] # in case nothing was provided, assign an empty list
 		print '\tProcessing exception glyphs and/or extra glyphs...'
-		handleExceptionGlyphs(f, fontInstanceDict)
+		timer.start(kStageExceptionGlyphs)
+		glyphChanges = handleExceptionGlyphs(f, fontInstanceDict, glyphIndex)
+		timer.stop()
+		print '\t%d glyphs substituted, %d glyphs deleted.' % (len(glyphChanges["substituted"]), len(glyphChanges["deleted"]))
 
 	# Flatten glyphs
 	print '\tDecomposing glyphs and removing overlaps...'
+	checkTime = 0
+	flattenTime = 0
+	numFlattened = 0
+	numSkipped = 0
 	for g in f.glyphs:
+		if options.skipOverlapFreeGlyphs:
+			startTime = time.time()
+			needsFlattening = glyphNeedsFlattening(g)
+			glyphTime = time.time() - startTime
+			timer.addGlyphTime(kStageOverlapCheck, g.name, glyphTime)
+			checkTime += glyphTime
+			if not needsFlattening:
+				numSkipped += 1
+				continue
+		startTime = time.time()
 		g.Decompose()
 		g.SelectAll()
 		g.RemoveOverlap()
+		glyphTime = time.time() - startTime
+		timer.addGlyphTime(kStageFlatten, g.name, glyphTime)
+		flattenTime += glyphTime
+		numFlattened += 1
+
+	if options.skipOverlapFreeGlyphs:
+		timer.stageTimes.append([timer.instanceName, kStageOverlapCheck, checkTime])
+	timer.stageTimes.append([timer.instanceName, kStageFlatten, flattenTime])
+
+	if options.skipOverlapFreeGlyphs:
+		# The time saved is estimated from the average time taken by the glyphs that were flattened.
+		if numFlattened:
+			timeSaved = (flattenTime / numFlattened) * numSkipped - checkTime
+		else:
+			timeSaved = 0
+		print '\t%d glyphs without components or overlaps were skipped (about %s saved).' % (numSkipped, formatDuration(max(timeSaved, 0)))
 
-	return f
+	return f, glyphChanges
 
 
 def makeFaceFolder(root, folder):
@@ -640,55 +1189,625 @@ def makeFaceFolder(root, folder):
 	return facePath
 
 
-def handleFont(folderPath, fontMM, fontInstanceDict, options):
+def getFaceName(fontInstanceDict):
 	try:
 		faceName = fontInstanceDict[kFontName].split('-')[1]
 	except IndexError:
 		faceName = 'Regular'
+	return faceName
 
-	print
-	print faceName
-	
-	fontName = fontInstanceDict[kFontName]
-	instValues = fontInstanceDict[kCoordsKey]
 
+def getPlainValue(value):
+	# Turns FontLab's list-like values (e.g. the per-master blue_values) into plain lists,
+	# so that their repr() reflects their contents.
+	if value is None or isinstance(value, (int, long, float, str, unicode)):
+		return value
+	try:
+		return [getPlainValue(value[i]) for i in range(len(value))]
+	except (TypeError, AttributeError, IndexError):
+		return repr(value)
+
+
+kFontDigestAttributes = ["upm", "ascender", "descender", "cap_height", "x_height", "italic_angle", "slant_angle",
+	"underline_position", "underline_thickness", "blue_scale", "blue_shift", "blue_fuzz", "blue_values", "other_blues",
+	"family_blues", "family_other_blues", "stem_snap_h", "stem_snap_v", "force_bold", "notice", "copyright",
+	"trademark", "version", "year", "classes"]
+
+def getFontDigest(fontMM):
+	digest = md5()
+	for attr in kFontDigestAttributes:
+		digest.update(repr((attr, getPlainValue(getattr(fontMM, attr, None)))))
+	return digest.hexdigest()
+
+
+def getKerningValues(kerningPair, numMasters):
+	values = getattr(kerningPair, "values", None)
+	if values is None:
+		return [kerningPair.value] * numMasters
+	return [values[m] for m in range(numMasters)]
+
+
+def getGlyphDigests(fontMM):
+	# Returns a dictionary of glyph name: checksum of the glyph's data in all the masters
+	# (advance widths, outlines, components, hints, anchors and kerning pairs).
+	numMasters = fontMM[0].layers_number
+	masters = range(numMasters)
+	glyphDigests = {}
+	for glyph in fontMM.glyphs:
+		data = [glyph.unicode, [glyph.GetMetrics(m).x for m in masters]]
+		for node in glyph.nodes:
+			data.append(("node", node.type, node.count, [[(point.x, point.y) for point in node.Layer(m)] for m in masters]))
+		for component in glyph.components:
+			data.append(("component", fontMM.glyphs[component.index].name,
+				[(component.deltas[m].x, component.deltas[m].y, component.scales[m].x, component.scales[m].y) for m in masters]))
+		for hint in glyph.hhints:
+			data.append(("hhint", [(hint.positions[m], hint.widths[m]) for m in masters]))
+		for hint in glyph.vhints:
+			data.append(("vhint", [(hint.positions[m], hint.widths[m]) for m in masters]))
+		for anchor in glyph.anchors:
+			data.append(("anchor", anchor.name, [(anchor.Layer(m).x, anchor.Layer(m).y) for m in masters]))
+		for kerningPair in glyph.kerning:
+			data.append(("kerning", fontMM.glyphs[kerningPair.key].name, getKerningValues(kerningPair, numMasters)))
+		glyphDigests[glyph.name] = md5(repr(data)).hexdigest()
+	return glyphDigests
+
+
+# The options that choose which instances are built, and how, but do not change their files. The proof
+# instances are written to their own folder, whose manifest has the checksums of the proofed glyphs.
+kManifestIgnoredOptions = ["numWorkers", "workerIndex", "skipUnchangedInstances", "saveProfileData", "writeFeaturesInBackground",
+	"resumeInterruptedRun", "memoryLimit", "instancesFilter", "proofGlyphsOnly"]
+
+kDigestedHintOptions = ["allowPathChanges", "noHintSub", "noFlex"] # The AutoHint options that change the hints.
+
+
+def getOptionsDigest(options, hintOptions=None):
+	# hintOptions are the AutoHint options used for hinting the instances, if they are hinted.
+	optionsList = []
+	for key in dir(options):
+		if key[0] == "_" or key in kManifestIgnoredOptions:
+			continue
+		value = getattr(options, key)
+		if callable(value):
+			continue
+		optionsList.append((key, value))
+	if hintOptions:
+		for key in kDigestedHintOptions:
+			optionsList.append(("AutoHint." + key, getattr(hintOptions, key)))
+	return md5(repr(optionsList)).hexdigest()
+
+
+def getOutputPaths(folderPath, fontInstanceDict, options):
+	pfaFolder = os.path.join(folderPath, getFaceName(fontInstanceDict))
+	outputPaths = [os.path.join(pfaFolder, kFontInstanceFileName)]
+	if options.genVFBs:
+		outputPaths.append(os.path.join(folderPath, kVFBinstancesFolderName, fontInstanceDict[kFontName] + '.vfb'))
+	if options.genKernFeature:
+		outputPaths.append(os.path.join(pfaFolder, "features.kern"))
+	if options.genMarkFeature:
+		outputPaths.append(os.path.join(pfaFolder, "features.mark"))
+	return outputPaths
+
+
+def outputsExist(folderPath, fontInstanceDict, options):
+	for path in getOutputPaths(folderPath, fontInstanceDict, options):
+		if not os.path.exists(path):
+			return 0
+	return 1
+
+
+def syncFile(path):
+	# Makes sure the file's data is on disk, and not only in the system's buffers.
 	try:
-		fontInstance = Font(fontMM, instValues)  # creates instance
-	except:
-		print "Error: Could not create instance <%s> (%s)" % (instValues, fontName)
+		fp = open(path, "r+b")
+		try:
+			os.fsync(fp.fileno())
+		finally:
+			fp.close()
+	except (IOError, OSError):
+		pass
+
+
+class InstanceJournal:
+	# Records the instances whose output files were all written, so that an interrupted
+	# run can be resumed. The files of each instance are written to a staging folder, and
+	# are moved to their final location only after all of them have been written; the
+	# instance is then added to the journal. The staging folder of an instance that was
+	# interrupted is deleted when the instance is built again.
+	def __init__(self, folderPath, options, fileNamePrefix, resume, instancesList, hintOptions=None):
+		self.folderPath = folderPath
+		self.options = options
+		self.reportsFolder = makeFaceFolder(folderPath, kReportsFolderName)
+		self.path = os.path.join(self.reportsFolder, fileNamePrefix + kJournalFileName)
+		self.stagingRoot = os.path.join(self.reportsFolder, fileNamePrefix + kStagingFolderName)
+		self.optionsDigest = getOptionsDigest(options, hintOptions)
+
+		# The checksums of all the instances are calculated up front, because the
+		# instances' values are modified while they are being built.
+		self.instanceDigests = {}
+		for fontInstanceDict in instancesList:
+			self.instanceDigests[fontInstanceDict[kFontName]] = self.getDigest(fontInstanceDict)
+
+		self.completed = {}
+		if resume:
+			# Each worker only resumes its own share of the instances, so the worker settings must not change.
+			self._read()
+		elif os.path.exists(self.path):
+			os.remove(self.path)
+
+		if os.path.exists(self.stagingRoot):
+			shutil.rmtree(self.stagingRoot, 1)
+
+	def _read(self):
+		if not os.path.exists(self.path):
+			return
+		try:
+			fp = open(self.path, "rt")
+			lines = fp.readlines()
+			fp.close()
+		except (IOError, OSError):
+			print "Failed to read the journal file %s" % self.path
+			return
+		for line in lines:
+			# An entry without the end of line was not completely written.
+			if not line.endswith("\n"):
+				continue
+			fields = line[:-1].split("\t")
+			if len(fields) == 2:
+				self.completed[fields[1]] = fields[0]
+
+	def getDigest(self, fontInstanceDict):
+		digest = md5()
+		digest.update(repr(sorted(fontInstanceDict.items())))
+		digest.update(self.optionsDigest)
+		return digest.hexdigest()
+
+	def isCompleted(self, fontInstanceDict):
+		if self.completed.get(fontInstanceDict[kFontName]) != self.instanceDigests[fontInstanceDict[kFontName]]:
+			return 0
+		return outputsExist(self.folderPath, fontInstanceDict, self.options)
+
+	def getStagingFolder(self, fontInstanceDict):
+		# The staging folder has the same layout as the output folder.
+		stagingFolder = os.path.join(self.stagingRoot, fontInstanceDict[kFontName])
+		if os.path.exists(stagingFolder):
+			shutil.rmtree(stagingFolder, 1)
+		os.makedirs(stagingFolder)
+		return stagingFolder
+
+	def commit(self, fontInstanceDict, stagingFolder, digest):
+		# Moves the files of the instance to their final location, and adds the instance
+		# to the journal, with the checksum of its values before it was built. Returns 1 if successful.
+		try:
+			for root, dirs, files in os.walk(stagingFolder):
+				targetFolder = os.path.join(self.folderPath, root[len(stagingFolder):].lstrip(os.sep))
+				if not os.path.exists(targetFolder):
+					os.makedirs(targetFolder)
+				for fileName in files:
+					sourcePath = os.path.join(root, fileName)
+					targetPath = os.path.join(targetFolder, fileName)
+					syncFile(sourcePath)
+					if os.path.exists(targetPath):
+						os.remove(targetPath) # os.rename does not replace files on Windows
+					os.rename(sourcePath, targetPath)
+			shutil.rmtree(stagingFolder, 1)
+
+			fp = open(self.path, "at")
+			fp.write("%s\t%s\n" % (digest, fontInstanceDict[kFontName]))
+			fp.flush()
+			os.fsync(fp.fileno())
+			fp.close()
+		except (IOError, OSError), e:
+			print "ERROR: Failed to move the files of %s from %s: %s" % (fontInstanceDict[kFontName], stagingFolder, e)
+			return 0
+		return 1
+
+
+def finishInstance(fontInstanceDict, stagingFolder, journal, manifest):
+	if journal and not journal.commit(fontInstanceDict, stagingFolder, journal.instanceDigests[fontInstanceDict[kFontName]]):
 		return
+	if manifest:
+		manifest.update(fontInstanceDict)
+
+
+class InstanceManifest:
+	# Keeps the checksums of the inputs used for building each instance, and tells
+	# which instances can be skipped because neither their inputs nor their output files changed.
+	def __init__(self, folderPath, fontMM, instancesList, options, glyphIndex, hintOptions=None):
+		self.folderPath = folderPath
+		self.options = options
+		self.path = os.path.join(makeFaceFolder(folderPath, kReportsFolderName), kManifestFileName)
+		self.entries = self._read()
+		self.fontDigest = getFontDigest(fontMM)
+		self.optionsDigest = getOptionsDigest(options, hintOptions)
+		self.glyphIndex = glyphIndex
+
+		# The checksums of all the instances are calculated up front, because the
+		# instances' values are modified while they are being built. The glyph data
+		# is read once, and is the same for all the instances.
+		self.instanceDigests = {}
+		self.glyphDigests = getGlyphDigests(fontMM)
+		for fontInstanceDict in instancesList:
+			self.instanceDigests[fontInstanceDict[kFontName]] = self._getInstanceDigest(fontInstanceDict)
+
+	def _read(self):
+		if not os.path.exists(self.path):
+			return {}
+		try:
+			fp = open(self.path, "rt")
+			entries = eval(fp.read())
+			fp.close()
+		except (IOError, OSError, SyntaxError):
+			print "Failed to read the manifest file %s. All the instances will be built." % self.path
+			return {}
+		return entries
+
+	def _getInstanceDigest(self, fontInstanceDict):
+		extraGlyphDict = {}
+		extraGlyphs = fontInstanceDict.get(kExtraGlyphs, None)
+		if extraGlyphs:
+			extraGlyphDict = findExtraGlyphMatches(extraGlyphs, self.glyphIndex)
+		glyphNames = [name for name in self.glyphIndex.charList if name not in extraGlyphDict]
+
+		# The instance's record has its coordinates.
+		digest = md5()
+		digest.update(repr(sorted(fontInstanceDict.items())))
+		digest.update(self.fontDigest)
+		digest.update(self.optionsDigest)
+		for name in glyphNames:
+			digest.update(name)
+			digest.update(self.glyphDigests[name])
+		return digest.hexdigest()
+
+	def isUpToDate(self, fontInstanceDict):
+		if self.entries.get(fontInstanceDict[kFontName]) != self.instanceDigests[fontInstanceDict[kFontName]]:
+			return 0
+		return outputsExist(self.folderPath, fontInstanceDict, self.options)
+
+	def update(self, fontInstanceDict):
+		# Other FontLab sessions may be building other instances of the same family, so
+		# the entries are merged with the ones currently in the file before saving.
+		entries = self._read()
+		entries[fontInstanceDict[kFontName]] = self.instanceDigests[fontInstanceDict[kFontName]]
+		self.entries = entries
+		try:
+			fp = open(self.path, "wt")
+			fp.write(repr(entries))
+			fp.close()
+		except (IOError, OSError):
+			print "Failed to write the manifest file %s" % self.path
+
 
-	instanceInfo = os.path.basename(fontMM.file_name) # The name of the source MM VFB is recorded as part of the info regarding the instance
-	fontInstance = handleInstance(fontInstance, fontInstanceDict, instanceInfo)
-	fl.Add(fontInstance)
+def loadAutoHint():
+	# Returns the options for hinting the instances, or None if the AutoHint.py script
+	# (in the Hinting folder of the Macros) or the autohintexe program can't be found.
+	global AutoHint
+	if AutoHint is None:
+		try:
+			AutoHint = importMacroModule("AutoHint")
+		except ImportError:
+			return None
+	if not AutoHint.haveAC:
+		print "ERROR: The autohintexe program was not found. Please install the Adobe FDK, and try again."
+		return None
+	hintOptions = AutoHint.ACOptions()
+	hintOptions._getPrefs() # the options last set in the AutoHint dialog
+	# The instances are new fonts, so all their glyphs are hinted, and no history is kept.
+	hintOptions.doHistoryFile = 0
+	hintOptions.doHintAll = 1
+	hintOptions.debug = 0
+	return hintOptions
+
+
+def hintInstance(folderPath, f, hintOptions, timer):
+	# The hinting uses the alignment zones and stems of the instance, which are set by handleInstance().
+	print '\tAutohinting...'
+	logFilePath = os.path.join(makeFaceFolder(folderPath, kReportsFolderName), "%s.%s" % (f.font_name, AutoHint.acLogFileName))
+	timer.start(kStageAutohint)
+	AutoHint.hintFont(f, [glyph.name for glyph in f.glyphs], hintOptions, logFilePath)
+	timer.stop()
+
+
+class InstanceBuilder:
+	# Iterates over (instance dictionary, FontLab instance) for each instance that must be built.
+	# Each instance is closed and released when the next one is requested, or when close() is
+	# called, so only one instance is open at a time. close() must be called once the loop is
+	# over, also when it is stopped by an error, so that the last instance is released.
+	def __init__(self, folderPath, fontMM, instancesList, options, glyphIndex, timer, memoryMonitor, instanceTimes, manifest=None, featurePool=None, journal=None, proofGlyphNames=None, hintOptions=None):
+		self.folderPath = folderPath
+		self.fontMM = fontMM
+		self.options = options
+		self.glyphIndex = glyphIndex
+		self.timer = timer
+		self.memoryMonitor = memoryMonitor
+		self.instanceTimes = instanceTimes
+		self.manifest = manifest
+		self.featurePool = featurePool
+		self.journal = journal
+		self.proofGlyphNames = proofGlyphNames
+		self.hintOptions = hintOptions
+		self._instancesList = list(instancesList)
+		self._openInstance = None # (instance name, start time, FontLab instance) of the instance not released yet
+
+	def __iter__(self):
+		return self
+
+	def next(self):
+		self.close()
+		while self._instancesList:
+			fontInstanceDict = self._instancesList.pop(0)
+			result = self._build(fontInstanceDict)
+			if result:
+				return result
+		raise StopIteration
+
+	def _build(self, fontInstanceDict):
+		# Returns (instance dictionary, FontLab instance), or None if the instance is not built.
+		timer = self.timer
+		memoryMonitor = self.memoryMonitor
+		t = time.time()
+		faceName = getFaceName(fontInstanceDict)
+		fontName = fontInstanceDict[kFontName]
+		instValues = fontInstanceDict[kCoordsKey]
+
+		print
+		print faceName
+
+		if self.manifest and self.manifest.isUpToDate(fontInstanceDict):
+			print "\tSkipping instance. Its inputs did not change since the last run."
+			self.instanceTimes.append((fontName, time.time() - t))
+			return None
+
+		if self.journal and self.options.resumeInterruptedRun and self.journal.isCompleted(fontInstanceDict):
+			print "\tSkipping instance. It was completed by the interrupted run."
+			self.instanceTimes.append((fontName, time.time() - t))
+			return None
+
+		if not memoryMonitor.hasRoomForInstance():
+			# The feature files written in the background hold a copy of the data of their instance
+			if self.featurePool:
+				print "\tWaiting for the feature files to be written, to free memory..."
+				recordFeatureJobs(timer, self.featurePool.wait())
+			gc.collect()
+			if not memoryMonitor.hasRoomForInstance(1):
+				print "ERROR: Stopping the run, since the next instance may exceed the memory limit (%d MB)." % memoryMonitor.limit
+				print "Run the script again with the option \"Resume the interrupted run\" checked to build the remaining instances."
+				self._instancesList = []
+				return None
+
+		timer.setInstance(fontName)
+		memoryMonitor.startInstance(fontName)
+		timer.start(kStageCreateInstance)
+		try:
+			fontInstance = Font(self.fontMM, instValues)  # creates instance
+		except:
+			timer.stop()
+			print "Error: Could not create instance <%s> (%s)" % (instValues, fontName)
+			self.instanceTimes.append((fontName, time.time() - t))
+			return None
+		timer.stop()
+
+		if self.proofGlyphNames:
+			print '\tRemoving the glyphs that are not proofed...'
+			timer.start(kStageProofSubset)
+			applyGlyphChanges(fontInstance, {}, [glyph.name for glyph in fontInstance.glyphs if not self.proofGlyphNames.has_key(glyph.name)])
+			timer.stop()
+
+		instanceInfo = os.path.basename(self.fontMM.file_name) # The name of the source MM VFB is recorded as part of the info regarding the instance
+		fontInstance, glyphChanges = handleInstance(fontInstance, fontInstanceDict, instanceInfo, self.glyphIndex, self.options, timer)
+		if glyphChanges:
+			writeGlyphChanges(self.folderPath, fontInstanceDict, glyphChanges)
+		fl.Add(fontInstance)
+		# From now on, the instance is released by close(), even if the hinting fails.
+		self._openInstance = (fontName, t, fontInstance)
+		del fontInstance
+		if self.hintOptions:
+			hintInstance(self.folderPath, self._openInstance[2], self.hintOptions, timer)
+		memoryMonitor.setBuilt()
+		return fontInstanceDict, self._openInstance[2]
+
+	def close(self):
+		# Closes and releases the instance that is open, if any.
+		if self._openInstance is None:
+			return
+		fontName, t, fontInstance = self._openInstance
+		self._openInstance = None
+		self.timer.start(kStageReleaseInstance)
+		fontInstance.modified = 0
+		fl.Close(fl.ifont)
+		del fontInstance
+		gc.collect()
+		self.timer.stop()
+		self.memoryMonitor.endInstance()
+		self.instanceTimes.append((fontName, time.time() - t))
+
+
+def writeInstanceFiles(folderPath, fontInstanceDict, fontInstance, options, timer, manifest=None, featurePool=None, journal=None, checkSnapshot=0):
+	# Writes the files of the instance, which must be the current font. If checkSnapshot is true,
+	# the feature files are written from the instance's snapshot in the main thread, to check that
+	# the snapshot has all the data used by the WriteFeatures modules. Returns 0 if it does not,
+	# in which case the feature files must no longer be written in the background.
+	faceName = getFaceName(fontInstanceDict)
+	fontName = fontInstanceDict[kFontName]
+
+	# With a journal, the files are written to a staging folder, and moved to the output folder once they are all written.
+	stagingFolder = None
+	outputFolder = folderPath
+	if journal:
+		stagingFolder = journal.getStagingFolder(fontInstanceDict)
+		outputFolder = stagingFolder
 	
 	if (options.genVFBs):
 		print '\tSaving .vfb file...'
-		vfbFolder = makeFaceFolder(folderPath, kVFBinstancesFolderName)
+		vfbFolder = makeFaceFolder(outputFolder, kVFBinstancesFolderName)
 		vfbPath = os.path.join(vfbFolder, fontName)
+		timer.start(kStageSaveVFB)
 		fl.Save((vfbPath + '.vfb'))
+		timer.stop()
 	
 	print '\tSaving %s file...' % kFontInstanceFileName
-	pfaFolder = makeFaceFolder(folderPath, faceName)
+	pfaFolder = makeFaceFolder(outputFolder, faceName)
 	pfaPath = os.path.join(pfaFolder, kFontInstanceFileName)
+	timer.start(kStageGeneratePFA)
 	fl.GenerateFont(eval("ftTYPE1ASCII"), pfaPath)
+	timer.stop()
 	
+	finishArgs = (fontInstanceDict, stagingFolder, journal, manifest)
+	if featurePool and (options.genKernFeature or options.genMarkFeature):
+		# The feature files are written in the background from a copy of the data they
+		# need, so the next instance can be started. The instance is finished once they are written.
+		timer.start(kStageFeatureSnapshot)
+		fontSnapshot = FontSnapshot.snapshotFont(fontInstance)
+		timer.stop()
+		if checkSnapshot:
+			try:
+				writeFeatures(fontSnapshot, pfaFolder, options, timer)
+			except FontSnapshot.SnapshotAttributeError, e:
+				timer.stop()
+				print "WARNING: The feature files can't be written in the background: %s." % e
+				writeFeatures(fontInstance, pfaFolder, options, timer)
+				finishInstance(*finishArgs)
+				return 0
+		else:
+			print "\tQueuing the feature files..."
+			featurePool.add(fontName, writeFeatures, (fontSnapshot, pfaFolder, options), finishInstance, finishArgs)
+			return 1
+	else:
+		writeFeatures(fontInstance, pfaFolder, options, timer)
+	finishInstance(*finishArgs)
+	return 1
+
+
+def recordFeatureJobs(timer, jobs):
+	for job in jobs:
+		timer.stageTimes.append([job.name, kStageBackgroundFeatures, job.seconds])
+
+
+def writeFeatures(f, pfaFolder, options, timer=None):
+	# f is either a FontLab font or a FontSnapshot. No timing is recorded
+	# when running in the background (i.e. when there is no timer).
 	if (options.genKernFeature):
 		print "\tGenerating 'kern' feature..."
-		WriteFeaturesKernFDK.KernDataClass(fontInstance, pfaFolder, options.minKern, options.writeTrimmed, options.writeSubtables)
+		if timer:
+			timer.start(kStageKernFeature)
+		WriteFeaturesKernFDK.KernDataClass(f, pfaFolder, options.minKern, options.writeTrimmed, options.writeSubtables)
+		if timer:
+			timer.stop()
 
 	if (options.genMarkFeature):
 		if (options.genMkmkFeature):
 			print "\tGenerating 'mark' and 'mkmk' features..."
 		else:
 			print "\tGenerating 'mark' feature..."
-		WriteFeaturesMarkFDK.MarkDataClass(fontInstance, pfaFolder, options.trimCasingTags, options.genMkmkFeature, options.writeClassesFile, options.indianScriptsFormat)
-	
-	fontInstance.modified = 0
-	fl.Close(fl.ifont)
+		if timer:
+			timer.start(kStageMarkFeature)
+		WriteFeaturesMarkFDK.MarkDataClass(f, pfaFolder, options.trimCasingTags, options.genMkmkFeature, options.writeClassesFile, options.indianScriptsFormat)
+		if timer:
+			timer.stop()
+
+
+def formatDuration(seconds):
+	if (seconds/60) < 1:
+		return '%.1f seconds' % seconds
+	else:
+		return '%.1f minutes' % (seconds/60)
+
+
+def getWorkerSettings(options):
+	# Returns the number of workers and the index of this worker, or (None, None) if the values are not valid.
+	try:
+		numWorkers = int(options.numWorkers)
+		workerIndex = int(options.workerIndex)
+	except ValueError:
+		print "ERROR: The number of workers and the worker index must be integer values."
+		return None, None
+	if numWorkers < 1 or not (0 <= workerIndex < numWorkers):
+		print "ERROR: The worker index must be a value between 0 and %d." % (max(numWorkers, 1) - 1)
+		return None, None
+	return numWorkers, workerIndex
+
+
+def getMemoryLimit(options):
+	# Returns the memory limit in megabytes (0 for no limit), or None if the value is not valid.
+	try:
+		memoryLimit = int(options.memoryLimit)
+	except ValueError:
+		print "ERROR: The memory limit must be an integer value."
+		return None
+	if memoryLimit < 0:
+		print "ERROR: The memory limit must be 0 (no limit) or a positive value."
+		return None
+	return memoryLimit
+
+
+def getWorkerTimingPath(folderPath, numWorkers, workerIndex):
+	reportsFolder = makeFaceFolder(folderPath, kReportsFolderName)
+	return os.path.join(reportsFolder, "worker%dof%d.timing" % (workerIndex, numWorkers))
+
 
+def removeWorkerTiming(folderPath, numWorkers, workerIndex):
+	# Removes the timing file left by this worker in an earlier run.
+	timingPath = getWorkerTimingPath(folderPath, numWorkers, workerIndex)
+	if os.path.exists(timingPath):
+		try:
+			os.remove(timingPath)
+		except OSError:
+			print "Failed to remove the timing file %s" % timingPath
+
+
+def writeWorkerTiming(folderPath, numWorkers, workerIndex, startTime, endTime, instanceTimes):
+	timingDict = {
+		"numWorkers": numWorkers,
+		"workerIndex": workerIndex,
+		"startTime": startTime,
+		"endTime": endTime,
+		"instanceTimes": instanceTimes,
+		}
+	timingPath = getWorkerTimingPath(folderPath, numWorkers, workerIndex)
+	try:
+		fp = open(timingPath, "wt")
+		fp.write(repr(timingDict))
+		fp.close()
+	except (IOError, OSError):
+		print "Failed to write the timing file %s" % timingPath
+
+
+def printWorkersSummary(folderPath, numWorkers, startTime):
+	# Reads the timing files written by all the workers of this run, including the ones
+	# that ran in other FontLab sessions, and prints the combined timings. The workers run
+	# at the same time, so a file that was written before this worker started is left
+	# from an earlier run, by a worker that has not yet started this run.
+	timingDicts = []
+	for workerIndex in range(numWorkers):
+		timingPath = getWorkerTimingPath(folderPath, numWorkers, workerIndex)
+		if not os.path.exists(timingPath):
+			continue
+		try:
+			fp = open(timingPath, "rt")
+			timingDict = eval(fp.read())
+			fp.close()
+		except (IOError, OSError, SyntaxError):
+			print "Failed to read the timing file %s" % timingPath
+			continue
+		if timingDict["endTime"] >= startTime:
+			timingDicts.append(timingDict)
 
-def makeInstances(options):
+	if not timingDicts:
+		return
+
+	print "Workers summary (%d of %d workers finished):" % (len(timingDicts), numWorkers)
+	for timingDict in timingDicts:
+		instanceTimes = timingDict["instanceTimes"]
+		print "\tWorker %d: %d instances in %s" % (timingDict["workerIndex"], len(instanceTimes), formatDuration(timingDict["endTime"] - timingDict["startTime"]))
+		for fontName, seconds in instanceTimes:
+			print "\t\t%s: %s" % (fontName, formatDuration(seconds))
+	wallTime = max([timingDict["endTime"] for timingDict in timingDicts]) - min([timingDict["startTime"] for timingDict in timingDicts])
+	print "\tWall time: %s" % formatDuration(wallTime)
+
+
+def makeInstances(options, folderPath=None, instanceNames=None, fileNamePrefix=None):
+	# The BatchInstanceGenerator.py script gives the output folder, the names of the instances
+	# assigned to this worker, and the prefix of the report files. Returns the list of
+	# (instance name, seconds) of the instances that were processed.
 	fontMM = fl.font # MM Font
 	axisNum = int(math.log(fontMM[0].layers_number, 2)) # Number of axis in font
 	
@@ -698,6 +1817,14 @@ def makeInstances(options):
 		print "The font has not been saved. Please save the font and try again."
 		return
 
+	numWorkers, workerIndex = getWorkerSettings(options)
+	if numWorkers is None:
+		return
+
+	memoryLimit = getMemoryLimit(options)
+	if memoryLimit is None:
+		return
+
 	instancesFilePath = os.path.join(parentDir, kInstancesDataFileName)
 	
 	if not os.path.isfile(instancesFilePath):
@@ -720,14 +1847,53 @@ def makeInstances(options):
 			if axisNum != len(axisVal):
 				print 'ERROR:  The %s value for the instance named %s in the %s file is not compatible with the number of axis in the MM source font.' % (kCoordsKey, instanceDict[kFontName], kInstancesDataFileName)
 				return
+
+	try:
+		instancesList = filterInstances(instancesList, options.instancesFilter)
+	except ParseError, e:
+		print "ERROR: %s" % e
+		return
+	if instanceNames is not None:
+		instancesList = [fontInstanceDict for fontInstanceDict in instancesList if fontInstanceDict[kFontName] in instanceNames]
+	if not instancesList:
+		print "No instance to process."
+		return
+
+	glyphIndex = GlyphNameIndex([glyph.name for glyph in fontMM.glyphs])
+
+	hintOptions = None
+	if options.autohintInstances:
+		hintOptions = loadAutoHint()
+		if not hintOptions:
+			return
+
+	proofGlyphNames = None
+	if options.proofGlyphsOnly:
+		glyphNames = readGlyphListFile(os.path.join(parentDir, kProofGlyphListFile))
+		if not glyphNames:
+			print "No names found in the glyph name list file."
+			return
+		proofGlyphNames = getProofGlyphNames(fontMM, glyphIndex, glyphNames, instancesList)
+		if not proofGlyphNames:
+			return
+		print "Proofing %d glyphs (including components and exception glyphs)." % len(proofGlyphNames)
+		# The instances only have the proofed glyphs
+		glyphIndex = GlyphNameIndex(proofGlyphNames.keys())
 	
-	folderPath = fl.GetPathName("Select parent directory to output instances")
+	if not folderPath:
+		folderPath = fl.GetPathName("Select parent directory to output instances")
 
 	# Cancel was clicked or Esc key was pressed
 	if not folderPath:
 		return
 
+	# The proofs are kept apart from the complete instances
+	if proofGlyphNames:
+		folderPath = makeFaceFolder(folderPath, kProofsFolderName)
+
 	t1 = time.time()  # Initiates a timer of the whole process
+	if numWorkers > 1 and instanceNames is None:
+		removeWorkerTiming(folderPath, numWorkers, workerIndex)
 	
 	# Make sure that the Encoding options are set to 'StandardEncoding'
 	flPrefs = Options()
@@ -735,18 +1901,102 @@ def makeInstances(options):
 	flPrefs.T1Terminal = 0 # so we don't have to close the dialog with each instance.
 	flPrefs.T1Encoding = 1 # always write Std Encoding.
 	flPrefs.T1Decompose = 1 # Do  decompose SEAC chars
-	
+
+	# The instances are dealt out round-robin, so that each worker gets an equal share of the family
+	if instanceNames is not None:
+		workerInstancesList = instancesList
+	else:
+		workerInstancesList = instancesList[workerIndex::numWorkers]
+	if numWorkers > 1 and instanceNames is None:
+		print "Worker %d of %d: processing %d of the %d instances." % (workerIndex, numWorkers, len(workerInstancesList), len(instancesList))
+
+	manifest = None
+	if options.skipUnchangedInstances:
+		print "Calculating the checksums of the instances..."
+		checksumsStartTime = time.time()
+		manifest = InstanceManifest(folderPath, fontMM, workerInstancesList, options, glyphIndex, hintOptions)
+		print "Calculated the checksums of %d instances in %s." % (len(workerInstancesList), formatDuration(time.time() - checksumsStartTime))
+
+	profiler = None
+	if options.saveProfileData:
+		if cProfile:
+			profiler = cProfile.Profile()
+		else:
+			print "WARNING: The cProfile module is not available. The profiling data will not be saved."
+
+	# The report files of each worker are kept apart
+	if fileNamePrefix is None:
+		if numWorkers > 1:
+			fileNamePrefix = "worker%dof%d." % (workerIndex, numWorkers)
+		else:
+			fileNamePrefix = ""
+
+	journal = InstanceJournal(folderPath, options, fileNamePrefix, options.resumeInterruptedRun, workerInstancesList, hintOptions)
+
+	featurePool = None
+	if options.writeFeaturesInBackground and (options.genKernFeature or options.genMarkFeature):
+		featurePool = FeatureWriterPool.FeatureWriterPool()
+
+	memoryMonitor = MemoryMonitor(memoryLimit)
+	if not memoryMonitor.isAvailable:
+		print "WARNING: The memory usage can't be read on this system. It will not be reported, nor limited."
+
 	# Process instances
-	for fontInstance in instancesList:
-		handleFont(folderPath, fontMM, fontInstance, options)
+	timer = StageTimer()
+	instanceTimes = []
+	if profiler:
+		profiler.enable()
+	instanceBuilder = InstanceBuilder(folderPath, fontMM, workerInstancesList, options, glyphIndex, timer,
+			memoryMonitor, instanceTimes, manifest, featurePool, journal, proofGlyphNames, hintOptions)
+	try:
+		checkSnapshot = 1
+		for fontInstanceDict, fontInstance in instanceBuilder:
+			if not writeInstanceFiles(folderPath, fontInstanceDict, fontInstance, options, timer, manifest, featurePool, journal, checkSnapshot):
+				featurePool.join() # no job was added yet
+				featurePool = None
+			checkSnapshot = 0
+			if featurePool:
+				# The instances whose feature files are done are moved to their final location, and journaled, right away
+				recordFeatureJobs(timer, featurePool.reportFinished())
+			# No reference to the instance must remain when the builder releases it
+			del fontInstance
+	finally:
+		# The last instance is released, even if the run was stopped by an error.
+		instanceBuilder.close()
+		# Wait for the feature files still being written, even if the run was stopped by an error.
+		if featurePool:
+			print "\nWaiting for the feature files to be written..."
+			recordFeatureJobs(timer, featurePool.join())
+	if profiler:
+		profiler.disable()
 
 	t2 = time.time()
 	elapsedSeconds = t2-t1
 	
-	if (elapsedSeconds/60) < 1:
-		print '\nCompleted in %.1f seconds.\n' % elapsedSeconds
-	else:
-		print '\nCompleted in %.1f minutes.\n' % (elapsedSeconds/60)
+	print '\nCompleted in %s.\n' % formatDuration(elapsedSeconds)
+
+	reportsFolder = makeFaceFolder(folderPath, kReportsFolderName)
+	timer.write(reportsFolder, fileNamePrefix)
+	print "Time spent in each stage:"
+	for stageName, seconds in timer.getStageTotals():
+		print "\t%s: %s" % (stageName, formatDuration(seconds))
+	if memoryMonitor.isAvailable:
+		memoryMonitor.write(reportsFolder, fileNamePrefix)
+		largestRow = memoryMonitor.getLargestInstance()
+		if largestRow:
+			print "Largest memory usage: %s MB (%s)." % (formatMegabytes(largestRow[2]), largestRow[0])
+	if profiler:
+		profilePath = os.path.join(reportsFolder, fileNamePrefix + kProfileDataFileName)
+		try:
+			profiler.dump_stats(profilePath)
+		except (IOError, OSError):
+			print "Failed to write the profiling data file %s" % profilePath
+	print
+
+	if numWorkers > 1 and instanceNames is None:
+		writeWorkerTiming(folderPath, numWorkers, workerIndex, t1, t2, instanceTimes)
+		printWorkersSummary(folderPath, numWorkers, t1)
+	return instanceTimes
 
 
 class InstGenOptions:
@@ -762,9 +2012,20 @@ class InstGenOptions:
 		self.indianScriptsFormat = 0
 		self.trimCasingTags = 0
 		self.genVFBs = 0
+		self.autohintInstances = 0
 		self.minKern = 3
 		self.writeTrimmed = 0
 		self.writeSubtables = 1
+		self.numWorkers = 1
+		self.workerIndex = 0
+		self.skipUnchangedInstances = 0
+		self.skipOverlapFreeGlyphs = 0
+		self.saveProfileData = 0
+		self.writeFeaturesInBackground = 0
+		self.resumeInterruptedRun = 0
+		self.instancesFilter = ""
+		self.proofGlyphsOnly = 0
+		self.memoryLimit = 0
 		
 		# items not written to prefs
 		self._prefsBaseName = kPrefsFileName
@@ -859,7 +2120,8 @@ class InstGenDialog:
 		yA1 = yA0 + 30 # Y position of first option
 		yA2 = yA1 + 30
 		yA3 = yA2 + 30
-		endYsection1 = yA3 + 30
+		yA4 = yA3 + 30
+		endYsection1 = yA4 + 30
 		
 		# Kern Feature Options section
 		xB0 = xA1 - 5
@@ -879,8 +2141,28 @@ class InstGenDialog:
 		yC3 = yC2 + 30
 		yC4 = yC3 + 30
 		endYsection3 = yC4 + 30
+
+		# Build Options section
+		xD0 = xB0
+		xD1 = xB1
+		yD0 = endYsection3 + 20
+		yD1 = yD0 + 30
+		yD2 = yD1 + 30
+		yD3 = yD2 + 30
+		yD4 = yD3 + 30
+		yD5 = yD4 + 30
+		yD6 = yD5 + 30
+		yD7 = yD6 + 30
+		yD8 = yD7 + 30
+		endYsection4 = yD8 + 30
+
+		# Proofing Options section
+		yE0 = endYsection4 + 20
+		yE1 = yE0 + 30
+		yE2 = yE1 + 30
+		endYsection5 = yE2 + 30
 		
-		dHeight = endYsection3  + 70 # Total height of dialog
+		dHeight = endYsection5  + 70 # Total height of dialog
 		
 		self.d = Dialog(self)
 		self.d.size = Point(dWidth, dHeight)
@@ -894,6 +2176,7 @@ class InstGenDialog:
 		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yA1, xMax, aAUTO), "genKernFeature", STYLE_CHECKBOX, " Generate 'kern' feature")
 		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yA2, xMax, aAUTO), "genMarkFeature", STYLE_CHECKBOX, " Generate 'mark' feature")
 		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yA3, xMax, aAUTO), "genVFBs", STYLE_CHECKBOX, " Save FontLab VFB files of each instance")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yA4, xMax, aAUTO), "autohintInstances", STYLE_CHECKBOX, " Autohint the instances")
 
 		self.d.AddControl(STATICCONTROL,	Rect(dMargin, yB0, xMax, endYsection2), "frame2", STYLE_LABEL, "Kern Feature Options")
 		self.d.AddControl(EDITCONTROL,	Rect(xB0, yB1-5, xB0+20, aAUTO), "minKern", STYLE_EDIT+cTO_CENTER) 
@@ -907,6 +2190,24 @@ class InstGenDialog:
 		self.d.AddControl(CHECKBOXCONTROL, Rect(xC1, yC3, xMax, aAUTO), "writeClassesFile", STYLE_CHECKBOX, " Write mark classes in separate file")
 		self.d.AddControl(CHECKBOXCONTROL, Rect(xC1, yC4, xMax, aAUTO), "indianScriptsFormat", STYLE_CHECKBOX, " Format the output for Indian scripts")
 
+		self.d.AddControl(STATICCONTROL,	Rect(dMargin, yD0, xMax, endYsection4), "frame4", STYLE_LABEL, "Build Options")
+		self.d.AddControl(EDITCONTROL,	Rect(xD0, yD1-5, xD0+20, aAUTO), "numWorkers", STYLE_EDIT+cTO_CENTER)
+		self.d.AddControl(STATICCONTROL,	Rect(xD1, yD1, xMax, aAUTO), "legend2", STYLE_LABEL, " Number of workers (FontLab sessions)")
+		self.d.AddControl(EDITCONTROL,	Rect(xD0, yD2-5, xD0+20, aAUTO), "workerIndex", STYLE_EDIT+cTO_CENTER)
+		self.d.AddControl(STATICCONTROL,	Rect(xD1, yD2, xMax, aAUTO), "legend3", STYLE_LABEL, " Worker index of this session")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yD3, xMax, aAUTO), "skipUnchangedInstances", STYLE_CHECKBOX, " Skip unchanged instances")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yD4, xMax, aAUTO), "skipOverlapFreeGlyphs", STYLE_CHECKBOX, " Only remove overlaps where needed")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yD5, xMax, aAUTO), "saveProfileData", STYLE_CHECKBOX, " Save profiling data (cProfile)")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yD6, xMax, aAUTO), "writeFeaturesInBackground", STYLE_CHECKBOX, " Write feature files in the background")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yD7, xMax, aAUTO), "resumeInterruptedRun", STYLE_CHECKBOX, " Resume the interrupted run")
+		self.d.AddControl(EDITCONTROL,	Rect(xD0, yD8-5, xD0+40, aAUTO), "memoryLimit", STYLE_EDIT+cTO_CENTER)
+		self.d.AddControl(STATICCONTROL,	Rect(xD0+45, yD8, xMax, aAUTO), "legend5", STYLE_LABEL, " Memory limit in MB (0 for no limit)")
+
+		self.d.AddControl(STATICCONTROL,	Rect(dMargin, yE0, xMax, endYsection5), "frame5", STYLE_LABEL, "Proofing Options")
+		self.d.AddControl(STATICCONTROL,	Rect(xA1, yE1, xA1+70, aAUTO), "legend4", STYLE_LABEL, "Instances:")
+		self.d.AddControl(EDITCONTROL,	Rect(xA1+70, yE1-5, xMax-10, aAUTO), "instancesFilter", STYLE_EDIT)
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yE2, xMax, aAUTO), "proofGlyphsOnly", STYLE_CHECKBOX, " Only the glyphs listed in file %s" % kProofGlyphListFile)
+
 		helpYPos = dHeight-35
 		self.d.AddControl(BUTTONCONTROL, Rect(dMargin, helpYPos, dMargin+60, helpYPos+20), "help", STYLE_BUTTON, "Help")
 
@@ -926,6 +2227,9 @@ class InstGenDialog:
 	def on_genVFBs(self, code):
 		self.d.GetValue("genVFBs")
 
+	def on_autohintInstances(self, code):
+		self.d.GetValue("autohintInstances")
+
 	def on_minKern(self, code):
 		self.d.GetValue("minKern")
 
@@ -955,6 +2259,36 @@ class InstGenDialog:
 	def on_indianScriptsFormat(self, code):
 		self.d.GetValue("indianScriptsFormat")
 
+	def on_numWorkers(self, code):
+		self.d.GetValue("numWorkers")
+
+	def on_workerIndex(self, code):
+		self.d.GetValue("workerIndex")
+
+	def on_skipUnchangedInstances(self, code):
+		self.d.GetValue("skipUnchangedInstances")
+
+	def on_skipOverlapFreeGlyphs(self, code):
+		self.d.GetValue("skipOverlapFreeGlyphs")
+
+	def on_saveProfileData(self, code):
+		self.d.GetValue("saveProfileData")
+
+	def on_writeFeaturesInBackground(self, code):
+		self.d.GetValue("writeFeaturesInBackground")
+
+	def on_resumeInterruptedRun(self, code):
+		self.d.GetValue("resumeInterruptedRun")
+
+	def on_memoryLimit(self, code):
+		self.d.GetValue("memoryLimit")
+
+	def on_instancesFilter(self, code):
+		self.d.GetValue("instancesFilter")
+
+	def on_proofGlyphsOnly(self, code):
+		self.d.GetValue("proofGlyphsOnly")
+
 	def on_ok(self,code):
 		self.result = 1
 		# update options
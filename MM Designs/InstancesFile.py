@@ -0,0 +1,542 @@
+#FLM: Validate Instances File
+
+__copyright__ =  """
+Copyright 2026 Adobe Systems Incorporated (http://www.adobe.com/). All Rights Reserved.
+This software is licensed as OpenSource, under the Apache License, Version 2.0. This license is available at: http://opensource.org/licenses/Apache-2.0.
+"""
+
+__doc__ = """
+Instances File v1.3 - Oct 17 2026
+
+This module reads the "instances" file used by the Instance Generator, Kern Feature
+Generator, Mark Feature Generator and Save Files for MakeInstances scripts. For
+information on how to format the "instances" file, please read the documentation in
+the InstanceGenerator.py script.
+
+The fields are parsed without using eval(). The parsed and validated records are kept
+in memory, keyed by the file's path, modification time and checksum, so running the
+macros again in the same FontLab session does not parse the file again unless it was
+changed. The callers always get their own copy of the records.
+
+When run as a FontLab macro, this script validates the "instances" file located in the
+same folder as the current font. It can also be run from the command line, without
+FontLab, to validate one or more files (e.g. in a continuous integration system):
+
+	python InstancesFile.py <path to instances file> [<path to instances file> ...]
+
+The exit status is 1 if any of the files has errors, and 0 otherwise.
+
+==================================================
+Versions:
+v1.0 - Oct 17 2026 - Initial release. This code was previously copied in each script.
+v1.1 - Oct 17 2026 - Added filterInstances(), for processing only some of the instances.
+v1.2 - Oct 17 2026 - The instance filters can also be regular expressions or ranges of coordinates.
+v1.3 - Oct 17 2026 - The filters are only split at the commas outside braces, brackets and parentheses. Invalid regular expressions are reported as errors.
+"""
+
+import copy
+import fnmatch
+import os
+import re
+import sys
+
+try:
+	from hashlib import md5
+except ImportError: # Python 2.4
+	from md5 import new as md5
+
+kInstancesDataFileName = "instances"
+
+kFieldsKey = "#KEYS:"
+kFamilyName = "FamilyName"
+kFontName = "FontName"
+kFullName = "FullName"
+kWeight = "Weight"
+kCoordsKey = "Coords"
+kIsBoldKey = "IsBold" # This is changed to kForceBold in the instanceDict when reading in the instance file.
+kForceBold = "ForceBold"
+kIsItalicKey = "IsItalic"
+kExceptionSuffixes = "ExceptionSuffixes"
+kExtraGlyphs = "ExtraGlyphs"
+
+kFixedFieldKeys = {
+		# field index: key name
+		0:kFamilyName,
+		1:kFontName,
+		2:kFullName,
+		3:kWeight,
+		4:kCoordsKey,
+		5:kIsBoldKey,
+		}
+
+kNumFixedFields = len(kFixedFieldKeys)
+
+kBlueScale = "BlueScale"
+kBlueShift = "BlueShift"
+kBlueFuzz = "BlueFuzz"
+kBlueValues = "BlueValues"
+kOtherBlues = "OtherBlues"
+kFamilyBlues = "FamilyBlues"
+kFamilyOtherBlues = "FamilyOtherBlues"
+kStdHW = "StdHW"
+kStdVW = "StdVW"
+kStemSnapH = "StemSnapH"
+kStemSnapV = "StemSnapV"
+
+kAlignmentZonesKeys = [kBlueValues, kOtherBlues, kFamilyBlues, kFamilyOtherBlues]
+kTopAlignZonesKeys = [kBlueValues, kFamilyBlues]
+kMaxTopZonesSize = 14 # 7 zones
+kBotAlignZonesKeys = [kOtherBlues, kFamilyOtherBlues]
+kMaxBotZonesSize = 10 # 5 zones
+kStdStemsKeys = [kStdHW, kStdVW]
+kMaxStdStemsSize = 1
+kStemSnapKeys = [kStemSnapH, kStemSnapV]
+kMaxStemSnapSize = 12 # including StdStem
+
+
+class ParseError(ValueError):
+	pass
+
+
+# Records of the files already parsed. key: file path, value: (modification time, checksum, instancesList)
+gParsedFilesCache = {}
+
+
+numberPattern = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+
+def parseNumber(token):
+	# Returns the int or float value of the token. Raises ValueError if the token is not a number.
+	token = token.strip()
+	if not numberPattern.match(token):
+		raise ValueError(token)
+	try:
+		return int(token)
+	except ValueError:
+		return float(token)
+
+
+def parseBoolean(token):
+	token = token.strip()
+	if token == "True":
+		return 1
+	if token == "False":
+		return 0
+	return parseNumber(token)
+
+
+def parseCoords(field):
+	# Accepts a single value, or comma-separated values optionally enclosed in parentheses or brackets.
+	field = field.strip()
+	if field[:1] in ["(", "["] and field[-1:] in [")", "]"]:
+		field = field[1:-1]
+	tokens = field.split(',')
+	if tokens and not tokens[-1].strip(): # allow a trailing comma, as in "(350,)"
+		tokens = tokens[:-1]
+	if not tokens:
+		raise ValueError(field)
+	return tuple(map(parseNumber, tokens))
+
+
+kStringEscapes = {"\\": "\\", "'": "'", '"': '"', "n": "\n", "t": "\t"}
+
+def parseStringList(field):
+	# Parses a list of quoted strings, like ["-black", '*-aux']. As in Python strings, the
+	# backslash escapes in kStringEscapes are replaced, and all other backslashes are kept.
+	field = field.strip()
+	if field[:1] in ["[", "("] and field[-1:] in ["]", ")"]:
+		field = field[1:-1]
+	strings = []
+	i = 0
+	length = len(field)
+	expectingString = 1
+	while i < length:
+		char = field[i]
+		if char.isspace():
+			i += 1
+		elif char == ',' and not expectingString:
+			expectingString = 1
+			i += 1
+		elif char in ["'", '"'] and expectingString:
+			quote = char
+			i += 1
+			chars = []
+			while i < length and field[i] != quote:
+				if field[i] == "\\" and i + 1 < length:
+					nextChar = field[i + 1]
+					if nextChar in kStringEscapes:
+						chars.append(kStringEscapes[nextChar])
+					else:
+						chars.append("\\" + nextChar)
+					i += 2
+				else:
+					chars.append(field[i])
+					i += 1
+			if i >= length:
+				raise ValueError(field) # unterminated string
+			strings.append("".join(chars))
+			expectingString = 0
+			i += 1
+		else:
+			raise ValueError(field)
+	return strings
+
+
+def validateArrayValues(arrayList, valuesMustBePositive):
+	for i in range(len(arrayList)):
+		try:
+			arrayList[i] = parseNumber(arrayList[i])
+		except ValueError:
+			return
+		if valuesMustBePositive:
+			if arrayList[i] < 0:
+				return
+	return arrayList
+
+
+def parseInstanceData(data):
+	lines = data.splitlines()
+
+	i = 0
+	parseError = 0
+	keyDict = copy.copy(kFixedFieldKeys)
+	numKeys = kNumFixedFields
+	numLines = len(lines)
+	instancesList = []
+
+	for i in range(numLines):
+		line = lines[i]
+
+		# Skip over blank lines
+		line2 = line.strip()
+		if not line2:
+			continue
+
+		# Get rid of all comments. If we find a key definition comment line, parse it.
+		commentIndex = line.find('#')
+		if commentIndex >= 0:
+			if line.startswith(kFieldsKey):
+				if instancesList:
+					print "ERROR: Header line (%s) must preceed a data line." % kFieldsKey
+					raise ParseError
+				# parse the line with the field names.
+				line = line[len(kFieldsKey):]
+				line = line.strip()
+				keys = line.split('\t')
+				keys = map(lambda name: name.strip(), keys)
+				numKeys = len(keys)
+				k = kNumFixedFields
+				while k < numKeys:
+					keyDict[k] = keys[k]
+					k +=1
+				continue
+			else:
+				line = line[:commentIndex]
+				continue
+
+		# Must be a data line.
+		fields = line.split('\t')
+		fields = map(lambda datum: datum.strip(), fields)
+		numFields = len(fields)
+		if (numFields != numKeys):
+			print "ERROR: In line %s, the number of fields %s does not match the number of key names %s (FamilyName, FontName, FullName, Weight, Coords, IsBold)." % (i+1, numFields, numKeys)
+			parseError = 1
+			continue
+
+		instanceDict= {}
+		#Build a dict from key to value. Some kinds of values needs special processing.
+		for k in range(numFields):
+			key = keyDict[k]
+			field = fields[k]
+			if not field:
+				continue
+			if field in ["Default", "None", "FontBBox"]:
+				# FontBBox is no longer supported - I calculate the real
+				# instance fontBBox from the glyph metrics instead,
+				continue
+			if key == kFontName:
+				value = field
+			elif key in [kExtraGlyphs, kExceptionSuffixes]:
+				try:
+					value = parseStringList(field)
+				except ValueError:
+					print "ERROR: In line %s, the %s field must be a list of quoted names." % (i+1, key)
+					parseError = 1
+					continue
+			elif key in [kIsBoldKey, kIsItalicKey, kCoordsKey]:
+				try:
+					if key == kIsBoldKey: # need to convert to Type 1 field key.
+						value = parseBoolean(field)
+						instanceDict[key] = value
+						# add kForceBold key.
+						key = kForceBold
+						if value == 1:
+							value = "true"
+						else:
+							value = "false"
+					elif key == kIsItalicKey:
+						value = parseBoolean(field)
+						if value == 1:
+							value = "true"
+						else:
+							value = "false"
+					elif key == kCoordsKey:
+						value = parseCoords(field)
+				except ValueError:
+					print "ERROR: In line %s, the %s field has an invalid value." % (i+1, key)
+					parseError = 1
+					continue
+
+			elif field[0] in ["[","{"]: # it is a Type 1 array value. Turn it into a list and verify that there's an even number of values for the alignment zones
+				value = field[1:-1].split() # Remove the begin and end brackets/braces, and make a list
+
+				if key in kAlignmentZonesKeys:
+					if len(value) % 2 != 0:
+						print "ERROR: In line %s, the %s field does not have an even number of values." % (i+1, key)
+						parseError = 1
+						continue
+
+				if key in kTopAlignZonesKeys: # The Type 1 spec only allows 7 top zones (7 pairs of values)
+					if len(value) > kMaxTopZonesSize:
+						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxTopZonesSize)
+						parseError = 1
+						continue
+					else:
+						newArray = validateArrayValues(value, False) # False = values do NOT have to be all positive
+						if newArray:
+							value = newArray
+						else:
+							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
+							parseError = 1
+							continue
+					currentArray = value[:] # make copy, not reference
+					value.sort()
+					if currentArray != value:
+						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
+
+				if key in kBotAlignZonesKeys: # The Type 1 spec only allows 5 top zones (5 pairs of values)
+					if len(value) > kMaxBotZonesSize:
+						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxBotZonesSize)
+						parseError = 1
+						continue
+					else:
+						newArray = validateArrayValues(value, False) # False = values do NOT have to be all positive
+						if newArray:
+							value = newArray
+						else:
+							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
+							parseError = 1
+							continue
+					currentArray = value[:] # make copy, not reference
+					value.sort()
+					if currentArray != value:
+						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
+
+				if key in kStdStemsKeys:
+					if len(value) > kMaxStdStemsSize:
+						print "ERROR: In line %s, the %s field can only have %d value." % (i+1, key, kMaxStdStemsSize)
+						parseError = 1
+						continue
+					else:
+						newArray = validateArrayValues(value, True) # True = all values must be positive
+						if newArray:
+							value = newArray
+						else:
+							print "ERROR: In line %s, the %s field has an invalid value." % (i+1, key)
+							parseError = 1
+							continue
+
+				if key in kStemSnapKeys: # The Type 1 spec only allows 12 stem widths, including 1 standard stem
+					if len(value) > kMaxStemSnapSize:
+						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxStemSnapSize)
+						parseError = 1
+						continue
+					else:
+						newArray = validateArrayValues(value, True) # True = all values must be positive
+						if newArray:
+							value = newArray
+						else:
+							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
+							parseError = 1
+							continue
+					currentArray = value[:] # make copy, not reference
+					value.sort()
+					if currentArray != value:
+						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
+			else:
+				# either a single number or a string.
+				value = field # Type 1 numbers are passed as is, as strings.
+
+			instanceDict[key] = value
+
+		if (kStdHW in instanceDict and kStemSnapH not in instanceDict) or (kStdHW not in instanceDict and kStemSnapH in instanceDict):
+			print "ERROR: In line %s, either the %s value or the %s values are missing or were invalid." % (i+1, kStdHW, kStemSnapH)
+			parseError = 1
+		elif (kStdHW in instanceDict and kStemSnapH in instanceDict): # cannot be just 'else' because it will generate a 'KeyError' when these hinting parameters are not provided in the 'instances' file
+			if instanceDict[kStemSnapH][0] != instanceDict[kStdHW][0]:
+				print "ERROR: In line %s, the first value in %s must be the same as the %s value." % (i+1, kStemSnapH, kStdHW)
+				parseError = 1
+
+		if (kStdVW in instanceDict and kStemSnapV not in instanceDict) or (kStdVW not in instanceDict and kStemSnapV in instanceDict):
+			print "ERROR: In line %s, either the %s value or the %s values are missing or were invalid." % (i+1, kStdVW, kStemSnapV)
+			parseError = 1
+		elif (kStdVW in instanceDict and kStemSnapV in instanceDict): # cannot be just 'else' because it will generate a 'KeyError' when these hinting parameters are not provided in the 'instances' file
+			if instanceDict[kStemSnapV][0] != instanceDict[kStdVW][0]:
+				print "ERROR: In line %s, the first value in %s must be the same as the %s value." % (i+1, kStemSnapV, kStdVW)
+				parseError = 1
+
+		instancesList.append(instanceDict)
+
+	if parseError or len(instancesList) == 0:
+		raise(ParseError)
+
+	return instancesList
+
+
+def readInstanceFile(instancesFilePath):
+	f = open(instancesFilePath, "rt")
+	data = f.read()
+	f.close()
+
+	cacheKey = os.path.abspath(instancesFilePath)
+	modTime = os.path.getmtime(instancesFilePath)
+	checksum = md5(data).hexdigest()
+	cachedEntry = gParsedFilesCache.get(cacheKey)
+	if cachedEntry and cachedEntry[0] == modTime and cachedEntry[1] == checksum:
+		instancesList = cachedEntry[2]
+	else:
+		instancesList = parseInstanceData(data)
+		gParsedFilesCache[cacheKey] = (modTime, checksum, instancesList)
+
+	# The scripts modify the records, so they must not get the cached ones.
+	return copy.deepcopy(instancesList)
+
+
+kCoordsRangePattern = re.compile(r"^\s*(-?\d+(?:\.\d*)?)\s*-\s*(-?\d+(?:\.\d*)?)\s*$")
+
+
+def parseCoordsRanges(pattern):
+	# Parses a filter like "[300-700 0-1000]" into a list of (minimum, maximum) values, one per axis.
+	ranges = []
+	for field in pattern[1:-1].split():
+		match = kCoordsRangePattern.match(field)
+		if not match:
+			raise ParseError("The instance filter '%s' is not a valid range of coordinates." % pattern)
+		ranges.append((float(match.group(1)), float(match.group(2))))
+	return ranges
+
+
+def splitFilters(instancesFilter):
+	# Splits the filters at the commas that are not inside braces, brackets or parentheses,
+	# so that regular expressions like "^MyFont-(Bold,Black)" or "^MyFont-\w{1,3}$" are kept whole.
+	patterns = []
+	depth = 0
+	start = 0
+	i = 0
+	while i < len(instancesFilter):
+		char = instancesFilter[i]
+		if char == "\\":
+			i += 1 # the next character is escaped
+		elif char in "{[(":
+			depth += 1
+		elif char in "}])" and depth > 0:
+			depth -= 1
+		elif char == "," and depth == 0:
+			patterns.append(instancesFilter[start:i])
+			start = i + 1
+		i += 1
+	patterns.append(instancesFilter[start:])
+	return [pattern.strip() for pattern in patterns if pattern.strip()]
+
+
+def instanceMatchesFilter(instanceDict, pattern):
+	if pattern.startswith("[") and pattern.endswith("]"):
+		coords = instanceDict[kCoordsKey]
+		ranges = parseCoordsRanges(pattern)
+		if len(ranges) > len(coords):
+			return 0
+		for i in range(len(ranges)):
+			if not (ranges[i][0] <= coords[i] <= ranges[i][1]):
+				return 0
+		return 1
+	elif pattern.startswith("^"):
+		return re.search(pattern, instanceDict[kFontName]) is not None
+	return fnmatch.fnmatchcase(instanceDict[kFontName], pattern)
+
+
+def filterInstances(instancesList, instancesFilter):
+	# Returns the records that match one of the comma-separated filters in instancesFilter.
+	# All the records are returned if instancesFilter is empty. A filter may be:
+	#  - a FontName, which may use the wildcards * and ?, e.g. "*-Bold" or "MyFont-It";
+	#  - a regular expression matched against the FontName, which must begin with "^", e.g. "^MyFont-(Bold|Black)$";
+	#  - a range of coordinates for each axis, separated by spaces and enclosed in brackets,
+	#    e.g. "[300-700]" or "[300-700 0-500]". The axes that are not given are not checked.
+	# The commas inside braces, brackets or parentheses do not separate filters.
+	# Raises ParseError if a filter is not valid.
+	patterns = splitFilters(instancesFilter)
+	if not patterns:
+		return instancesList
+	for pattern in patterns:
+		if pattern.startswith("^"):
+			try:
+				re.compile(pattern)
+			except re.error, e:
+				raise ParseError("The instance filter '%s' is not a valid regular expression (%s)." % (pattern, e))
+	filteredList = []
+	usedPatterns = {}
+	for instanceDict in instancesList:
+		matchedPatterns = [pattern for pattern in patterns if instanceMatchesFilter(instanceDict, pattern)]
+		if matchedPatterns:
+			filteredList.append(instanceDict)
+			for pattern in matchedPatterns:
+				usedPatterns[pattern] = 1
+	for pattern in patterns:
+		if pattern not in usedPatterns:
+			print "WARNING: The instance filter '%s' did not match any instance in the %s file." % (pattern, kInstancesDataFileName)
+	return filteredList
+
+
+def validateInstanceFile(instancesFilePath):
+	# Returns 1 if the file is valid, and 0 otherwise. The problems found are printed.
+	try:
+		instancesList = readInstanceFile(instancesFilePath)
+	except (IOError, OSError):
+		print "ERROR: Failed to read %s" % instancesFilePath
+		return 0
+	except ParseError:
+		print "ERROR: %s has errors or is empty." % instancesFilePath
+		return 0
+	print "%s is valid (%d instances)." % (instancesFilePath, len(instancesList))
+	return 1
+
+
+def run():
+	try:
+		from FL import fl
+	except ImportError:
+		# Run from the command line.
+		if len(sys.argv) < 2:
+			print "Usage: python InstancesFile.py <path to instances file> [<path to instances file> ...]"
+			sys.exit(2)
+		allValid = 1
+		for instancesFilePath in sys.argv[1:]:
+			if not validateInstanceFile(instancesFilePath):
+				allValid = 0
+		sys.exit(not allValid)
+
+	if fl.count == 0:
+		print 'No font opened.'
+		return
+	try:
+		parentDir = os.path.dirname(os.path.abspath(fl.font.file_name))
+	except AttributeError:
+		print "The font has not been saved. Please save the font and try again."
+		return
+	instancesFilePath = os.path.join(parentDir, kInstancesDataFileName)
+	if not os.path.isfile(instancesFilePath):
+		print "Could not find the file named '%s' in the path below\n\t%s" % (kInstancesDataFileName, parentDir)
+		return
+	validateInstanceFile(instancesFilePath)
+
+
+if __name__ == "__main__":
+	run()
@@ -0,0 +1,453 @@
+#FLM: Kern and Mark Feature Generator
+
+###################################################
+### THE VALUES BELOW CAN BE EDITED AS NEEDED ######
+###################################################
+
+kInstancesDataFileName = "instances"
+kPrefsFileName =  "KernMarkFeatureGenerator.prefs"
+
+###################################################
+
+__copyright__ =  """
+Copyright 2026 Adobe Systems Incorporated (http://www.adobe.com/). All Rights Reserved.
+This software is licensed as OpenSource, under the Apache License, Version 2.0. This license is available at: http://opensource.org/licenses/Apache-2.0.
+"""
+
+__doc__ = """
+Kern and Mark Feature Generator v1.0 - Oct 17 2026
+
+This script does the work of the Kern Feature Generator and Mark Feature Generator
+scripts in a single pass. It generates the "features.kern", "features.mark" and
+"features.mkmk" files of each instance of a Multiple Master (MM) FontLab font, or of a
+Single Master (SM) font.
+
+For a MM font, the "instances" file is read once, and one FontLab instance of the MM
+font is made for each instance. The 'kern' and the 'mark' features of each instance are
+both written from that instance, so each instance is interpolated only once. The
+InstancesFile.py module must be in the Macros folder.
+
+The files are written to the selected folder, if the font is SM, or to a sub-directory
+path <selected_folder>/<face_name>, if the font is MM. The face name is derived by
+taking the part of the font's PostScript name after the hyphen, or "Regular" if there is
+no hyphen, as in the Kern Feature Generator and Mark Feature Generator scripts.
+
+The "Instances" option can be used for processing only some of the instances. It is a
+comma-separated list of PostScript names (the FontName field of the "instances" file),
+which may use the wildcards * and ? (e.g. "MyFontPro-Bold*,*-Black"). Regular
+expressions starting with "^" (e.g. "^MyFontPro-(Bold|Black)$") and ranges of
+coordinates enclosed in brackets, one range per axis (e.g. "[300-700]" or
+"[300-700 0-500]"), can also be used. All the instances are processed when it is empty.
+
+For information on how to format the "instances" file, please read the documentation in
+the InstanceGenerator.py script. For information about how the feature files are created,
+please read the documentation in the WriteFeaturesKernFDK.py and WriteFeaturesMarkFDK.py
+modules that can be found in FontLab/Studio5/Macros/System/Modules/
+
+To access the script's options, hold down the CONTROL key while clicking on the play
+button to run the script.
+
+==================================================
+Versions:
+v1.0 - Oct 17 2026 - Initial release
+"""
+
+import os, sys, math, time
+
+try:
+	from AdobeFontLabUtils import checkControlKeyPress, checkShiftKeyPress
+	import WriteFeaturesKernFDK, WriteFeaturesMarkFDK
+except ImportError,e:
+	print "Failed to find the Adobe FDK support scripts."
+	print "Please run the script FDK/Tools/FontLab/installFontLabMacros.py script, and try again."
+	print "Current directory: ", os.path.abspath(os.getcwd())
+	print "Current list of search paths for modules: "
+	import pprint
+	pprint.pprint(sys.path)
+	raise e
+
+
+def importMacroModule(moduleName):
+	# The modules shared by these macros are kept next to them, in the Macros folder.
+	# FontLab does not always put that folder in the search path, so look for it.
+	try:
+		return __import__(moduleName)
+	except ImportError:
+		pass
+	fileName = moduleName + ".py"
+	userFolder = os.path.expanduser('~')
+	customModulePathMAC = os.path.join(userFolder, 'Library', 'Application Support', 'FontLab', 'Studio 5', 'Macros')
+	customModulePathPC = os.path.join(userFolder, 'Documents', 'FontLab', 'Studio5', 'Macros')
+	possibleModulePaths = [fl.userpath, customModulePathMAC, customModulePathPC]
+	for path in possibleModulePaths:
+		for root, dirs, files in os.walk(path):
+			if fileName in files:
+				if root not in sys.path:
+					sys.path.append(root)
+				return __import__(moduleName)
+	print "Failed to find the module %s in the following folders:\n%s" % (fileName, '\n'.join(possibleModulePaths))
+	raise ImportError(moduleName)
+
+InstancesFile = importMacroModule("InstancesFile")
+from InstancesFile import ParseError, readInstanceFile, filterInstances, kFontName, kCoordsKey
+
+
+def makeFaceFolder(root, folder):
+	facePath = os.path.join(root, folder)
+	if not os.path.exists(facePath):
+		os.makedirs(facePath)
+	return facePath
+
+
+def getFaceName(fontInstanceDict):
+	try:
+		faceName = fontInstanceDict[kFontName].split('-')[1]
+	except IndexError:
+		faceName = 'Regular'
+	return faceName
+
+
+def writeFeatures(f, folderPath, options):
+	if options.genKernFeature:
+		print "\tGenerating 'kern' feature..."
+		WriteFeaturesKernFDK.KernDataClass(f, folderPath, options.minKern, options.writeTrimmed, options.writeSubtables)
+
+	if options.genMarkFeature:
+		if options.genMkmkFeature:
+			print "\tGenerating 'mark' and 'mkmk' features..."
+		else:
+			print "\tGenerating 'mark' feature..."
+		WriteFeaturesMarkFDK.MarkDataClass(f, folderPath, options.trimCasingTags, options.genMkmkFeature, options.writeClassesFile, options.indianScriptsFormat)
+
+
+def handleInstance(folderPath, fontMM, fontInstanceDict, options):
+	faceName = getFaceName(fontInstanceDict)
+	print
+	print faceName
+
+	fontName = fontInstanceDict[kFontName]
+	instValues = fontInstanceDict[kCoordsKey]
+
+	try:
+		fontInstance = Font(fontMM, instValues)  # creates instance
+	except:
+		print "Error: Could not create instance <%s> (%s)" % (instValues, fontName)
+		return
+
+	# The same names as in the instances made by the Kern and Mark Feature Generator scripts
+	fontInstance.font_name = fontName
+	instanceInfo = os.path.basename(fontMM.file_name)
+	for value in instValues:
+		instanceInfo += '_' + str(value)
+	fontInstance.menu_name = instanceInfo
+
+	writeFeatures(fontInstance, makeFaceFolder(folderPath, faceName), options)
+
+
+def makeFeatures(options):
+	if not (options.genKernFeature or options.genMarkFeature):
+		print "Nothing to do. Please select the 'kern' feature, the 'mark' feature, or both."
+		return
+
+	try:
+		parentDir = os.path.dirname(os.path.abspath(fl.font.file_name))
+	except AttributeError:
+		print "The font has not been saved. Please save the font and try again."
+		return
+
+	isMM = fl.font[0].layers_number > 1
+	if isMM:
+		fontMM = fl.font # MM Font
+		axisNum = int(math.log(fontMM[0].layers_number, 2)) # Number of axis in font
+
+		instancesFilePath = os.path.join(parentDir, kInstancesDataFileName)
+
+		if not os.path.isfile(instancesFilePath):
+			print "Could not find the file named '%s' in the path below\n\t%s" % (kInstancesDataFileName, parentDir)
+			return
+
+		try:
+			print "Parsing instances file..."
+			instancesList = readInstanceFile(instancesFilePath)
+		except ParseError:
+			print "Error parsing file or file is empty."
+			return
+
+		# Make sure that the instance values is compatible with the number of axis in the MM font
+		for instanceDict in instancesList:
+			if axisNum != len(instanceDict[kCoordsKey]):
+				print 'ERROR:  The %s value for the instance named %s in the %s file is not compatible with the number of axis in the MM source font.' % (kCoordsKey, instanceDict[kFontName], kInstancesDataFileName)
+				return
+
+		try:
+			instancesList = filterInstances(instancesList, options.instancesFilter)
+		except ParseError, e:
+			print "ERROR: %s" % e
+			return
+		if not instancesList:
+			print "No instance to process."
+			return
+
+	folderPath = fl.GetPathName("Select parent directory to output file(s)")
+
+	# Cancel was clicked or Esc key was pressed
+	if not folderPath:
+		return
+
+	t1 = time.time()  # Initiates a timer of the whole process
+
+	if not isMM:
+		print fl.font.font_name
+		writeFeatures(fl.font, folderPath, options)
+	else:
+		for instanceDict in instancesList:
+			handleInstance(folderPath, fontMM, instanceDict, options)
+
+	t2 = time.time()
+	elapsedSeconds = t2-t1
+
+	if (elapsedSeconds/60) < 1:
+		print '\nCompleted in %.1f seconds.\n' % elapsedSeconds
+	else:
+		print '\nCompleted in %.1f minutes.\n' % (elapsedSeconds/60)
+
+
+class KernMarkGenOptions:
+	# Holds the options for the module.
+	# The values of all member items NOT prefixed with "_" are written to/read from
+	# a preferences file.
+	# This also gets/sets the same member fields in the passed object.
+	def __init__(self):
+		self.genKernFeature = 1
+		self.genMarkFeature = 1
+		self.instancesFilter = ""
+		self.minKern = 3
+		self.writeTrimmed = 0
+		self.writeSubtables = 1
+		self.genMkmkFeature = 0
+		self.trimCasingTags = 0
+		self.writeClassesFile = 0
+		self.indianScriptsFormat = 0
+
+		# items not written to prefs
+		self._prefsBaseName = kPrefsFileName
+		self._prefsPath = None
+
+	def _getPrefs(self, callerObject = None):
+		foundPrefsFile = 0
+
+		# We will put the prefs file in a directory "Preferences" at the same level as the Macros directory
+		dirPath = os.path.dirname(WriteFeaturesKernFDK.__file__)
+		name = " "
+		while name and (name.lower() != "macros"):
+			name = os.path.basename(dirPath)
+			dirPath = os.path.dirname(dirPath)
+		if name.lower() != "macros" :
+			dirPath = None
+
+		if dirPath:
+			dirPath = os.path.join(dirPath, "Preferences")
+			if not os.path.exists(dirPath): # create it so we can save a prefs file there later.
+				try:
+					os.mkdir(dirPath)
+				except (IOError,OSError):
+					print("Failed to create prefs directory %s" % (dirPath))
+					return foundPrefsFile
+		else:
+			return foundPrefsFile
+
+		# the prefs directory exists. Try and open the file.
+		self._prefsPath = os.path.join(dirPath, self._prefsBaseName)
+		if os.path.exists(self._prefsPath):
+			try:
+				pf = file(self._prefsPath, "rt")
+				data = pf.read()
+				prefs = eval(data)
+				pf.close()
+			except (IOError, OSError):
+				print("Prefs file exists but cannot be read %s" % (self._prefsPath))
+				return foundPrefsFile
+
+			# We've successfully read the prefs file
+			foundPrefsFile = 1
+			kelList = prefs.keys()
+			for key in kelList:
+				exec("self.%s = prefs[\"%s\"]" % (key,key))
+
+		# Add/set the member fields of the calling object
+		if callerObject:
+			keyList = dir(self)
+			for key in keyList:
+				if key[0] == "_":
+					continue
+				exec("callerObject.%s = self.%s" % (key, key))
+
+		return foundPrefsFile
+
+
+	def _savePrefs(self, callerObject = None):
+		prefs = {}
+		if not self._prefsPath:
+			return
+
+		keyList = dir(self)
+		for key in keyList:
+			if key[0] == "_":
+				continue
+			if callerObject:
+				exec("self.%s = callerObject.%s" % (key, key))
+			exec("prefs[\"%s\"] = self.%s" % (key, key))
+		try:
+			pf = file(self._prefsPath, "wt")
+			pf.write(repr(prefs))
+			pf.close()
+			print("Saved prefs in %s." % self._prefsPath)
+		except (IOError, OSError):
+			print("Failed to write prefs file in %s." % self._prefsPath)
+
+
+class KernMarkGenDialog:
+	def __init__(self):
+		""" NOTE: the Get and Save preferences class methods access the preference values as fields
+		of the dialog by name. If you want to change a preference value, the dialog control value must have
+		the same field name.
+		"""
+		dWidth = 350
+		dMargin = 25
+		xMax = dWidth - dMargin
+
+		# General Options section
+		xA1 = dMargin + 20 # Left indent of the "Generate..." options
+		yA0 = dMargin
+		yA1 = yA0 + 30 # Y position of first option
+		yA2 = yA1 + 30
+		yA3 = yA2 + 30
+		endYsection1 = yA3 + 30
+
+		# Kern Feature Options section
+		xB0 = xA1 - 5
+		xB1 = xA1 + 20 # Left indent of "Minimum kerning" text
+		xB2 = xA1
+		yB0 = endYsection1 + 20
+		yB1 = yB0 + 30
+		yB2 = yB1 + 30
+		yB3 = yB2 + 30
+		endYsection2 = yB3 + 30
+
+		# Mark Feature Options section
+		xC1 = xA1
+		yC0 = endYsection2 + 20
+		yC1 = yC0 + 30
+		yC2 = yC1 + 30
+		yC3 = yC2 + 30
+		yC4 = yC3 + 30
+		endYsection3 = yC4 + 30
+
+		dHeight = endYsection3  + 70 # Total height of dialog
+
+		self.d = Dialog(self)
+		self.d.size = Point(dWidth, dHeight)
+		self.d.Center()
+		self.d.title = "Kern and Mark Feature Generator Preferences"
+
+		self.options = KernMarkGenOptions()
+		self.options._getPrefs(self) # This both loads prefs and assigns the member fields of the dialog.
+
+		self.d.AddControl(STATICCONTROL,	Rect(dMargin, yA0, xMax, endYsection1), "frame", STYLE_LABEL, "General Options")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yA1, xMax, aAUTO), "genKernFeature", STYLE_CHECKBOX, " Generate 'kern' feature")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xA1, yA2, xMax, aAUTO), "genMarkFeature", STYLE_CHECKBOX, " Generate 'mark' feature")
+		self.d.AddControl(STATICCONTROL,	Rect(xA1, yA3, xA1+70, aAUTO), "legend2", STYLE_LABEL, "Instances:")
+		self.d.AddControl(EDITCONTROL,	Rect(xA1+70, yA3-5, xMax-10, aAUTO), "instancesFilter", STYLE_EDIT)
+
+		self.d.AddControl(STATICCONTROL,	Rect(dMargin, yB0, xMax, endYsection2), "frame2", STYLE_LABEL, "Kern Feature Options")
+		self.d.AddControl(EDITCONTROL,	Rect(xB0, yB1-5, xB0+20, aAUTO), "minKern", STYLE_EDIT+cTO_CENTER)
+		self.d.AddControl(STATICCONTROL,	Rect(xB1, yB1, xMax, aAUTO), "legend", STYLE_LABEL, " Minimum kern value (inclusive)")
+		self.d.AddControl(CHECKBOXCONTROL,	Rect(xB2, yB2, xMax, aAUTO), "writeTrimmed", STYLE_CHECKBOX, " Write trimmed pairs")
+		self.d.AddControl(CHECKBOXCONTROL,	Rect(xB2, yB3, xMax, aAUTO), "writeSubtables", STYLE_CHECKBOX, " Write subtables")
+
+		self.d.AddControl(STATICCONTROL,	Rect(dMargin, yC0, xMax, endYsection3), "frame3", STYLE_LABEL, "Mark Feature Options")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xC1, yC1, xMax, aAUTO), "genMkmkFeature", STYLE_CHECKBOX, " Write mark-to-mark lookups")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xC1, yC2, xMax, aAUTO), "trimCasingTags", STYLE_CHECKBOX, " Trim casing tags on anchor names")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xC1, yC3, xMax, aAUTO), "writeClassesFile", STYLE_CHECKBOX, " Write mark classes in separate file")
+		self.d.AddControl(CHECKBOXCONTROL, Rect(xC1, yC4, xMax, aAUTO), "indianScriptsFormat", STYLE_CHECKBOX, " Format the output for Indian scripts")
+
+		# Uncheck "genMkmkFeature" if "genMarkFeature" is 0 in the saved options
+		if self.genMarkFeature == 0:
+			self.genMkmkFeature = 0
+
+	def on_genKernFeature(self, code):
+		self.d.GetValue("genKernFeature")
+
+	def on_genMarkFeature(self, code):
+		self.d.GetValue("genMarkFeature")
+		# Disable "genMkmkFeature" if "genMarkFeature" is not checked
+		self.d.Enable("genMkmkFeature", self.genMarkFeature)
+
+	def on_instancesFilter(self, code):
+		self.d.GetValue("instancesFilter")
+
+	def on_minKern(self, code):
+		self.d.GetValue("minKern")
+
+	def on_writeTrimmed(self, code):
+		self.d.GetValue("writeTrimmed")
+
+	def on_writeSubtables(self, code):
+		self.d.GetValue("writeSubtables")
+
+	def on_genMkmkFeature(self, code):
+		self.d.GetValue("genMkmkFeature")
+
+	def on_trimCasingTags(self, code):
+		self.d.GetValue("trimCasingTags")
+
+	def on_writeClassesFile(self, code):
+		self.d.GetValue("writeClassesFile")
+
+	def on_indianScriptsFormat(self, code):
+		self.d.GetValue("indianScriptsFormat")
+
+	def on_ok(self,code):
+		self.result = 1
+		# update options
+		self.options._savePrefs(self) # update prefs file
+
+	def on_cancel(self, code):
+		self.result = 0
+
+	def Run(self):
+		self.d.Run()
+		return self.result
+
+
+def run():
+	global debug
+	if fl.count == 0:
+		print 'No font opened.'
+		return
+
+	if len(fl.font) == 0:
+		print 'The font has no glyphs.'
+		return
+
+	else:
+		dontShowDialog = 1
+		result = 2
+		dontShowDialog = checkControlKeyPress()
+		debug = not checkShiftKeyPress()
+		if dontShowDialog:
+			print "Hold down CONTROL key while starting this script in order to set options.\n"
+			options = KernMarkGenOptions()
+			options._getPrefs() # load current settings from prefs
+			makeFeatures(options)
+		else:
+			IGd = KernMarkGenDialog()
+			result = IGd.Run() # returns 0 for cancel, 1 for ok
+			if result == 1:
+				options = KernMarkGenOptions()
+				options._getPrefs() # load current settings from prefs
+				makeFeatures(options)
+
+
+if __name__ == "__main__":
+	run()
@@ -16,7 +16,7 @@ This software is licensed as OpenSource, under the Apache License, Version 2.0.
 """
 
 __doc__ = """
-Save Files for MakeInstances v2.0 - April 12 2016
+Save Files for MakeInstances v2.3 - Oct 17 2026
 
 This script will do part of the work to create a set of single-master fonts
 ("instances") from a Multiple Master (MM) FontLab font. It will save a
@@ -47,284 +47,50 @@ values. The "instances" file must be a simple text file, located in the same
 folder as the MM FontLab file.
 
 For information on how to format the "instances" file, please read the
-documentation in the InstanceGenerator.py script.
+documentation in the InstanceGenerator.py script. The "instances" file is read
+by the InstancesFile.py module, which must be in the Macros folder.
 
 ==================================================
 
 Versions:
+v2.3 - Oct 17 2026 - The MM FontBBox values are patched in the mmfont.pfa file, instead of reading and writing the whole file.
+v2.2 - Oct 17 2026 - Faster calculation of the MM FontBBox values.
+v2.1 - Oct 17 2026 - The "instances" file is now read by the InstancesFile.py module, which must be in the Macros folder.
 v2.0 - Apr 12 2016 - Added step to fix the MM FontBBox values of the mmfont.pfa file,
                      when the VFB's UPM value is not 1000 (long-standing FontLab bug).
 v1.0 - Feb 15 2010 - Initial release
 
 """
 
-import copy
 import re
 import os
+import sys
+import mmap
 
-kFieldsKey = "#KEYS:"
-kFamilyName = "FamilyName"
-kFontName = "FontName"
-kFullName = "FullName"
-kWeight = "Weight"
-kCoordsKey = "Coords"
-kIsBoldKey = "IsBold" # This is changed to kForceBold in the instanceDict when reading in the instance file.
-kForceBold = "ForceBold"
-kIsItalicKey = "IsItalic"
-kExceptionSuffixes = "ExceptionSuffixes"
-kExtraGlyphs = "ExtraGlyphs"
-
-kFixedFieldKeys = {
-		# field index: key name
-		0:kFamilyName,
-		1:kFontName,
-		2:kFullName,
-		3:kWeight,
-		4:kCoordsKey,
-		5:kIsBoldKey,
-		}
-
-kNumFixedFields = len(kFixedFieldKeys)
-
-kBlueScale = "BlueScale"
-kBlueShift = "BlueShift"
-kBlueFuzz = "BlueFuzz"
-kBlueValues = "BlueValues"
-kOtherBlues = "OtherBlues"
-kFamilyBlues = "FamilyBlues"
-kFamilyOtherBlues = "FamilyOtherBlues"
-kStdHW = "StdHW"
-kStdVW = "StdVW"
-kStemSnapH = "StemSnapH"
-kStemSnapV = "StemSnapV"
-
-kAlignmentZonesKeys = [kBlueValues, kOtherBlues, kFamilyBlues, kFamilyOtherBlues]
-kTopAlignZonesKeys = [kBlueValues, kFamilyBlues]
-kMaxTopZonesSize = 14 # 7 zones
-kBotAlignZonesKeys = [kOtherBlues, kFamilyOtherBlues]
-kMaxBotZonesSize = 10 # 5 zones
-kStdStemsKeys = [kStdHW, kStdVW]
-kMaxStdStemsSize = 1
-kStemSnapKeys = [kStemSnapH, kStemSnapV]
-kMaxStemSnapSize = 12 # including StdStem
-
-
-class ParseError(ValueError):
-	pass
-
-
-def validateArrayValues(arrayList, valuesMustBePositive):
-	for i in range(len(arrayList)):
-		try:
-			arrayList[i] = eval(arrayList[i])
-		except (NameError, SyntaxError):
-			return
-		if valuesMustBePositive:
-			if arrayList[i] < 0:
-				return
-	return arrayList
-
-
-def readInstanceFile(instancesFilePath):
-	f = open(instancesFilePath, "rt")
-	data = f.read()
-	f.close()
-
-	lines = data.splitlines()
-
-	i = 0
-	parseError = 0
-	keyDict = copy.copy(kFixedFieldKeys)
-	numKeys = kNumFixedFields
-	numLines = len(lines)
-	instancesList = []
-
-	for i in range(numLines):
-		line = lines[i]
-
-		# Skip over blank lines
-		line2 = line.strip()
-		if not line2:
-			continue
-
-		# Get rid of all comments. If we find a key definition comment line, parse it.
-		commentIndex = line.find('#')
-		if commentIndex >= 0:
-			if line.startswith(kFieldsKey):
-				if instancesList:
-					print "ERROR: Header line (%s) must preceed a data line." % kFieldsKey
-					raise ParseError
-				# parse the line with the field names.
-				line = line[len(kFieldsKey):]
-				line = line.strip()
-				keys = line.split('\t')
-				keys = map(lambda name: name.strip(), keys)
-				numKeys = len(keys)
-				k = kNumFixedFields
-				while k < numKeys:
-					keyDict[k] = keys[k]
-					k +=1
-				continue
-			else:
-				line = line[:commentIndex]
-				continue
-
-		# Must be a data line.
-		fields = line.split('\t')
-		fields = map(lambda datum: datum.strip(), fields)
-		numFields = len(fields)
-		if (numFields != numKeys):
-			print "ERROR: In line %s, the number of fields %s does not match the number of key names %s (FamilyName, FontName, FullName, Weight, Coords, IsBold)." % (i+1, numFields, numKeys)
-			parseError = 1
-			continue
-
-		instanceDict= {}
-		#Build a dict from key to value. Some kinds of values needs special processing.
-		for k in range(numFields):
-			key = keyDict[k]
-			field = fields[k]
-			if not field:
-				continue
-			if field in ["Default", "None", "FontBBox"]:
-				# FontBBox is no longer supported - I calculate the real
-				# instance fontBBox from the glyph metrics instead,
-				continue
-			if key == kFontName:
-				value = field
-			elif key in [kExtraGlyphs, kExceptionSuffixes]:
-				value = eval(field)
-			elif key in [kIsBoldKey, kIsItalicKey, kCoordsKey]:
-				try:
-					value = eval(field) # this works for all three fields.
-
-					if key == kIsBoldKey: # need to convert to Type 1 field key.
-						instanceDict[key] = value
-						# add kForceBold key.
-						key = kForceBold
-						if value == 1:
-							value = "true"
-						else:
-							value = "false"
-					elif key == kIsItalicKey:
-						if value == 1:
-							value = "true"
-						else:
-							value = "false"
-					elif key == kCoordsKey:
-						if type(value) == type(0):
-							value = (value,)
-				except (NameError, SyntaxError):
-					print "ERROR: In line %s, the %s field has an invalid value." % (i+1, key)
-					parseError = 1
-					continue
-
-			elif field[0] in ["[","{"]: # it is a Type 1 array value. Turn it into a list and verify that there's an even number of values for the alignment zones
-				value = field[1:-1].split() # Remove the begin and end brackets/braces, and make a list
-
-				if key in kAlignmentZonesKeys:
-					if len(value) % 2 != 0:
-						print "ERROR: In line %s, the %s field does not have an even number of values." % (i+1, key)
-						parseError = 1
-						continue
-
-				if key in kTopAlignZonesKeys: # The Type 1 spec only allows 7 top zones (7 pairs of values)
-					if len(value) > kMaxTopZonesSize:
-						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxTopZonesSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, False) # False = values do NOT have to be all positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
-							parseError = 1
-							continue
-					currentArray = value[:] # make copy, not reference
-					value.sort()
-					if currentArray != value:
-						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
-
-				if key in kBotAlignZonesKeys: # The Type 1 spec only allows 5 top zones (5 pairs of values)
-					if len(value) > kMaxBotZonesSize:
-						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxBotZonesSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, False) # False = values do NOT have to be all positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
-							parseError = 1
-							continue
-					currentArray = value[:] # make copy, not reference
-					value.sort()
-					if currentArray != value:
-						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
-
-				if key in kStdStemsKeys:
-					if len(value) > kMaxStdStemsSize:
-						print "ERROR: In line %s, the %s field can only have %d value." % (i+1, key, kMaxStdStemsSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, True) # True = all values must be positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field has an invalid value." % (i+1, key)
-							parseError = 1
-							continue
-
-				if key in kStemSnapKeys: # The Type 1 spec only allows 12 stem widths, including 1 standard stem
-					if len(value) > kMaxStemSnapSize:
-						print "ERROR: In line %s, the %s field has more than %d values." % (i+1, key, kMaxStemSnapSize)
-						parseError = 1
-						continue
-					else:
-						newArray = validateArrayValues(value, True) # True = all values must be positive
-						if newArray:
-							value = newArray
-						else:
-							print "ERROR: In line %s, the %s field contains invalid values." % (i+1, key)
-							parseError = 1
-							continue
-					currentArray = value[:] # make copy, not reference
-					value.sort()
-					if currentArray != value:
-						print "WARNING: In line %s, the values in the %s field were sorted in ascending order." % (i+1, key)
-			else:
-				# either a single number or a string.
-				if re.match(r"^[-.\d]+$", field):
-					value = field #it is a Type 1 number. Pass as is, as a string.
-				else:
-					value = field
-
-			instanceDict[key] = value
-
-		if (kStdHW in instanceDict and kStemSnapH not in instanceDict) or (kStdHW not in instanceDict and kStemSnapH in instanceDict):
-			print "ERROR: In line %s, either the %s value or the %s values are missing or were invalid." % (i+1, kStdHW, kStemSnapH)
-			parseError = 1
-		elif (kStdHW in instanceDict and kStemSnapH in instanceDict): # cannot be just 'else' because it will generate a 'KeyError' when these hinting parameters are not provided in the 'instances' file
-			if instanceDict[kStemSnapH][0] != instanceDict[kStdHW][0]:
-				print "ERROR: In line %s, the first value in %s must be the same as the %s value." % (i+1, kStemSnapH, kStdHW)
-				parseError = 1
-
-		if (kStdVW in instanceDict and kStemSnapV not in instanceDict) or (kStdVW not in instanceDict and kStemSnapV in instanceDict):
-			print "ERROR: In line %s, either the %s value or the %s values are missing or were invalid." % (i+1, kStdVW, kStemSnapV)
-			parseError = 1
-		elif (kStdVW in instanceDict and kStemSnapV in instanceDict): # cannot be just 'else' because it will generate a 'KeyError' when these hinting parameters are not provided in the 'instances' file
-			if instanceDict[kStemSnapV][0] != instanceDict[kStdVW][0]:
-				print "ERROR: In line %s, the first value in %s must be the same as the %s value." % (i+1, kStemSnapV, kStdVW)
-				parseError = 1
-
-		instancesList.append(instanceDict)
-
-	if parseError or len(instancesList) == 0:
-		raise(ParseError)
 
-	return instancesList
+def importMacroModule(moduleName):
+	# The modules shared by these macros are kept next to them, in the Macros folder.
+	# FontLab does not always put that folder in the search path, so look for it.
+	try:
+		return __import__(moduleName)
+	except ImportError:
+		pass
+	fileName = moduleName + ".py"
+	userFolder = os.path.expanduser('~')
+	customModulePathMAC = os.path.join(userFolder, 'Library', 'Application Support', 'FontLab', 'Studio 5', 'Macros')
+	customModulePathPC = os.path.join(userFolder, 'Documents', 'FontLab', 'Studio5', 'Macros')
+	possibleModulePaths = [fl.userpath, customModulePathMAC, customModulePathPC]
+	for path in possibleModulePaths:
+		for root, dirs, files in os.walk(path):
+			if fileName in files:
+				if root not in sys.path:
+					sys.path.append(root)
+				return __import__(moduleName)
+	print "Failed to find the module %s in the following folders:\n%s" % (fileName, '\n'.join(possibleModulePaths))
+	raise ImportError(moduleName)
+
+InstancesFile = importMacroModule("InstancesFile")
+from InstancesFile import ParseError, readInstanceFile, kExceptionSuffixes, kExtraGlyphs
 
 
 def saveCompositeInfo(fontMM, mmParentDir):
@@ -380,58 +146,127 @@ def parseVals(valList):
 	return valList
 
 
-def fixFontBBox(data, pfaPath):
-	bboxMatch = re.search(r"/FontBBox\s*\{\{([^}]+)\}\s*\{([^}]+)\}\s*\{([^}]+)\}\s*\{([^}]+)\}\}", data)
-	if not bboxMatch:
+def getMMFontBBox(font):
+	# Returns the FontBBox values of each master, as [[xMin per master], [yMin per master],
+	# [xMax per master], [yMax per master]]. The extremes are kept while going through
+	# the glyphs, instead of collecting the values of every glyph.
+	numMasters = font.glyphs[0].layers_number
+	mastersRange = range(numMasters)
+	xMins = [None]*numMasters
+	yMins = [None]*numMasters
+	xMaxs = [None]*numMasters
+	yMaxs = [None]*numMasters
+	for flGlyph in font.glyphs:
+		for m in mastersRange:
+			bbox = flGlyph.GetBoundingRect(m)
+			ll = bbox.ll
+			ur = bbox.ur
+			if xMins[m] is None:
+				xMins[m], yMins[m], xMaxs[m], yMaxs[m] = ll.x, ll.y, ur.x, ur.y
+				continue
+			if ll.x < xMins[m]:
+				xMins[m] = ll.x
+			if ll.y < yMins[m]:
+				yMins[m] = ll.y
+			if ur.x > xMaxs[m]:
+				xMaxs[m] = ur.x
+			if ur.y > yMaxs[m]:
+				yMaxs[m] = ur.y
+
+	flBBox = []
+	for values in [xMins, yMins, xMaxs, yMaxs]:
+		flBBox.append([int(round(value)) for value in values])
+	return flBBox
+
+
+kFontBBoxPattern = re.compile(r"/FontBBox\s*\{\{([^}]+)\}\s*\{([^}]+)\}\s*\{([^}]+)\}\s*\{([^}]+)\}\}")
+kCopyBlockSize = 1024 * 1024
+
+
+def getFontBBoxString(flBBox):
+	# Returns the text that goes between the outer braces of the MM FontBBox array.
+	newString = []
+	for masterValues in flBBox:
+		newString.append("{")
+		for value in masterValues:
+			newString.append("%s" % value)
+		newString.append("}")
+	return " ".join(newString)
+
+
+def writePatchedFile(pfaPath, data, start, end, newString):
+	# Writes a copy of the file with the bytes from start to end replaced by newString,
+	# copying the rest of the file in blocks, and then replaces the file with the copy.
+	tempPath = pfaPath + ".tmp"
+	fp = open(tempPath, "wb")
+	try:
+		fp.write(data[:start])
+		fp.write(newString)
+		for blockStart in range(end, len(data), kCopyBlockSize):
+			fp.write(data[blockStart:blockStart + kCopyBlockSize])
+	finally:
+		fp.close()
+	return tempPath
+
+
+def fixFontBBox(pfaPath):
+	# The file is memory-mapped, and the FontBBox is only looked for in the cleartext
+	# part of the font, before the eexec-encrypted part. The file is patched in place
+	# when the new values fit in the space of the old ones; otherwise it is copied.
+	try:
+		fp = open(pfaPath, "r+b")
+	except (OSError,IOError):
+		print "Failed to open and read %s" % pfaPath
+		return
+	if os.path.getsize(pfaPath) == 0:
+		fp.close()
 		print "Failed to find MM FontBBox %s" % pfaPath
 		return
-	pfaBBox = [bboxMatch.group(1),  bboxMatch.group(2),  bboxMatch.group(3),  bboxMatch.group(4)]
-	pfaBBox = map(parseVals, pfaBBox)
 
-	print "Calculating correct MM FontBBox..."
+	data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_WRITE)
+	tempPath = None
+	try:
+		headerEnd = data.find("eexec")
+		if headerEnd == -1:
+			headerEnd = len(data)
+		bboxMatch = kFontBBoxPattern.search(data, 0, headerEnd)
+		if not bboxMatch:
+			print "Failed to find MM FontBBox %s" % pfaPath
+			return
+		pfaBBox = [bboxMatch.group(1),  bboxMatch.group(2),  bboxMatch.group(3),  bboxMatch.group(4)]
+		pfaBBox = map(parseVals, pfaBBox)
 
-	mastersRange = range(fl.font.glyphs[0].layers_number)
-	flBBox = [[], [], [], []]
-	for i in range(4):
-		for m in mastersRange:
-			flBBox[i].append([])
-	c = 0
-	for flGlyph in fl.font.glyphs:
-		for m in mastersRange:
-			bbox = flGlyph.GetBoundingRect(m)
-			flBBox[0][m].append(bbox.ll.x)
-			flBBox[1][m].append(bbox.ll.y)
-			flBBox[2][m].append(bbox.ur.x)
-			flBBox[3][m].append(bbox.ur.y)
-
-	for m in mastersRange:
-		flBBox[0][m] = int( round( min(flBBox[0][m])) )
-		flBBox[1][m] = int( round( min(flBBox[1][m])) )
-		flBBox[2][m] = int( round( max(flBBox[2][m])) )
-		flBBox[3][m] = int( round( max(flBBox[3][m])) )
-	if pfaBBox == flBBox:
-		print "mmfont.pfa and fl.font have the same MM FontBBox values."
-	else:
-		matchGroups = bboxMatch.groups()
-		numGroups = 4 # by definition of regex above.
-		prefix = data[:bboxMatch.start(1)-1]
-		postfix = data[bboxMatch.end(4)+1:]
-		newString = []
-		for i in range(numGroups):
-			newString.append("{")
-			for m in mastersRange:
-				newString.append
-				newString.append("%s" % (flBBox[i][m]) )
-			newString.append("}")
-		newString = " ".join(newString)
-		data = prefix + newString + postfix
+		print "Calculating correct MM FontBBox..."
+
+		flBBox = getMMFontBBox(fl.font)
+		if pfaBBox == flBBox:
+			print "mmfont.pfa and fl.font have the same MM FontBBox values."
+			return
+
+		# The span between the outer braces of the array
+		start = bboxMatch.start(1) - 1
+		end = bboxMatch.end(4) + 1
+		newString = getFontBBoxString(flBBox)
 		try:
-			fp = open(pfaPath, "wt")
-			fp.write(data)
-			fp.close()
+			if len(newString) <= end - start:
+				# Spaces are valid in the cleartext part of the font
+				data[start:end] = newString + " " * (end - start - len(newString))
+				data.flush()
+			else:
+				tempPath = writePatchedFile(pfaPath, data, start, end, newString)
 			print "Updated mmfont.pfa with correct MM FontBBox values."
 		except (OSError,IOError):
 			print "Failed to open and write %s" % pfaPath
+	finally:
+		data.close()
+		fp.close()
+
+	if tempPath:
+		try:
+			os.remove(pfaPath) # os.rename does not replace files on Windows
+			os.rename(tempPath, pfaPath)
+		except (OSError,IOError):
+			print "Failed to replace %s with %s" % (pfaPath, tempPath)
 
 
 def saveFiles():
@@ -480,15 +315,7 @@ def saveFiles():
 
 	# Fix the FontBBox values if the font's UPM is not 1000
 	if fl.font.upm != 1000:
-		try:
-			fp = open(pfaPath, "rt")
-			data = fp.read()
-			fp.close()
-		except (OSError,IOError):
-			print "Failed to open and read %s" % pfaPath
-			return
-
-		fixFontBBox(data, pfaPath)
+		fixFontBBox(pfaPath)
 
 	print "Done!"
 